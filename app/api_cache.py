@@ -0,0 +1,111 @@
+"""On-disk cache for small, rarely changing Radarr API lists."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Mapping
+
+
+class ResponseCache:
+    """
+    Persistent map of request URL -> JSON body plus HTTP validators.
+
+    An entry younger than ``ttl`` seconds is used without contacting Radarr.
+    Older entries are revalidated with If-None-Match / If-Modified-Since
+    when Radarr sent an ETag or Last-Modified header, so an unchanged list
+    costs a 304 instead of the full body; otherwise they are fetched again.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float,
+        *,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: dict[str, dict[str, Any]] | None = None
+        # Keys answered from disk without asking Radarr in this process.
+        self.served: set[str] = set()
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        if self._entries is None:
+            self._entries = {}
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    raw = json.load(f)
+            except FileNotFoundError:
+                raw = {}
+            except (OSError, ValueError) as e:
+                logging.warning(
+                    "Ignoring unreadable API cache %s: %s", self.path, e
+                )
+                raw = {}
+            if isinstance(raw, dict):
+                self._entries = {
+                    k: v for k, v in raw.items()
+                    if isinstance(v, dict) and 'data' in v
+                }
+        return self._entries
+
+    def _save(self) -> None:
+        tmp = self.path + '.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, separators=(',', ':'))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logging.warning("Unable to write API cache %s: %s", self.path, e)
+
+    def lookup(self, key: str) -> tuple[Any, dict[str, str]]:
+        """
+        (body, {}) for a fresh entry, else (None, conditional headers) with
+        the validators of a stale entry, if any.
+        """
+        with self._lock:
+            entry = self._load().get(key)
+            if entry is None:
+                return None, {}
+            if self._clock() - entry.get('stored_at', 0) < self.ttl:
+                self.served.add(key)
+                return entry['data'], {}
+            headers = {}
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+            return None, headers
+
+    def revalidated(self, key: str) -> Any:
+        """Radarr answered 304: renew the entry and return its body."""
+        with self._lock:
+            entry = self._load().get(key)
+            if entry is None:
+                return None
+            entry['stored_at'] = self._clock()
+            self._save()
+            return entry['data']
+
+    def store(self, key: str, data: Any, headers: Mapping[str, str]) -> None:
+        with self._lock:
+            self.served.discard(key)
+            self._load()[key] = {
+                'stored_at': self._clock(),
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+                'data': data,
+            }
+            self._save()
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self.served.discard(key)
+            if self._load().pop(key, None) is not None:
+                self._save()
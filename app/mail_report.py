@@ -0,0 +1,149 @@
+"""Prune report e-mail: summary body, capped gzip log attachment, SMTP send."""
+
+from __future__ import annotations
+
+import logging
+import smtplib
+import threading
+import zlib
+from email.mime.application import MIMEApplication
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from socket import gaierror
+from typing import Callable, Sequence
+
+CHUNK_SIZE = 1 << 16
+# Room for the truncation note and the gzip trailer.
+_TRAILER_RESERVE = 256
+TRUNCATED_NOTE = b"\n[log truncated to fit MAIL_MAX_ATTACHMENT_KB]\n"
+
+
+def summary_body(
+    numDeleted: int,
+    numPlanned: int,
+    warnDays: int,
+    removed: Sequence[str],
+    planned: Sequence[str],
+    attachment: str | None,
+    breakdown: Sequence[str] = (),
+) -> str:
+    """Counts plus the removed and planned movies; no per-movie details."""
+    lines = [
+        "Hi,",
+        "",
+        f"Removed: {numDeleted}",
+        f"Planned for removal within {warnDays} days: {numPlanned}",
+    ]
+    if breakdown:
+        lines += ["", "Per instance:"]
+        lines += [f"- {line}" for line in breakdown]
+    for title, movies in (
+        ("Removed movies:", removed), ("Planned for removal:", planned)
+    ):
+        if movies:
+            lines += ["", title]
+            lines += [f"- {movie}" for movie in movies]
+    lines.append("")
+    if attachment:
+        lines += [f"The full prune log is attached ({attachment}).", ""]
+    lines += ["Have a nice day.", ""]
+    return "\n".join(lines)
+
+
+def gzip_file(path: str, max_bytes: int) -> tuple[bytes, bool]:
+    """
+    Gzip ``path`` chunk by chunk; returns (data, truncated).
+
+    The compressed output never exceeds ``max_bytes``: each chunk is
+    compressed on a copy of the compressor state and dropped, together
+    with the rest of the file, if it would not fit.
+    """
+    compressor = zlib.compressobj(wbits=31)  # gzip container
+    parts: list[bytes] = []
+    size = 0
+    truncated = False
+    with open(path, 'rb') as f:
+        while chunk := f.read(CHUNK_SIZE):
+            before = compressor.copy()
+            out = compressor.compress(chunk) + \
+                compressor.flush(zlib.Z_SYNC_FLUSH)
+            if size + len(out) + _TRAILER_RESERVE > max_bytes:
+                compressor = before
+                truncated = True
+                break
+            parts.append(out)
+            size += len(out)
+    if truncated:
+        parts.append(compressor.compress(TRUNCATED_NOTE))
+    parts.append(compressor.flush())
+    return b''.join(parts), truncated
+
+
+def build_message(
+    sender: str,
+    receivers: Sequence[str],
+    subject: str,
+    body: str,
+    attachment: tuple[str, bytes] | None = None,
+) -> MIMEMultipart:
+    message = MIMEMultipart()
+    message["From"] = sender
+    message['To'] = ", ".join(receivers)
+    message['Subject'] = subject
+    message.attach(MIMEText(body, _subtype='plain', _charset='UTF-8'))
+    if attachment is not None:
+        filename, data = attachment
+        part = MIMEApplication(data, 'gzip')
+        part.add_header(
+            'Content-Disposition', 'attachment', filename=filename
+        )
+        message.attach(part)
+    return message
+
+
+def send(
+    server: str,
+    port: int,
+    login: str,
+    password: str,
+    message: MIMEMultipart,
+) -> bool:
+    """STARTTLS + login + send; logs and returns False on failure."""
+    try:
+        with smtplib.SMTP(server, port) as session:
+            session.starttls()
+            session.login(login, password)
+            session.send_message(message)
+        return True
+    except (gaierror, ConnectionRefusedError):
+        logging.error(
+            "Failed to connect to the server. "
+            "Bad connection settings?")
+    except smtplib.SMTPServerDisconnected:
+        logging.error(
+            "Failed to connect to the server. "
+            "Wrong user/password?"
+        )
+    except (smtplib.SMTPException, OSError) as e:
+        logging.error(
+            "SMTP error occurred: " + str(e))
+    return False
+
+
+def send_in_background(
+    send_mail: Callable[[], bool],
+    on_sent: Callable[[], None] | None = None,
+) -> threading.Thread:
+    """
+    Run ``send_mail`` on its own thread so the run can finish meanwhile.
+
+    The thread is not a daemon thread: the interpreter waits for the send
+    before it exits.
+    """
+    def worker() -> None:
+        if send_mail() and on_sent is not None:
+            on_sent()
+
+    thread = threading.Thread(target=worker, name='mail')
+    thread.start()
+    return thread
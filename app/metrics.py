@@ -0,0 +1,235 @@
+"""Prometheus metrics: text exposition, textfile collector, /metrics."""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Sequence
+
+if TYPE_CHECKING:
+    from http.server import BaseHTTPRequestHandler
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+# Folder probes: local disks answer in microseconds, network mounts not.
+PROBE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                 0.25, 0.5, 1.0, 5.0)
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+def _labels(labels: dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', r'\\').replace('\n', r'\n') \
+        .replace('"', r'\"')
+
+
+def _format(name: str, key: LabelKey, value: float) -> str:
+    if key:
+        labels = ','.join(f'{k}="{_escape(v)}"' for k, v in key)
+        name = f'{name}{{{labels}}}'
+    if value == int(value) and abs(value) < 1e15:
+        return f'{name} {int(value)}'
+    return f'{name} {value!r}'
+
+
+def _bound(le: float) -> str:
+    return '+Inf' if le == float('inf') else repr(float(le))
+
+
+class _Family:
+    def __init__(
+        self,
+        kind: str,
+        help: str,
+        buckets: Sequence[float] = (),
+    ) -> None:
+        self.kind = kind
+        self.help = help
+        self.buckets = tuple(buckets)
+        # labels -> value, or [counts per bucket (+Inf last), sum]
+        self.values: dict[LabelKey, Any] = {}
+
+
+class Metrics:
+    """
+    Thread-safe registry of counters, gauges and histograms.
+
+    Families are declared once with ``counter()``, ``gauge()`` or
+    ``histogram()``; samples take their labels as keyword arguments.
+    Collectors added with ``add_collector()`` run before every
+    ``render()`` to copy in values kept elsewhere (request statistics).
+    A disabled registry ignores every update.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._families: dict[str, _Family] = {}
+        self._collectors: list[Callable[[Metrics], None]] = []
+        self._lock = threading.Lock()
+
+    def _declare(self, name: str, family: _Family) -> None:
+        with self._lock:
+            self._families.setdefault(name, family)
+
+    def counter(self, name: str, help: str) -> None:
+        self._declare(name, _Family('counter', help))
+
+    def gauge(self, name: str, help: str) -> None:
+        self._declare(name, _Family('gauge', help))
+
+    def histogram(
+        self, name: str, help: str, buckets: Sequence[float]
+    ) -> None:
+        self._declare(name, _Family('histogram', help, buckets))
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        if not self.enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            values = self._families[name].values
+            values[key] = values.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._families[name].values[_labels(labels)] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        if not self.enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            family = self._families[name]
+            counts, total = family.values.get(
+                key, ([0] * (len(family.buckets) + 1), 0.0)
+            )
+            counts[bisect.bisect_left(family.buckets, value)] += 1
+            family.values[key] = (counts, total + value)
+
+    def set_histogram(
+        self, name: str, counts: Sequence[int], total: float, **labels: Any
+    ) -> None:
+        """Replace a histogram with bucket counts collected elsewhere."""
+        if not self.enabled:
+            return
+        with self._lock:
+            family = self._families[name]
+            if len(counts) != len(family.buckets) + 1:
+                raise ValueError(
+                    f"{name}: expected {len(family.buckets) + 1} bucket "
+                    f"counts, got {len(counts)}"
+                )
+            family.values[_labels(labels)] = (list(counts), total)
+
+    def add_collector(self, collect: Callable[[Metrics], None]) -> None:
+        with self._lock:
+            self._collectors.append(collect)
+
+    def render(self) -> str:
+        """All families in the Prometheus text exposition format."""
+        with self._lock:
+            collectors = list(self._collectors)
+        for collect in collectors:
+            try:
+                collect(self)
+            except Exception as e:
+                logging.error("Metrics collector failed: %s", e)
+        lines: list[str] = []
+        with self._lock:
+            for name, family in sorted(self._families.items()):
+                if not family.values:
+                    continue
+                lines.append(f'# HELP {name} {family.help}')
+                lines.append(f'# TYPE {name} {family.kind}')
+                for key, value in sorted(family.values.items()):
+                    if family.kind != 'histogram':
+                        lines.append(_format(name, key, value))
+                        continue
+                    counts, total = value
+                    cumulative = 0
+                    for le, count in zip(
+                        family.buckets + (float('inf'),), counts
+                    ):
+                        cumulative += count
+                        lines.append(_format(
+                            f'{name}_bucket', key + (('le', _bound(le)),),
+                            cumulative,
+                        ))
+                    lines.append(_format(f'{name}_sum', key, total))
+                    lines.append(_format(f'{name}_count', key, cumulative))
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path: str) -> None:
+        """
+        Write for node_exporter's textfile collector. The file is replaced
+        atomically so the collector never reads a half-written one.
+        """
+        tmp = f'{path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(self.render())
+            os.replace(tmp, path)
+        except OSError as e:
+            logging.error("Unable to write metrics file %s: %s", path, e)
+
+
+class MetricsServer:
+    """Serves ``metrics.render()`` on GET /metrics from a daemon thread."""
+
+    def __init__(self, host: str, port: int, metrics: Metrics) -> None:
+        # Imported here: only --daemon runs serve metrics over HTTP.
+        from http.server import ThreadingHTTPServer
+
+        self.metrics = metrics
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]
+
+    def start(self) -> MetricsServer:
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name='metrics', daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        from http.server import BaseHTTPRequestHandler
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split('?', 1)[0].rstrip('/') != '/metrics':
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                body = server.metrics.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logging.debug('Metrics %s - %s', self.address_string(),
+                              format % args)
+
+        return Handler
@@ -0,0 +1,244 @@
+"""Filesystem probing of movie folders, run concurrently per root folder."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Hashable, Iterable, Sequence, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+T = TypeVar('T')
+
+
+@dataclass(frozen=True)
+class FolderScan:
+    """Result of probing one movie folder."""
+
+    has_video: bool
+    first_seen: float | None = None
+    is_new: bool = False
+
+
+class ScanCache:
+    """
+    Persistent map of movie folder -> (directory mtime_ns, has video).
+
+    Adding, removing or renaming a file changes the directory mtime, so an
+    entry with an unchanged mtime can be trusted without listing the folder
+    again; this covers folders without video files as well.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._entries: dict[str, tuple[int, bool]] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                raw = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logging.warning(
+                "Ignoring unreadable scan cache %s: %s", self.path, e
+            )
+            return
+        if not isinstance(raw, dict):
+            return
+        entries = {}
+        for folder, v in raw.items():
+            # A malformed entry is a cache miss; the folder is listed again.
+            try:
+                if len(v) == 2:
+                    entries[str(folder)] = (int(v[0]), bool(v[1]))
+            except (ValueError, TypeError, IndexError):
+                continue
+        self._entries = entries
+
+    def save(self) -> None:
+        tmp = self.path + '.tmp'
+        with self._lock:
+            data = {k: [m, v] for k, (m, v) in self._entries.items()}
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logging.warning("Unable to write scan cache %s: %s", self.path, e)
+
+    def lookup(self, folder: str, mtime_ns: int) -> bool | None:
+        entry = self._entries.get(folder)
+        if entry is None or entry[0] != mtime_ns:
+            return None
+        return entry[1]
+
+    def store(self, folder: str, mtime_ns: int, has_video: bool) -> None:
+        with self._lock:
+            self._entries[folder] = (mtime_ns, has_video)
+
+    def retain(self, folders: Iterable[str]) -> None:
+        """Drop entries for folders that are no longer in the library."""
+        keep = set(folders)
+        with self._lock:
+            self._entries = {
+                k: v for k, v in self._entries.items() if k in keep
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def normalize_extensions(extensions: Iterable[str]) -> tuple[str, ...]:
+    """Lowercase, stripped, de-duplicated extensions for str.endswith()."""
+    return tuple(dict.fromkeys(
+        e.strip().lower() for e in extensions if e.strip()
+    ))
+
+
+class MovieScanner:
+    """
+    Detects monitored video files in a movie folder and reads (or creates)
+    the first-seen marker whose mtime is the download date.
+
+    With write_markers=False no marker is created; a movie seen for the
+    first time gets the current time, which the caller has to persist.
+    """
+
+    def __init__(
+        self,
+        video_extensions: Iterable[str],
+        marker_name: str,
+        cache: ScanCache | None = None,
+        write_markers: bool = True,
+    ) -> None:
+        self.video_extensions = normalize_extensions(video_extensions)
+        self.marker_name = marker_name
+        self.cache = cache
+        self.write_markers = write_markers
+
+    def has_video(self, path: str) -> bool:
+        """List ``path`` until the first monitored video file is found."""
+        extensions = self.video_extensions
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    name = entry.name
+                    # Hidden entries were never matched by glob('*').
+                    if name[0] != '.' and name.lower().endswith(extensions):
+                        return True
+        except OSError:
+            return False
+        return False
+
+    def probe(
+        self, path: str, known_first_seen: float | None = None
+    ) -> FolderScan:
+        """
+        Scan ``path``; a known first-seen timestamp (e.g. from the state
+        store) is used as-is and saves the marker round trips.
+        """
+        cache = self.cache
+        if cache is None:
+            if not self.has_video(path):
+                return FolderScan(False)
+            return self._first_seen(path, None, known_first_seen)
+
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return FolderScan(False)
+        has_video = cache.lookup(path, mtime_ns)
+        if has_video is None:
+            has_video = self.has_video(path)
+        if not has_video:
+            cache.store(path, mtime_ns, False)
+            return FolderScan(False)
+        return self._first_seen(path, mtime_ns, known_first_seen)
+
+    def _first_seen(
+        self,
+        path: str,
+        mtime_ns: int | None,
+        known_first_seen: float | None,
+    ) -> FolderScan:
+        is_new = False
+        if known_first_seen is not None:
+            first_seen = known_first_seen
+        else:
+            marker = os.path.join(path, self.marker_name)
+            try:
+                first_seen = os.stat(marker).st_mtime
+            except FileNotFoundError:
+                is_new = True
+                if not self.write_markers:
+                    first_seen = time.time()
+                else:
+                    open(marker, 'w').close()
+                    first_seen = os.stat(marker).st_mtime
+                    if mtime_ns is not None:
+                        # Creating the marker changed the folder mtime.
+                        mtime_ns = os.stat(path).st_mtime_ns
+        if self.cache is not None and mtime_ns is not None:
+            self.cache.store(path, mtime_ns, True)
+        return FolderScan(True, first_seen, is_new)
+
+
+def root_folder_for(path: str, roots: Sequence[str]) -> str:
+    """Longest root folder containing ``path``; '' when none matches."""
+    best = ''
+    for root in roots:
+        prefix = root.rstrip('/\\')
+        if not prefix:
+            continue
+        if path == prefix or path.startswith(prefix + '/') \
+                or path.startswith(prefix + '\\'):
+            if len(prefix) > len(best):
+                best = prefix
+    return best
+
+
+def scan_folders(
+    jobs: Iterable[tuple[K, str]],
+    probe: Callable[[K, str], T],
+    roots: Sequence[str] = (),
+    workers_per_root: int = 4,
+) -> dict[K, T]:
+    """
+    Run ``probe(key, path)`` for every job and return results by key.
+
+    Jobs are grouped by Radarr root folder and every group gets its own
+    thread pool of ``workers_per_root`` threads, so one slow mount cannot
+    starve the others. workers_per_root <= 0 probes serially in the calling
+    thread. Exceptions raised by ``probe`` propagate to the caller.
+    """
+    if workers_per_root <= 0:
+        return {key: probe(key, path) for key, path in jobs}
+
+    groups: dict[str, list[tuple[K, str]]] = {}
+    for key, path in jobs:
+        groups.setdefault(root_folder_for(path, roots), []).append(
+            (key, path)
+        )
+
+    pools = [
+        ThreadPoolExecutor(
+            max_workers=min(workers_per_root, len(group)),
+            thread_name_prefix='scan',
+        )
+        for group in groups.values()
+    ]
+    futures: dict[K, Future] = {}
+    try:
+        for pool, group in zip(pools, groups.values()):
+            for key, path in group:
+                futures[key] = pool.submit(probe, key, path)
+        return {key: fut.result() for key, fut in futures.items()}
+    finally:
+        for pool in pools:
+            pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,135 @@
+"""Background Pushover delivery with coalescing into digests."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+# Pushover rejects messages longer than this.
+MAX_MESSAGE_LENGTH = 1024
+# Pushover asks clients not to fire requests back to back.
+MIN_SEND_INTERVAL = 1.0
+
+
+def digests(messages: list[str], limit: int = MAX_MESSAGE_LENGTH) -> list[str]:
+    """Join ``messages`` line by line into as few texts of ``limit`` chars."""
+    out: list[str] = []
+    current = ''
+    for message in messages:
+        message = message[:limit]
+        if current and len(current) + 1 + len(message) > limit:
+            out.append(current)
+            current = ''
+        current = f"{current}\n{message}" if current else message
+    if current:
+        out.append(current)
+    return out
+
+
+class NotificationQueue:
+    """
+    In-process queue drained by one worker thread.
+
+    ``put()`` messages are coalesced: the worker sends a digest once
+    ``digest_size`` messages are waiting or the oldest has waited
+    ``digest_seconds``. ``put_summary()`` messages are never merged; any
+    waiting digest goes out first. Sends are at least ``min_interval``
+    seconds apart and failures are logged, not raised.
+
+    The worker is not a daemon thread, so queued messages are delivered
+    before the interpreter exits; it also stops on its own once the main
+    thread is gone, so a crashed run cannot hang on it.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str], object],
+        *,
+        digest_size: int = 10,
+        digest_seconds: float = 60.0,
+        min_interval: float = MIN_SEND_INTERVAL,
+    ) -> None:
+        self._send = send
+        self.digest_size = max(1, digest_size)
+        self.digest_seconds = max(0.0, digest_seconds)
+        self.min_interval = min_interval
+        self._pending: list[str] = []
+        self._oldest = 0.0
+        self._summaries: deque[str] = deque()
+        self._closed = False
+        self._last_send = float('-inf')
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, name='pushover'
+        )
+        self._thread.start()
+
+    def put(self, message: str) -> None:
+        with self._cond:
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.append(message)
+            self._cond.notify()
+
+    def put_summary(self, message: str) -> None:
+        with self._cond:
+            self._summaries.append(message)
+            self._cond.notify()
+
+    def close(self, timeout: float | None = 0) -> None:
+        """Send what is queued, then stop; waits up to ``timeout``."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if timeout != 0:
+            self._thread.join(timeout)
+
+    def _batch(self) -> list[str] | None:
+        # Called with the lock held; None means wait.
+        urgent = self._closed or bool(self._summaries) \
+            or not threading.main_thread().is_alive()
+        due = time.monotonic() - self._oldest >= self.digest_seconds
+        if self._pending and (
+            urgent or due or len(self._pending) >= self.digest_size
+        ):
+            batch = self._pending[:self.digest_size]
+            del self._pending[:self.digest_size]
+            self._oldest = time.monotonic()
+            return digests(batch)
+        if self._summaries:
+            return [self._summaries.popleft()]
+        return None
+
+    def _wait_timeout(self) -> float:
+        timeout = 1.0  # re-check that the main thread is still alive
+        if self._pending:
+            timeout = min(
+                timeout,
+                self._oldest + self.digest_seconds - time.monotonic(),
+            )
+        return max(0.0, timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                batch = self._batch()
+                while batch is None:
+                    if self._closed or not threading.main_thread().is_alive():
+                        return
+                    self._cond.wait(self._wait_timeout())
+                    batch = self._batch()
+            for message in batch:
+                self._deliver(message)
+
+    def _deliver(self, message: str) -> None:
+        wait = self._last_send + self.min_interval - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        try:
+            self._send(message)
+        except Exception as e:
+            logging.error("Pushover notification failed: %s", e)
+        self._last_send = time.monotonic()
@@ -0,0 +1,474 @@
+"""Asynchronous Radarr HTTP API v3 client and a blocking facade for it."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterator, NamedTuple
+
+import httpx
+
+try:
+    from app.radarr_client import (
+        CircuitBreaker,
+        JsonArrayStream,
+        MovieRecord,
+        RadarrApiError,
+        RadarrClient,
+        RateLimiter,
+        RequestStats,
+        RetryPolicy,
+        _json_objects,
+        client_options,
+        endpoint_key,
+    )
+except ModuleNotFoundError:
+    from radarr_client import (
+        CircuitBreaker,
+        JsonArrayStream,
+        MovieRecord,
+        RadarrApiError,
+        RadarrClient,
+        RateLimiter,
+        RequestStats,
+        RetryPolicy,
+        _json_objects,
+        client_options,
+        endpoint_key,
+    )
+
+if TYPE_CHECKING:
+    from app.api_cache import ResponseCache
+
+
+class RadarrBootstrap(NamedTuple):
+    """Everything a prune run needs up front, fetched concurrently."""
+
+    status: dict[str, Any]
+    tags: list[dict[str, Any]]
+    root_folders: list[dict[str, Any]] | None
+    movies: list[MovieRecord]
+
+
+class AsyncRadarrClient:
+    """
+    RadarrClient on httpx.AsyncClient.
+
+    Offers the same calls as coroutines, plus bootstrap() which fetches
+    status, tags, root folders and movies concurrently. Deletes and other
+    mutating calls are limited to ``max_concurrent_mutations`` at a time.
+    Retries, circuit breaker and pool options behave as in RadarrClient.
+    """
+
+    _raise_for_status = RadarrClient._raise_for_status
+    _attempt_done = RadarrClient._attempt_done
+    _cached_response = RadarrClient._cached_response
+    _movie_record = RadarrClient._movie_record
+    invalidate_cache = RadarrClient.invalidate_cache
+    served_from_cache = RadarrClient.served_from_cache
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        timeout: float = 60.0,
+        *,
+        max_requests_per_second: float = 0,
+        burst: float | None = None,
+        max_concurrent_mutations: int = 4,
+        retry: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+        max_connections: int | None = 100,
+        max_keepalive_connections: int | None = 20,
+        keepalive_expiry: float | None = 5.0,
+        http2: bool = False,
+        cache: ResponseCache | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self._base = base_url.rstrip().rstrip('/')
+        self._headers = {
+            'X-Api-Key': api_key,
+            'Accept': 'application/json',
+        }
+        self._timeout = timeout
+        self._client = httpx.AsyncClient(
+            base_url=self._base,
+            headers=self._headers,
+            timeout=timeout,
+            transport=transport,
+            **client_options(
+                max_connections,
+                max_keepalive_connections,
+                keepalive_expiry,
+                http2,
+            ),
+        )
+        self._limiter = (
+            RateLimiter(max_requests_per_second, burst)
+            if max_requests_per_second > 0 else None
+        )
+        self._retry = retry if retry is not None else RetryPolicy()
+        self._breaker = breaker if breaker is not None else CircuitBreaker()
+        self.stats = RequestStats()
+        self._cache = cache
+        self._mutations = asyncio.Semaphore(max(1, max_concurrent_mutations))
+        self.last_response_bytes = 0
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def __aenter__(self) -> AsyncRadarrClient:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+    async def _throttle(self) -> None:
+        if self._limiter is not None:
+            wait = self._limiter.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        *,
+        retry: bool = True,
+        stream: bool = False,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Async RadarrClient._request(); see there."""
+        endpoint = endpoint_key(method, url)
+        attempts = self._retry.attempts if retry else 1
+        attempt, busy, ok = 0, 0.0, False
+        try:
+            while True:
+                attempt += 1
+                self._breaker.before_request()
+                await self._throttle()
+                request = self._client.build_request(method, url, **kwargs)
+                started = time.monotonic()
+                try:
+                    r = await self._client.send(request, stream=stream)
+                except httpx.TransportError as e:
+                    latency = time.monotonic() - started
+                    busy += latency
+                    delay = self._attempt_done(
+                        endpoint, attempt, attempts, latency, None, e
+                    )
+                    if delay is None:
+                        # Callers handle RadarrApiError, not httpx errors.
+                        raise RadarrApiError(f'Radarr {endpoint}: {e!r}') \
+                            from e
+                else:
+                    latency = time.monotonic() - started
+                    busy += latency
+                    delay = self._attempt_done(
+                        endpoint, attempt, attempts, latency, r
+                    )
+                    if delay is None:
+                        ok = r.is_success
+                        return r
+                    await r.aclose()
+                await asyncio.sleep(delay)
+        finally:
+            self.stats.record(endpoint, attempt, busy, ok)
+
+    async def _mutate(
+        self, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response:
+        async with self._mutations:
+            return await self._request(method, url, **kwargs)
+
+    async def _get_list(self, url: str, context: str) -> list[Any]:
+        r = await self._request('GET', url)
+        self._raise_for_status(r, context)
+        data = r.json()
+        if not isinstance(data, list):
+            raise RadarrApiError(f'{context}: expected JSON array')
+        return data
+
+    async def ping(self) -> dict[str, Any]:
+        """Verify URL and API key (GET /api/v3/system/status)."""
+        r = await self._request('GET', '/api/v3/system/status')
+        self._raise_for_status(r, 'Radarr system/status')
+        return r.json()
+
+    async def get_movies(self) -> list[dict[str, Any]]:
+        data = await self._get_list('/api/v3/movie', 'Radarr movie list')
+        return data
+
+    async def iter_movies(
+        self, chunk_size: int = 65536
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream GET /api/v3/movie, one movie object at a time."""
+        r = await self._request('GET', '/api/v3/movie', stream=True)
+        try:
+            if not r.is_success:
+                await r.aread()
+                self._raise_for_status(r, 'Radarr movie list')
+            stream = JsonArrayStream()
+            try:
+                async for chunk in r.aiter_bytes(chunk_size):
+                    for row in _json_objects(stream.feed(chunk)):
+                        yield row
+                for row in _json_objects(stream.close()):
+                    yield row
+            except (ValueError, httpx.TransportError) as e:
+                raise RadarrApiError(f'Radarr movie list: {e}') from e
+            finally:
+                self.last_response_bytes = stream.bytes_read
+        finally:
+            await r.aclose()
+
+    async def iter_movie_records(self) -> AsyncIterator[MovieRecord]:
+        async for row in self.iter_movies():
+            yield MovieRecord.from_api(row)
+
+    async def get_movie_records(self, stream: bool = True) -> list[MovieRecord]:
+        if stream:
+            return [m async for m in self.iter_movie_records()]
+        r = await self._request('GET', '/api/v3/movie')
+        self._raise_for_status(r, 'Radarr movie list')
+        self.last_response_bytes = len(r.content)
+        data = r.json()
+        if not isinstance(data, list):
+            raise RadarrApiError('Radarr movie list: expected JSON array')
+        return [MovieRecord.from_api(m) for m in data]
+
+    async def _cached_list(
+        self, url: str, context: str, refresh: bool = False
+    ) -> list[Any]:
+        cache = self._cache
+        key = self._base + url
+        headers: dict[str, str] = {}
+        if cache is not None:
+            if refresh:
+                cache.invalidate(key)
+            data, headers = cache.lookup(key)
+            if data is not None:
+                return data
+        r = await self._request('GET', url, headers=headers)
+        return self._cached_response(r, key, context)
+
+    async def get_tags(self, refresh: bool = False) -> list[dict[str, Any]]:
+        return await self._cached_list('/api/v3/tag', 'Radarr tags', refresh)
+
+    async def get_root_folders(
+        self, refresh: bool = False
+    ) -> list[dict[str, Any]]:
+        return await self._cached_list(
+            '/api/v3/rootfolder', 'Radarr rootfolder', refresh
+        )
+
+    async def get_movie(self, movie_id: int) -> MovieRecord | None:
+        r = await self._request('GET', f'/api/v3/movie/{movie_id}')
+        return self._movie_record(r, movie_id)
+
+    async def bootstrap(self, stream: bool = True) -> RadarrBootstrap:
+        """
+        Fetch status, tags, root folders and movies concurrently. A failing
+        root folder call is not fatal (root_folders is None then).
+        """
+        status, tags, roots, movies = await asyncio.gather(
+            self.ping(),
+            self.get_tags(),
+            self.get_root_folders(),
+            self.get_movie_records(stream),
+            return_exceptions=True,
+        )
+        for result in (status, tags, movies):
+            if isinstance(result, BaseException):
+                raise result
+        if isinstance(roots, BaseException):
+            logging.warning('Radarr root folders unavailable: %s', roots)
+            roots = None
+        return RadarrBootstrap(status, tags, roots, movies)
+
+    async def delete_movie(
+        self,
+        movie_id: int,
+        *,
+        delete_files: bool,
+        add_import_exclusion: bool,
+    ) -> None:
+        r = await self._mutate(
+            'DELETE',
+            f'/api/v3/movie/{movie_id}',
+            params={
+                'deleteFiles': delete_files,
+                'addImportExclusion': add_import_exclusion,
+            },
+        )
+        if r.status_code == 404:
+            logging.warning(
+                'Radarr DELETE movie/%s: not found (404); may already be '
+                'removed.',
+                movie_id,
+            )
+            return
+        self._raise_for_status(r, f'Radarr delete movie {movie_id}')
+
+    async def _delete_one(self, movie_id: int, **flags: bool) -> bool:
+        try:
+            await self.delete_movie(movie_id, **flags)
+            return True
+        except (RadarrApiError, httpx.HTTPError) as e:
+            logging.error(
+                'Radarr API error deleting movie %s: %s', movie_id, e
+            )
+            return False
+
+    async def _delete_chunk(
+        self, chunk: list[int], **flags: bool
+    ) -> dict[int, bool]:
+        try:
+            r = await self._mutate(
+                'DELETE',
+                '/api/v3/movie/editor',
+                retry=False,
+                json={
+                    'movieIds': chunk,
+                    'deleteFiles': flags['delete_files'],
+                    'addImportExclusion': flags['add_import_exclusion'],
+                },
+            )
+            self._raise_for_status(r, 'Radarr bulk delete movies')
+        except (RadarrApiError, httpx.HTTPError) as e:
+            logging.warning(
+                'Radarr bulk delete of %d movies failed (%s); '
+                'deleting them one by one.',
+                len(chunk),
+                e,
+            )
+            done = await asyncio.gather(
+                *(self._delete_one(i, **flags) for i in chunk)
+            )
+            return dict(zip(chunk, done))
+        return dict.fromkeys(chunk, True)
+
+    async def delete_movies(
+        self,
+        movie_ids: list[int],
+        *,
+        delete_files: bool,
+        add_import_exclusion: bool,
+        chunk_size: int = 50,
+        bulk: bool = True,
+    ) -> dict[int, bool]:
+        """
+        Concurrent counterpart of RadarrClient.delete_movies(); with
+        bulk=False every id gets its own DELETE /api/v3/movie/{id}.
+        """
+        flags = {
+            'delete_files': delete_files,
+            'add_import_exclusion': add_import_exclusion,
+        }
+        if not bulk:
+            done = await asyncio.gather(
+                *(self._delete_one(i, **flags) for i in movie_ids)
+            )
+            return dict(zip(movie_ids, done))
+        chunk_size = max(1, chunk_size)
+        parts = await asyncio.gather(*(
+            self._delete_chunk(movie_ids[i:i + chunk_size], **flags)
+            for i in range(0, len(movie_ids), chunk_size)
+        ))
+        results: dict[int, bool] = {}
+        for part in parts:
+            results.update(part)
+        return results
+
+
+class BlockingRadarrClient:
+    """
+    Synchronous facade over AsyncRadarrClient with the RadarrClient API,
+    so the prune script can use concurrent bootstrap and deletes without
+    becoming async itself. Runs a private event loop; use it from one
+    thread at a time.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._async = AsyncRadarrClient(*args, **kwargs)
+
+    def _run(self, coro: Any) -> Any:
+        return self._loop.run_until_complete(coro)
+
+    @property
+    def last_response_bytes(self) -> int:
+        return self._async.last_response_bytes
+
+    @property
+    def stats(self) -> RequestStats:
+        return self._async.stats
+
+    def close(self) -> None:
+        if not self._loop.is_closed():
+            self._run(self._async.aclose())
+            self._loop.close()
+
+    def __enter__(self) -> BlockingRadarrClient:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def ping(self) -> None:
+        self._run(self._async.ping())
+
+    def bootstrap(self, stream: bool = True) -> RadarrBootstrap:
+        return self._run(self._async.bootstrap(stream))
+
+    def get_movies(self) -> list[dict[str, Any]]:
+        return self._run(self._async.get_movies())
+
+    def iter_movie_records(self) -> Iterator[MovieRecord]:
+        return iter(self._run(self._async.get_movie_records(stream=True)))
+
+    def invalidate_cache(self, url: str) -> None:
+        self._async.invalidate_cache(url)
+
+    def served_from_cache(self, url: str) -> bool:
+        return self._async.served_from_cache(url)
+
+    def get_tags(self, refresh: bool = False) -> list[dict[str, Any]]:
+        return self._run(self._async.get_tags(refresh))
+
+    def get_root_folders(self, refresh: bool = False) -> list[dict[str, Any]]:
+        return self._run(self._async.get_root_folders(refresh))
+
+    def get_movie(self, movie_id: int) -> MovieRecord | None:
+        return self._run(self._async.get_movie(movie_id))
+
+    def delete_movie(
+        self,
+        movie_id: int,
+        *,
+        delete_files: bool,
+        add_import_exclusion: bool,
+    ) -> None:
+        self._run(self._async.delete_movie(
+            movie_id,
+            delete_files=delete_files,
+            add_import_exclusion=add_import_exclusion,
+        ))
+
+    def delete_movies(
+        self,
+        movie_ids: list[int],
+        *,
+        delete_files: bool,
+        add_import_exclusion: bool,
+        chunk_size: int = 50,
+        bulk: bool = True,
+    ) -> dict[int, bool]:
+        return self._run(self._async.delete_movies(
+            movie_ids,
+            delete_files=delete_files,
+            add_import_exclusion=add_import_exclusion,
+            chunk_size=chunk_size,
+            bulk=bulk,
+        ))
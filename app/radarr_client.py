@@ -2,24 +2,416 @@
 
 from __future__ import annotations
 
+import bisect
+import codecs
+import importlib.util
+import json
 import logging
+import random
+import re
+import sys
+import threading
+import time
 from dataclasses import dataclass
-from typing import Any
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any, Callable, Iterator
 import httpx
 
+try:
+    from app.radarr_errors import RadarrApiError, RadarrUnavailableError
+except ModuleNotFoundError:
+    from radarr_errors import RadarrApiError, RadarrUnavailableError
 
-class RadarrApiError(Exception):
-    """Raised when the Radarr API returns an error response."""
+if TYPE_CHECKING:
+    from app.api_cache import ResponseCache
 
-    def __init__(self, message: str, status_code: int | None = None) -> None:
-        super().__init__(message)
-        self.status_code = status_code
+
+class RateLimiter:
+    """
+    Adaptive token bucket for outgoing Radarr requests.
+
+    Tokens refill at ``rate`` per second up to ``burst``; every request takes
+    one. The effective rate is halved on HTTP 429/503, reduced when responses
+    are slower than ``target_latency`` and grows back towards ``max_rate``
+    while Radarr answers quickly.
+    """
+
+    BACKOFF_STATUS = (429, 503)
+
+    def __init__(
+        self,
+        max_rate: float,
+        burst: float | None = None,
+        *,
+        min_rate: float = 0.5,
+        target_latency: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_rate <= 0:
+            raise ValueError('max_rate must be positive')
+        self.max_rate = float(max_rate)
+        self.min_rate = min(float(min_rate), self.max_rate)
+        self.rate = self.max_rate
+        self.burst = float(burst) if burst else max(1.0, self.max_rate)
+        self.target_latency = target_latency
+        self._clock = clock
+        self._tokens = self.burst
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._last = now
+
+    def reserve(self) -> float:
+        """Take a token; return the seconds to wait before sending."""
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, sleep: Callable[[float], None] = time.sleep) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            sleep(wait)
+
+    def observe(self, latency: float, status_code: int | None) -> None:
+        """Adapt the rate to the outcome of a finished request."""
+        with self._lock:
+            self._refill(self._clock())
+            if status_code in self.BACKOFF_STATUS:
+                self.rate = max(self.min_rate, self.rate / 2)
+                self._tokens = min(self._tokens, 0.0)
+            elif latency > self.target_latency:
+                self.rate = max(self.min_rate, self.rate * 0.8)
+            else:
+                self.rate = min(
+                    self.max_rate, self.rate + self.max_rate / 10
+                )
+
+
+def parse_retry_after(
+    value: str | None, now: datetime | None = None
+) -> float | None:
+    """Seconds to wait from a Retry-After header (delta or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (when - now).total_seconds())
+
+
+class RetryPolicy:
+    """
+    Jittered exponential backoff for idempotent Radarr requests.
+
+    Retry n waits a random time between 0 and
+    min(max_delay, base_delay * 2 ** (n - 1)) ("full jitter"), so clients
+    that failed together do not retry together. A Retry-After header from
+    Radarr takes precedence, capped at max_delay.
+    """
+
+    RETRY_STATUS = frozenset((408, 429, 502, 503, 504))
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        *,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self.max_retries = max(0, int(max_retries))
+        self.base_delay = max(0.0, float(base_delay))
+        self.max_delay = max(0.0, float(max_delay))
+        self._rng = rng
+
+    @property
+    def attempts(self) -> int:
+        return self.max_retries + 1
+
+    def retryable(self, status_code: int) -> bool:
+        return status_code in self.RETRY_STATUS
+
+    def delay(self, retry: int, retry_after: str | None = None) -> float:
+        """Seconds to sleep before retry number ``retry`` (1-based)."""
+        hinted = parse_retry_after(retry_after)
+        if hinted is not None:
+            return min(hinted, self.max_delay)
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (retry - 1))
+        return self._rng() * ceiling
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to a Radarr that keeps failing.
+
+    After ``failure_threshold`` consecutive failed attempts (connection
+    errors, 5xx, 429) the breaker opens and requests fail immediately with
+    RadarrUnavailableError. After ``reset_timeout`` seconds one trial
+    request is let through; its outcome closes or re-opens the breaker.
+    failure_threshold <= 0 disables the breaker.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = int(failure_threshold)
+        self.reset_timeout = float(reset_timeout)
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if self._trial or \
+                    self._clock() - self._opened_at >= self.reset_timeout:
+                return 'half-open'
+            return 'open'
+
+    def before_request(self) -> None:
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            if self._opened_at is None:
+                return
+            remaining = self._opened_at + self.reset_timeout - self._clock()
+            if remaining <= 0 and not self._trial:
+                self._trial = True
+                return
+        raise RadarrUnavailableError(
+            'Radarr circuit breaker open after '
+            f'{self._failures} consecutive failures'
+            + (f'; retry in {remaining:.0f}s' if remaining > 0 else '')
+        )
+
+    def record(self, ok: bool) -> None:
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            self._trial = False
+            if ok:
+                self._failures = 0
+                self._opened_at = None
+                return
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logging.warning(
+                        'Radarr failed %d times in a row; pausing requests '
+                        'for %.0fs.',
+                        self._failures,
+                        self.reset_timeout,
+                    )
+                self._opened_at = self._clock()
+
+
+_ID_SEGMENT = re.compile(r'/\d+(?=/|$)')
+
+
+def endpoint_key(method: str, url: str) -> str:
+    """'DELETE /api/v3/movie/{id}' for 'DELETE', '/api/v3/movie/42'."""
+    return f"{method} {_ID_SEGMENT.sub('/{id}', url)}"
+
+
+# Upper bounds (seconds) of the per-endpoint latency histogram buckets.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0, 30.0)
+
+
+class RequestStats:
+    """Per-endpoint request, attempt, failure and latency counters."""
+
+    def __init__(self) -> None:
+        # endpoint -> [requests, attempts, failed, latency sum, latency max]
+        self._stats: dict[str, list[float]] = {}
+        # endpoint -> request count per LATENCY_BUCKETS bucket (+Inf last)
+        self._buckets: dict[str, list[int]] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self, endpoint: str, attempts: int, latency: float, ok: bool
+    ) -> None:
+        with self._lock:
+            s = self._stats.setdefault(endpoint, [0, 0, 0, 0.0, 0.0])
+            s[0] += 1
+            s[1] += attempts
+            s[2] += not ok
+            s[3] += latency
+            s[4] = max(s[4], latency)
+            counts = self._buckets.setdefault(
+                endpoint, [0] * (len(LATENCY_BUCKETS) + 1)
+            )
+            counts[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    def summary(self) -> list[str]:
+        """One human-readable line per endpoint, busiest first."""
+        with self._lock:
+            rows = sorted(self._stats.items(), key=lambda kv: -kv[1][0])
+        return [
+            f"{endpoint}: {int(n)} requests, {int(attempts)} attempts, "
+            f"{int(failed)} failed, avg {total / n * 1000:.0f} ms, "
+            f"max {peak * 1000:.0f} ms"
+            for endpoint, (n, attempts, failed, total, peak) in rows
+        ]
+
+    def histograms(self) -> dict[str, tuple[list[int], float, int]]:
+        """endpoint -> (counts per LATENCY_BUCKETS bucket, sum, failed)."""
+        with self._lock:
+            return {
+                endpoint: (list(counts), self._stats[endpoint][3],
+                           int(self._stats[endpoint][2]))
+                for endpoint, counts in self._buckets.items()
+            }
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec('h2') is not None
+
+
+def client_options(
+    max_connections: int | None,
+    max_keepalive_connections: int | None,
+    keepalive_expiry: float | None,
+    http2: bool,
+) -> dict[str, Any]:
+    """httpx.Client/AsyncClient pool keyword arguments."""
+    if http2 and not http2_available():
+        logging.warning(
+            "HTTP/2 requested but the 'h2' package is not installed; "
+            "using HTTP/1.1."
+        )
+        http2 = False
+    return {
+        'limits': httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        'http2': http2,
+    }
+
+
+_JSON_WS = re.compile(r'[ \t\n\r]*')
+
+
+class JsonArrayStream:
+    """
+    Incremental decoder for a top-level JSON array.
+
+    feed() takes raw UTF-8 bytes as they arrive and returns the array
+    elements completed so far, so only one element plus the unparsed tail
+    of the current chunk is held in memory at a time.
+    """
+
+    def __init__(self) -> None:
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        # start -> value (expect element) -> sep (expect , or ]) -> done
+        self._state = 'start'
+        self.bytes_read = 0
+
+    def feed(self, data: bytes) -> list[Any]:
+        self.bytes_read += len(data)
+        self._buf = self._buf[self._pos:] + self._text.decode(data)
+        self._pos = 0
+        return self._drain(final=False)
+
+    def close(self) -> list[Any]:
+        """Flush the stream; raises ValueError if the array is incomplete."""
+        self._buf = self._buf[self._pos:] + self._text.decode(b'', True)
+        self._pos = 0
+        items = self._drain(final=True)
+        if self._state != 'done':
+            raise ValueError('truncated JSON array')
+        return items
+
+    def _drain(self, final: bool) -> list[Any]:
+        buf = self._buf
+        pos = self._pos
+        items: list[Any] = []
+        while True:
+            pos = _JSON_WS.match(buf, pos).end()
+            if pos >= len(buf):
+                break
+            ch = buf[pos]
+            if self._state == 'start':
+                if ch != '[':
+                    raise ValueError('expected a JSON array')
+                self._state = 'first'
+                pos += 1
+            elif self._state == 'done':
+                raise ValueError('unexpected data after JSON array')
+            elif ch == ']' and self._state in ('first', 'sep'):
+                self._state = 'done'
+                pos += 1
+            elif self._state == 'sep':
+                if ch != ',':
+                    raise ValueError(f'unexpected {ch!r} in JSON array')
+                self._state = 'value'
+                pos += 1
+            else:
+                try:
+                    value, end = self._json.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    break  # element continues in the next chunk
+                if end == len(buf) and not final \
+                        and not isinstance(value, (dict, list)):
+                    break  # a scalar may be cut off mid-token
+                items.append(value)
+                self._state = 'sep'
+                pos = end
+        self._pos = pos
+        return items
+
+
+def _json_objects(rows: list[Any]) -> list[dict[str, Any]]:
+    for row in rows:
+        if not isinstance(row, dict):
+            raise ValueError('expected an array of JSON objects')
+    return rows
 
 
 class RadarrClient:
     """
     Thin wrapper around Radarr REST API v3.
     Base URL should be like http://host:7878 (no trailing slash required).
+
+    max_requests_per_second > 0 enables an adaptive RateLimiter for all
+    HTTP requests; 0 leaves requests unthrottled.
+
+    Idempotent calls (GETs and per-movie deletes) are retried on connection
+    errors and on 408/429/502/503/504 according to ``retry``; every attempt
+    passes the circuit breaker. Pool defaults match httpx.
+
+    With a ResponseCache, tags and root folders are served from disk while
+    fresh and revalidated conditionally afterwards.
     """
 
     def __init__(
@@ -27,6 +419,17 @@ class RadarrClient:
         base_url: str,
         api_key: str,
         timeout: float = 60.0,
+        *,
+        max_requests_per_second: float = 0,
+        burst: float | None = None,
+        retry: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+        max_connections: int | None = 100,
+        max_keepalive_connections: int | None = 20,
+        keepalive_expiry: float | None = 5.0,
+        http2: bool = False,
+        cache: ResponseCache | None = None,
+        transport: httpx.BaseTransport | None = None,
     ) -> None:
         self._base = base_url.rstrip().rstrip('/')
         self._headers = {
@@ -38,7 +441,24 @@ class RadarrClient:
             base_url=self._base,
             headers=self._headers,
             timeout=timeout,
+            transport=transport,
+            **client_options(
+                max_connections,
+                max_keepalive_connections,
+                keepalive_expiry,
+                http2,
+            ),
         )
+        self._limiter = (
+            RateLimiter(max_requests_per_second, burst)
+            if max_requests_per_second > 0 else None
+        )
+        self._retry = retry if retry is not None else RetryPolicy()
+        self._breaker = breaker if breaker is not None else CircuitBreaker()
+        self.stats = RequestStats()
+        self._cache = cache
+        # Body size of the last movie list download, for run statistics.
+        self.last_response_bytes = 0
 
     def close(self) -> None:
         self._client.close()
@@ -58,34 +478,200 @@ class RadarrClient:
         )
         raise RadarrApiError(msg, status_code=response.status_code)
 
+    def _attempt_done(
+        self,
+        endpoint: str,
+        attempt: int,
+        attempts: int,
+        latency: float,
+        response: httpx.Response | None,
+        error: Exception | None = None,
+    ) -> float | None:
+        """
+        Book-keeping after one attempt; returns the delay before the next
+        attempt, or None when the outcome is final.
+        """
+        status = response.status_code if response is not None else None
+        if self._limiter is not None and status is not None:
+            self._limiter.observe(latency, status)
+        transient = error is not None or self._retry.retryable(status)
+        self._breaker.record(not transient and status < 500)
+        if not transient or attempt >= attempts:
+            return None
+        delay = self._retry.delay(
+            attempt,
+            response.headers.get('Retry-After') if response is not None
+            else None,
+        )
+        logging.warning(
+            'Radarr %s: %s; retry %d/%d in %.1fs.',
+            endpoint,
+            f'HTTP {status}' if error is None else repr(error),
+            attempt,
+            attempts - 1,
+            delay,
+        )
+        return delay
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        *,
+        retry: bool = True,
+        stream: bool = False,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Send a request with rate limiting, retries and the circuit breaker.
+        With stream=True the caller must close the returned response.
+        """
+        endpoint = endpoint_key(method, url)
+        attempts = self._retry.attempts if retry else 1
+        attempt, busy, ok = 0, 0.0, False
+        try:
+            while True:
+                attempt += 1
+                self._breaker.before_request()
+                if self._limiter is not None:
+                    self._limiter.acquire()
+                request = self._client.build_request(method, url, **kwargs)
+                started = time.monotonic()
+                try:
+                    r = self._client.send(request, stream=stream)
+                except httpx.TransportError as e:
+                    latency = time.monotonic() - started
+                    busy += latency
+                    delay = self._attempt_done(
+                        endpoint, attempt, attempts, latency, None, e
+                    )
+                    if delay is None:
+                        # Callers handle RadarrApiError, not httpx errors.
+                        raise RadarrApiError(f'Radarr {endpoint}: {e!r}') \
+                            from e
+                else:
+                    latency = time.monotonic() - started
+                    busy += latency
+                    delay = self._attempt_done(
+                        endpoint, attempt, attempts, latency, r
+                    )
+                    if delay is None:
+                        ok = r.is_success
+                        return r
+                    r.close()
+                time.sleep(delay)
+        finally:
+            self.stats.record(endpoint, attempt, busy, ok)
+
     def ping(self) -> None:
         """Verify URL and API key (GET /api/v3/system/status)."""
-        r = self._client.get('/api/v3/system/status')
+        r = self._request('GET', '/api/v3/system/status')
         self._raise_for_status(r, 'Radarr system/status')
 
     def get_movies(self) -> list[dict[str, Any]]:
-        r = self._client.get('/api/v3/movie')
+        r = self._request('GET', '/api/v3/movie')
         self._raise_for_status(r, 'Radarr movie list')
+        self.last_response_bytes = len(r.content)
         data = r.json()
         if not isinstance(data, list):
             raise RadarrApiError('Radarr movie list: expected JSON array')
         return data
 
-    def get_tags(self) -> list[dict[str, Any]]:
-        r = self._client.get('/api/v3/tag')
-        self._raise_for_status(r, 'Radarr tags')
+    def iter_movies(
+        self, chunk_size: int = 65536
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Stream GET /api/v3/movie and yield one movie object at a time
+        instead of decoding the whole (large) response at once.
+        """
+        r = self._request('GET', '/api/v3/movie', stream=True)
+        try:
+            if not r.is_success:
+                r.read()
+                self._raise_for_status(r, 'Radarr movie list')
+            stream = JsonArrayStream()
+            try:
+                for chunk in r.iter_bytes(chunk_size):
+                    yield from _json_objects(stream.feed(chunk))
+                yield from _json_objects(stream.close())
+            except (ValueError, httpx.TransportError) as e:
+                raise RadarrApiError(f'Radarr movie list: {e}') from e
+            finally:
+                self.last_response_bytes = stream.bytes_read
+        finally:
+            r.close()
+
+    def iter_movie_records(self) -> Iterator[MovieRecord]:
+        """Streamed movie list, projected to MovieRecord one by one."""
+        for row in self.iter_movies():
+            yield MovieRecord.from_api(row)
+
+    def invalidate_cache(self, url: str) -> None:
+        if self._cache is not None:
+            self._cache.invalidate(self._base + url)
+
+    def served_from_cache(self, url: str) -> bool:
+        """Whether ``url`` was last answered from the cache, unverified."""
+        return self._cache is not None and \
+            self._base + url in self._cache.served
+
+    def _cached_list(
+        self, url: str, context: str, refresh: bool = False
+    ) -> list[Any]:
+        """GET a JSON array through the response cache, if any."""
+        cache = self._cache
+        key = self._base + url
+        headers: dict[str, str] = {}
+        if cache is not None:
+            if refresh:
+                cache.invalidate(key)
+            data, headers = cache.lookup(key)
+            if data is not None:
+                return data
+        r = self._request('GET', url, headers=headers)
+        return self._cached_response(r, key, context)
+
+    def _cached_response(
+        self, r: httpx.Response, key: str, context: str
+    ) -> list[Any]:
+        cache = self._cache
+        if r.status_code == 304 and cache is not None:
+            data = cache.revalidated(key)
+            if data is not None:
+                return data
+        self._raise_for_status(r, context)
         data = r.json()
         if not isinstance(data, list):
-            raise RadarrApiError('Radarr tags: expected JSON array')
+            raise RadarrApiError(f'{context}: expected JSON array')
+        if cache is not None:
+            cache.store(key, data, r.headers)
         return data
 
-    def get_root_folders(self) -> list[dict[str, Any]]:
-        r = self._client.get('/api/v3/rootfolder')
-        self._raise_for_status(r, 'Radarr rootfolder')
+    def get_tags(self, refresh: bool = False) -> list[dict[str, Any]]:
+        return self._cached_list('/api/v3/tag', 'Radarr tags', refresh)
+
+    def get_root_folders(self, refresh: bool = False) -> list[dict[str, Any]]:
+        return self._cached_list(
+            '/api/v3/rootfolder', 'Radarr rootfolder', refresh
+        )
+
+    def get_movie(self, movie_id: int) -> MovieRecord | None:
+        """One movie (GET /api/v3/movie/{id}); None if it no longer exists."""
+        r = self._request('GET', f'/api/v3/movie/{movie_id}')
+        return self._movie_record(r, movie_id)
+
+    def _movie_record(
+        self, r: httpx.Response, movie_id: int
+    ) -> MovieRecord | None:
+        if r.status_code == 404:
+            return None
+        self._raise_for_status(r, f'Radarr movie {movie_id}')
         data = r.json()
-        if not isinstance(data, list):
-            raise RadarrApiError('Radarr rootfolder: expected JSON array')
-        return data
+        if not isinstance(data, dict):
+            raise RadarrApiError(
+                f'Radarr movie {movie_id}: expected JSON object'
+            )
+        return MovieRecord.from_api(data)
 
     def delete_movie(
         self,
@@ -94,7 +680,8 @@ class RadarrClient:
         delete_files: bool,
         add_import_exclusion: bool,
     ) -> None:
-        r = self._client.delete(
+        r = self._request(
+            'DELETE',
             f'/api/v3/movie/{movie_id}',
             params={
                 'deleteFiles': delete_files,
@@ -110,37 +697,168 @@ class RadarrClient:
             return
         self._raise_for_status(r, f'Radarr delete movie {movie_id}')
 
+    def delete_movies(
+        self,
+        movie_ids: list[int],
+        *,
+        delete_files: bool,
+        add_import_exclusion: bool,
+        chunk_size: int = 50,
+        bulk: bool = True,
+    ) -> dict[int, bool]:
+        """
+        Delete movies through DELETE /api/v3/movie/editor, ``chunk_size``
+        ids per request. A chunk whose bulk call fails is retried with one
+        delete_movie() per id; bulk=False skips the editor call entirely.
+        Returns {movie_id: deleted}.
+        """
+        if not bulk:
+            return self._delete_each(
+                movie_ids,
+                delete_files=delete_files,
+                add_import_exclusion=add_import_exclusion,
+            )
+        results: dict[int, bool] = {}
+        chunk_size = max(1, chunk_size)
+        for start in range(0, len(movie_ids), chunk_size):
+            chunk = movie_ids[start:start + chunk_size]
+            try:
+                # Not retried here: a failed chunk falls back to per-id
+                # deletes, which are.
+                r = self._request(
+                    'DELETE',
+                    '/api/v3/movie/editor',
+                    retry=False,
+                    json={
+                        'movieIds': chunk,
+                        'deleteFiles': delete_files,
+                        'addImportExclusion': add_import_exclusion,
+                    },
+                )
+                self._raise_for_status(r, 'Radarr bulk delete movies')
+            except (RadarrApiError, httpx.HTTPError) as e:
+                logging.warning(
+                    'Radarr bulk delete of %d movies failed (%s); '
+                    'deleting them one by one.',
+                    len(chunk),
+                    e,
+                )
+                results.update(self._delete_each(
+                    chunk,
+                    delete_files=delete_files,
+                    add_import_exclusion=add_import_exclusion,
+                ))
+            else:
+                results.update(dict.fromkeys(chunk, True))
+        return results
+
+    def _delete_each(
+        self,
+        movie_ids: list[int],
+        *,
+        delete_files: bool,
+        add_import_exclusion: bool,
+    ) -> dict[int, bool]:
+        results: dict[int, bool] = {}
+        for movie_id in movie_ids:
+            try:
+                self.delete_movie(
+                    movie_id,
+                    delete_files=delete_files,
+                    add_import_exclusion=add_import_exclusion,
+                )
+                results[movie_id] = True
+            except (RadarrApiError, httpx.HTTPError) as e:
+                logging.error(
+                    'Radarr API error deleting movie %s: %s', movie_id, e
+                )
+                results[movie_id] = False
+        return results
+
+
+_FRACTION_RE = re.compile(r'(\.\d{6})\d+')
+
+
+def parse_api_datetime(value: Any) -> datetime | None:
+    """
+    Parse a Radarr ISO-8601 timestamp into a naive local datetime (the same
+    convention as datetime.fromtimestamp). Returns None for missing or
+    unparseable values.
+    """
+    if not isinstance(value, str) or not value.strip():
+        return None
+    text = value.strip()
+    if text.endswith('Z'):
+        text = text[:-1] + '+00:00'
+    # .NET emits up to 7 fractional digits; fromisoformat accepts 6.
+    text = _FRACTION_RE.sub(r'\1', text, count=1)
+    try:
+        dt = datetime.fromisoformat(text)
+        if dt.tzinfo is not None:
+            dt = dt.astimezone().replace(tzinfo=None)
+    except (ValueError, OverflowError, OSError):
+        return None
+    return dt
+
 
-@dataclass
+# Genre and tag combinations repeat across the library; share one tuple
+# per distinct combination instead of allocating one per movie.
+_SHARED_TUPLES: dict[tuple, tuple] = {}
+
+
+def _shared(values: tuple) -> tuple:
+    return _SHARED_TUPLES.setdefault(values, values)
+
+
+@dataclass(frozen=True, slots=True)
 class MovieRecord:
-    """Normalized movie fields from GET /api/v3/movie (camelCase JSON)."""
+    """
+    Normalized movie fields from GET /api/v3/movie (camelCase JSON).
+
+    Records are immutable and slotted to keep large libraries small:
+    genres are interned strings and genres/tagsIds are shared tuples.
+
+    The file fields come from the embedded movieFile object; they let the
+    prune run work from the API payload alone (PRUNE.DATE_SOURCE = API).
+    """
 
     id: int
     title: str
     year: int
     path: str
-    genres: list[str]
-    tagsIds: list[int]
+    genres: tuple[str, ...]
+    tagsIds: tuple[int, ...]
     sortTitle: str
+    hasFile: bool = False
+    fileDateAdded: datetime | None = None
+    fileRelativePath: str = ''
+    sizeOnDisk: int = 0
 
     @classmethod
     def from_api(cls, row: dict[str, Any]) -> MovieRecord:
         tags = row.get('tags')
         if isinstance(tags, list):
-            tag_ids = [int(t) for t in tags if t is not None]
+            tag_ids = _shared(tuple(int(t) for t in tags if t is not None))
         else:
-            tag_ids = []
+            tag_ids = ()
         genres = row.get('genres') or []
         if not isinstance(genres, list):
             genres = []
         title = row.get('title') or ''
         st = row.get('sortTitle') or title
+        movie_file = row.get('movieFile')
+        if not isinstance(movie_file, dict):
+            movie_file = {}
         return cls(
             id=int(row['id']),
             title=title,
             year=int(row.get('year') or 0),
             path=str(row.get('path') or ''),
-            genres=[str(g) for g in genres],
+            genres=_shared(tuple(sys.intern(str(g)) for g in genres)),
             tagsIds=tag_ids,
             sortTitle=str(st),
+            hasFile=bool(row.get('hasFile')),
+            fileDateAdded=parse_api_datetime(movie_file.get('dateAdded')),
+            fileRelativePath=str(movie_file.get('relativePath') or ''),
+            sizeOnDisk=int(row.get('sizeOnDisk') or 0),
         )
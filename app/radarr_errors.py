@@ -0,0 +1,15 @@
+"""Radarr API exceptions, importable without loading httpx."""
+
+from __future__ import annotations
+
+
+class RadarrApiError(Exception):
+    """Raised when the Radarr API returns an error response."""
+
+    def __init__(self, message: str, status_code: int | None = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class RadarrUnavailableError(RadarrApiError):
+    """Raised without contacting Radarr while the circuit breaker is open."""
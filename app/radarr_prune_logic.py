@@ -1,5 +1,10 @@
+import importlib.util
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, NamedTuple
+from typing import List, Dict, Any, Iterable, NamedTuple, Sequence
+
+# NumPy is optional and costs ~60 ms to import; decide_prune_batch() loads
+# it on first use and falls back to Python without it.
+HAVE_NUMPY = importlib.util.find_spec('numpy') is not None
 
 
 def is_on(val: str) -> bool:
@@ -15,6 +20,162 @@ class PruneResult(NamedTuple):
     add_import_exclusion: bool
 
 
+_ZERO = timedelta(0)
+_KEEP_TAG = PruneResult(False, False, 'keep-tag', False)
+_MISSING_FILES = PruneResult(False, False, 'missing-files', False)
+_UNWANTED_GENRE = PruneResult(True, False, 'unwanted-genre', False)
+_WILL_BE_REMOVED = PruneResult(False, True, 'will-be-removed', False)
+_REMOVED = PruneResult(True, False, 'removed', True)
+_ACTIVE = PruneResult(False, False, 'active', False)
+
+
+class PrunePolicy:
+    """
+    Prune rules compiled once per run.
+
+    Every tag id used by a rule gets its own bit, so tag checks become
+    ``mask & keep_mask``; months are bits of ``months_mask`` (bit n is
+    month n). decide() then needs a handful of integer operations and one
+    datetime subtraction per movie.
+    """
+
+    __slots__ = (
+        'tag_bits',
+        'keep_mask',
+        'no_exclusion_mask',
+        'unwanted_genres',
+        'remove_after',
+        'warn_before',
+        'months_mask',
+    )
+
+    def __init__(
+        self,
+        tags_keep_ids: Iterable[int] = (),
+        unwanted_genres: Iterable[str] = (),
+        remove_after_days: int = 0,
+        warn_days_infront: int = 0,
+        tags_no_exclusion_ids: Iterable[int] = (),
+        months_no_exclusion: Iterable[int] = (),
+    ) -> None:
+        tags_keep_ids = list(tags_keep_ids)
+        tags_no_exclusion_ids = list(tags_no_exclusion_ids)
+        self.tag_bits: Dict[int, int] = {}
+        for tag_id in tags_keep_ids + tags_no_exclusion_ids:
+            if tag_id not in self.tag_bits:
+                self.tag_bits[tag_id] = 1 << len(self.tag_bits)
+        self.keep_mask = self.tag_mask(tags_keep_ids)
+        self.no_exclusion_mask = self.tag_mask(tags_no_exclusion_ids)
+        self.unwanted_genres = frozenset(unwanted_genres)
+        self.remove_after = timedelta(days=int(remove_after_days))
+        self.warn_before = timedelta(days=int(warn_days_infront))
+        self.months_mask = 0
+        for month in months_no_exclusion:
+            if 1 <= month <= 12:
+                self.months_mask |= 1 << month
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'PrunePolicy':
+        """Compile the decide_prune_action() ``config`` dict."""
+        return cls(
+            tags_keep_ids=config.get('tags_keep_ids', []),
+            unwanted_genres=config.get('unwanted_genres', []),
+            remove_after_days=config.get('remove_after_days', 0),
+            warn_days_infront=config.get('warn_days_infront', 0),
+            tags_no_exclusion_ids=config.get('tags_no_exclusion_ids', []),
+            months_no_exclusion=config.get('months_no_exclusion', []),
+        )
+
+    def tag_mask(self, tag_ids: Iterable[int]) -> int:
+        """Bitmask of the rule-relevant tags in ``tag_ids``."""
+        bits = self.tag_bits
+        mask = 0
+        for tag_id in tag_ids:
+            mask |= bits.get(tag_id, 0)
+        return mask
+
+    def decide(
+        self,
+        tag_mask: int,
+        genres: Iterable[str],
+        download_date: datetime | None,
+        now: datetime | None = None,
+    ) -> PruneResult:
+        """Same decision as decide_prune_action(), see there."""
+        # Keep if any keep-tag present
+        if tag_mask & self.keep_mask:
+            return _KEEP_TAG
+
+        # Missing download date => not downloaded yet
+        if not download_date:
+            return _MISSING_FILES
+
+        # Unwanted genres => remove immediately
+        if not self.unwanted_genres.isdisjoint(genres):
+            return _UNWANTED_GENRE
+
+        time_to_removal = download_date + self.remove_after - (
+            now or datetime.now()
+        )
+
+        # Planned removal if within warning window
+        # (0 < time_to_removal <= warn_days_infront)
+        if _ZERO < time_to_removal <= self.warn_before:
+            return _WILL_BE_REMOVED
+
+        # Removal: older than configured days and not excluded by tag/month
+        if time_to_removal <= _ZERO \
+                and not (self.months_mask >> download_date.month) & 1 \
+                and not tag_mask & self.no_exclusion_mask:
+            return _REMOVED
+
+        return _ACTIVE
+
+    def next_change(
+        self,
+        tag_mask: int,
+        genres: Iterable[str],
+        download_date: datetime | None,
+        now: datetime | None = None,
+    ) -> datetime | None:
+        """
+        Earliest moment at which decide() can return something else for the
+        same inputs, or None if it never will: keep-tag, missing-files and
+        the removal outcomes are final, an ACTIVE movie changes when its
+        warning window (or, without one, its removal date) starts and a
+        planned movie at its removal date.
+        """
+        if tag_mask & self.keep_mask or not download_date \
+                or not self.unwanted_genres.isdisjoint(genres):
+            return None
+        now = now or datetime.now()
+        removal = download_date + self.remove_after
+        warn_start = removal - max(self.warn_before, _ZERO)
+        if now < warn_start:
+            return warn_start
+        if now < removal:
+            return removal
+        return None
+
+    def fingerprint(self) -> str:
+        """Stable text identifying the rules, independent of tag order."""
+        keep = sorted(
+            t for t, bit in self.tag_bits.items() if bit & self.keep_mask
+        )
+        no_exclusion = sorted(
+            t for t, bit in self.tag_bits.items()
+            if bit & self.no_exclusion_mask
+        )
+        return repr((
+            keep,
+            no_exclusion,
+            sorted(self.unwanted_genres),
+            self.remove_after.days,
+            self.warn_before.days,
+            self.months_mask,
+        ))
+
+
 def decide_prune_action(
     movie: Dict[str, Any],
     config: Dict[str, Any],
@@ -40,46 +201,224 @@ def decide_prune_action(
 
     Returns: PruneResult; add_import_exclusion is True when Radarr should add
     an import exclusion on removal (only applies when reason == 'removed').
+
+    Compiles a PrunePolicy per call; callers deciding many movies should
+    build the policy once and use PrunePolicy.decide().
+    """
+    policy = PrunePolicy.from_config(config)
+    return policy.decide(
+        policy.tag_mask(movie.get('tagsIds') or ()),
+        movie.get('genres') or (),
+        movie.get('download_date'),
+        now,
+    )
+
+
+# Reason codes for decide_prune_batch(); REASONS[code] is the reason string.
+REASONS = (
+    'keep-tag',
+    'missing-files',
+    'unwanted-genre',
+    'will-be-removed',
+    'removed',
+    'active',
+)
+(
+    KEEP_TAG,
+    MISSING_FILES,
+    UNWANTED_GENRE,
+    WILL_BE_REMOVED,
+    REMOVED,
+    ACTIVE,
+) = range(len(REASONS))
+
+_WALL_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def wall_clock_us(dt: datetime) -> int:
     """
+    Naive datetime as integer microseconds since 1970-01-01.
+
+    Unlike datetime.timestamp() this ignores time zones and DST, exactly
+    like the naive datetime arithmetic in decide_prune_action(), so batch
+    and scalar decisions agree to the microsecond.
+    """
+    return (dt - _WALL_EPOCH) // _MICROSECOND
+
+
+def from_wall_clock_us(us: int) -> datetime:
+    """Inverse of wall_clock_us()."""
+    return _WALL_EPOCH + timedelta(microseconds=us)
+
+
+class PruneBatch(NamedTuple):
+    """Columnar decide_prune_batch() output (lists or NumPy arrays)."""
+
+    reason_codes: Sequence[int]
+    is_planned: Sequence[bool]
+    add_import_exclusion: Sequence[bool]
+
+    def results(self) -> List[PruneResult]:
+        """Per-movie PruneResult values, as decide_prune_action() returns."""
+        columns = [
+            c.tolist() if hasattr(c, 'tolist') else c
+            for c in (self.reason_codes, self.is_planned,
+                      self.add_import_exclusion)
+        ]
+        return [
+            PruneResult(
+                code in (UNWANTED_GENRE, REMOVED),
+                bool(planned),
+                REASONS[code],
+                bool(exclusion),
+            )
+            for code, planned, exclusion in zip(*columns)
+        ]
+
+
+def _as_policy(config: Dict[str, Any] | PrunePolicy) -> PrunePolicy:
+    if isinstance(config, PrunePolicy):
+        return config
+    return PrunePolicy.from_config(config)
+
+
+def batch_columns(
+    movies: Iterable[Dict[str, Any]],
+    config: Dict[str, Any] | PrunePolicy,
+) -> Dict[str, list]:
+    """
+    Build the decide_prune_batch() input columns from movie dicts shaped
+    like the decide_prune_action() ``movie`` argument.
+    """
+    policy = _as_policy(config)
+    columns: Dict[str, list] = {
+        'keep_tag': [],
+        'unwanted_genre': [],
+        'no_exclusion_tag': [],
+        'first_seen_us': [],
+        'first_seen_month': [],
+    }
+    for movie in movies:
+        mask = policy.tag_mask(movie.get('tagsIds') or ())
+        download_date = movie.get('download_date')
+        columns['keep_tag'].append(bool(mask & policy.keep_mask))
+        columns['unwanted_genre'].append(
+            not policy.unwanted_genres.isdisjoint(movie.get('genres') or ())
+        )
+        columns['no_exclusion_tag'].append(
+            bool(mask & policy.no_exclusion_mask)
+        )
+        if download_date:
+            columns['first_seen_us'].append(wall_clock_us(download_date))
+            columns['first_seen_month'].append(download_date.month)
+        else:
+            columns['first_seen_us'].append(None)
+            columns['first_seen_month'].append(0)
+    return columns
+
+
+def decide_prune_batch(
+    keep_tag: Sequence[bool],
+    unwanted_genre: Sequence[bool],
+    no_exclusion_tag: Sequence[bool],
+    first_seen_us: Sequence[int | None],
+    first_seen_month: Sequence[int],
+    config: Dict[str, Any] | PrunePolicy,
+    now: datetime | None = None,
+    use_numpy: bool | None = None,
+) -> PruneBatch:
+    """
+    decide_prune_action() for a whole library in one pass.
+
+    Inputs are parallel columns, one entry per movie: keep-tag / unwanted
+    genre / no-exclusion-tag membership, the first-seen time as
+    wall_clock_us() (None when there is no download) and its month (1-12).
+    See batch_columns() for building them from movie dicts. ``config`` is
+    the decide_prune_action() dict or an already compiled PrunePolicy.
+
+    Uses NumPy when it is installed (use_numpy=None) and pure Python
+    otherwise. PruneBatch.results() equals the per-movie scalar results.
+    """
+    policy = _as_policy(config)
     now = now or datetime.now()
+    warn_us = policy.warn_before // _MICROSECOND
+    months_mask = policy.months_mask
+    # first_seen + remove_after_days - now, i.e. time until removal.
+    offset = policy.remove_after // _MICROSECOND - wall_clock_us(now)
+
+    if use_numpy is None:
+        use_numpy = HAVE_NUMPY
+    if use_numpy:
+        return _decide_prune_batch_numpy(
+            keep_tag, unwanted_genre, no_exclusion_tag, first_seen_us,
+            first_seen_month, offset, warn_us, months_mask,
+        )
+
+    codes: List[int] = []
+    planned: List[bool] = []
+    exclusion: List[bool] = []
+    for keep, unwanted, no_exclusion, first_seen, month in zip(
+        keep_tag, unwanted_genre, no_exclusion_tag, first_seen_us,
+        first_seen_month,
+    ):
+        if keep:
+            code = KEEP_TAG
+        elif first_seen is None:
+            code = MISSING_FILES
+        elif unwanted:
+            code = UNWANTED_GENRE
+        else:
+            time_to_removal = first_seen + offset
+            if 0 < time_to_removal <= warn_us:
+                code = WILL_BE_REMOVED
+            elif time_to_removal <= 0 and not (
+                (months_mask >> month) & 1 or no_exclusion
+            ):
+                code = REMOVED
+            else:
+                code = ACTIVE
+        codes.append(code)
+        planned.append(code == WILL_BE_REMOVED)
+        exclusion.append(code == REMOVED)
+    return PruneBatch(codes, planned, exclusion)
+
+
+def _decide_prune_batch_numpy(
+    keep_tag, unwanted_genre, no_exclusion_tag, first_seen_us,
+    first_seen_month, offset, warn_us, months_mask,
+) -> PruneBatch:
+    if not HAVE_NUMPY:
+        raise RuntimeError('NumPy is not installed')
+    import numpy as np
+
+    n = len(first_seen_us)
+    keep = np.asarray(keep_tag, dtype=bool)
+    unwanted = np.asarray(unwanted_genre, dtype=bool)
+    no_exclusion = np.asarray(no_exclusion_tag, dtype=bool)
+    has_date = np.fromiter(
+        (v is not None for v in first_seen_us), dtype=bool, count=n
+    )
+    first_seen = np.fromiter(
+        (0 if v is None else v for v in first_seen_us),
+        dtype=np.int64,
+        count=n,
+    )
+    months = np.asarray(first_seen_month, dtype=np.int64)
+    month_excluded = ((np.int64(months_mask) >> months) & 1) == 1
+
+    time_to_removal = first_seen + np.int64(offset)
+    candidate = ~keep & has_date & ~unwanted
+    planned = candidate & (time_to_removal > 0) & (time_to_removal <= warn_us)
+    removed = (
+        candidate & ~planned & (time_to_removal <= 0)
+        & ~(month_excluded | no_exclusion)
+    )
 
-    tags_keep_ids: List[int] = config.get('tags_keep_ids', [])
-    unwanted_genres: List[str] = config.get('unwanted_genres', [])
-    remove_after_days: int = int(config.get('remove_after_days', 0))
-    warn_days_infront: int = int(config.get('warn_days_infront', 0))
-    tags_no_exclusion_ids: List[int] = config.get('tags_no_exclusion_ids', [])
-    months_no_exclusion: List[int] = config.get('months_no_exclusion', [])
-
-    tagsIds = set(movie.get('tagsIds') or [])
-    genres = set(movie.get('genres') or [])
-    download_date = movie.get('download_date')
-
-    # Keep if any keep-tag present
-    if tagsIds & set(tags_keep_ids):
-        return PruneResult(False, False, 'keep-tag', False)
-
-    # Missing download date => not downloaded yet
-    if not download_date:
-        return PruneResult(False, False, 'missing-files', False)
-
-    # Unwanted genres => remove immediately
-    if genres & set(unwanted_genres):
-        return PruneResult(True, False, 'unwanted-genre', False)
-
-    removal_date = download_date + timedelta(days=remove_after_days)
-    time_to_removal = removal_date - now
-
-    # Planned removal if within warning window
-    # (0 < time_to_removal <= warn_days_infront)
-    if timedelta(0) < time_to_removal <= timedelta(days=warn_days_infront):
-        return PruneResult(False, True, 'will-be-removed', False)
-
-    # Removal: older than configured days and not excluded by tag/month
-    if now - download_date >= timedelta(days=remove_after_days):
-        monthfound = download_date.month in months_no_exclusion
-        exclusiontagsfound = bool(tagsIds & set(tags_no_exclusion_ids))
-        add_import_exclusion = not (monthfound or exclusiontagsfound)
-        if not (monthfound or exclusiontagsfound):
-            return PruneResult(True, False, 'removed', add_import_exclusion)
-
-    return PruneResult(False, False, 'active', False)
+    codes = np.full(n, ACTIVE, dtype=np.int8)
+    codes[planned] = WILL_BE_REMOVED
+    codes[removed] = REMOVED
+    codes[~keep & has_date & unwanted] = UNWANTED_GENRE
+    codes[~keep & ~has_date] = MISSING_FILES
+    codes[keep] = KEEP_TAG
+    return PruneBatch(codes, planned, removed)
@@ -3,13 +3,25 @@
 # date: 2021-11-15 21:38:51
 # update: 2024-12-24 11:45:00
 
+import argparse
+import atexit
+import hashlib
+import heapq
+import importlib
 import logging
 import configparser
+import signal
 import sys
 import shutil
-import glob
 import os
-import smtplib
+import queue
+import re
+import threading
+import time
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
 
 if (
     __name__ == '__main__'
@@ -26,15 +38,7 @@ if (
     print(_vg['__version__'])
     raise SystemExit(0)
 
-import time
-
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
 from datetime import datetime, timedelta
-from chump import Application
-from socket import gaierror
 
 _repo_dir = os.path.dirname(os.path.abspath(__file__))
 _repo_root = os.path.dirname(_repo_dir)
@@ -46,25 +50,101 @@ if _repo_dir not in sys.path:
 try:
     # Repo layout: /repo/app/radarrdv_prune.py
     from app.__version__ import __version__  # noqa: E402
-    from app.radarr_prune_logic import decide_prune_action, is_on  # noqa: E402
-    from app.radarr_client import (  # noqa: E402
-        MovieRecord,
-        RadarrApiError,
-        RadarrClient,
+    from app.radarr_prune_logic import (  # noqa: E402
+        PrunePolicy,
+        from_wall_clock_us,
+        is_on,
+        wall_clock_us,
+    )
+    from app.movie_scan import (  # noqa: E402
+        FolderScan,
+        MovieScanner,
+        ScanCache,
+        scan_folders,
+    )
+    from app.state_store import StateStore  # noqa: E402
+    from app.api_cache import ResponseCache  # noqa: E402
+    from app.radarr_errors import RadarrApiError  # noqa: E402
+    from app.run_log import RunLog  # noqa: E402
+    from app.notify import NotificationQueue  # noqa: E402
+    from app.shards import (  # noqa: E402
+        SHARD_BY,
+        Sharder,
+        ShardState,
+        plan_shard,
+        shard_key,
     )
+    from app.tracing import Tracer, traced  # noqa: E402
+    from app.metrics import (  # noqa: E402
+        PROBE_BUCKETS,
+        Metrics,
+        MetricsServer,
+    )
+    _PACKAGE = 'app.'
 except ModuleNotFoundError:
     # Flat/container layout: /app/radarr/radarrdv_prune.py
     from __version__ import __version__  # noqa: E402
-    from radarr_prune_logic import decide_prune_action, is_on  # noqa: E402
-    from radarr_client import (  # noqa: E402
-        MovieRecord,
-        RadarrApiError,
-        RadarrClient,
+    from radarr_prune_logic import (  # noqa: E402
+        PrunePolicy,
+        from_wall_clock_us,
+        is_on,
+        wall_clock_us,
+    )
+    from movie_scan import (  # noqa: E402
+        FolderScan,
+        MovieScanner,
+        ScanCache,
+        scan_folders,
+    )
+    from state_store import StateStore  # noqa: E402
+    from api_cache import ResponseCache  # noqa: E402
+    from radarr_errors import RadarrApiError  # noqa: E402
+    from run_log import RunLog  # noqa: E402
+    from notify import NotificationQueue  # noqa: E402
+    from shards import (  # noqa: E402
+        SHARD_BY,
+        Sharder,
+        ShardState,
+        plan_shard,
+        shard_key,
     )
+    from tracing import Tracer, traced  # noqa: E402
+    from metrics import (  # noqa: E402
+        PROBE_BUCKETS,
+        Metrics,
+        MetricsServer,
+    )
+    _PACKAGE = ''
+
+
+def optional_module(name):
+    """
+    Import app module ``name`` when its feature is first used. The Radarr
+    client (httpx, ssl) loads only once a prune run goes ahead; mail
+    (smtplib, email), the webhook and metrics listeners (http.server) and
+    the async client (asyncio) are left out of cron runs that do not
+    enable them.
+    """
+    return importlib.import_module(_PACKAGE + name)
+
+
+# Delay before a daemon resync after a failed Radarr call.
+DAEMON_RETRY_SECONDS = 60
+# Sharded runs save their cursor every this many shard movies.
+SHARD_CHECKPOINT_EVERY = 100
+# Console format while several Radarr instances run side by side; the
+# instance threads are named after their [RADARR:<name>] section.
+INSTANCE_LOG_FORMAT = (
+    '%(asctime)s - %(name)s - %(threadName)s - %(levelname)s - %(message)s'
+)
 
 
 class RLP():
-    def __init__(self):
+    def __init__(self, instance=None, shared=None):
+        # instance: name of a [RADARR:<name>] section to run; shared: the
+        # coordinating RLP whose log and Pushover queue it writes to.
+        self.instance = instance
+        self.shared = shared
         logging.basicConfig(
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
             level=logging.INFO)
@@ -89,6 +169,12 @@ class RLP():
         # Fix: example file as present in repository
         self.exampleconfigfile = "radarrdv_prune.ini.example"
         self.log_file = "radarrdv_prune.log"
+        self.jsonl_log_file = "radarrdv_prune.log.jsonl"
+        self.scan_cache_file = "radarrdv_prune.scancache.json"
+        self.state_db_file = "radarrdv_prune.state.db"
+        self.api_cache_file = "radarrdv_prune.apicache.json"
+        self.trace_file = "radarrdv_prune.trace.json"
+        self.metrics_file = "radarrdv_prune.prom"
         self.firstseen = ".firstseen"
 
         # Ensure directories exist (create config dir if missing)
@@ -102,6 +188,15 @@ class RLP():
 
         self.config_filePath = os.path.join(config_dir, self.config_file)
         self.log_filePath = os.path.join(log_dir, self.log_file)
+        self.jsonl_log_filePath = os.path.join(log_dir, self.jsonl_log_file)
+        self.trace_filePath = os.path.join(log_dir, self.trace_file)
+        self.scan_cache_filePath = os.path.join(
+            config_dir, self.scan_cache_file
+        )
+        self.state_db_filePath = os.path.join(config_dir, self.state_db_file)
+        self.api_cache_filePath = os.path.join(
+            config_dir, self.api_cache_file
+        )
 
         try:
             # try to open config; if missing, copy example from app_dir
@@ -136,6 +231,27 @@ class RLP():
             self.config = configparser.ConfigParser()
             self.config.read(self.config_filePath)
 
+            # [RADARR:<name>] sections: one Radarr instance each. Their
+            # keys override [RADARR] and [PRUNE]; [RADARR] only supplies
+            # defaults then.
+            self.instances = [
+                section.split(':', 1)[1].strip()
+                for section in self.config.sections()
+                if section.upper().startswith('RADARR:')
+            ]
+            if instance is not None:
+                self.applyInstanceOverrides(instance)
+                slug = re.sub(r'[^A-Za-z0-9_.-]', '_', instance)
+                for attr in (
+                    'scan_cache_filePath',
+                    'state_db_filePath',
+                    'api_cache_filePath',
+                ):
+                    head, name = os.path.split(getattr(self, attr))
+                    setattr(self, attr, os.path.join(head, name.replace(
+                        'radarrdv_prune.', f'radarrdv_prune.{slug}.', 1
+                    )))
+
             # RADARR
             self.radarr_enabled = is_on(
                 self.config.get('RADARR', 'ENABLED', fallback='OFF')
@@ -146,6 +262,86 @@ class RLP():
                 self.config['RADARR']
                 ['TAGS_KEEP_MOVIES_ANYWAY'].split(",")
             )
+            # 0 disables throttling of Radarr API requests.
+            self.radarr_max_rps = float(
+                self.config.get(
+                    'RADARR', 'MAX_REQUESTS_PER_SECOND', fallback='5'
+                )
+            )
+            self.radarr_request_burst = int(
+                self.config.get('RADARR', 'REQUEST_BURST', fallback='5')
+            )
+            # Collect removals and delete them in chunks through the
+            # movie editor endpoint instead of one DELETE per movie.
+            self.bulk_delete = is_on(
+                self.config.get('RADARR', 'BULK_DELETE', fallback='OFF')
+            )
+            self.bulk_delete_chunk_size = int(
+                self.config.get(
+                    'RADARR', 'BULK_DELETE_CHUNK_SIZE', fallback='50'
+                )
+            )
+            self.stream_movie_list = is_on(
+                self.config.get('RADARR', 'STREAM_MOVIE_LIST', fallback='ON')
+            )
+            # Fetch status, tags, root folders and movies concurrently and
+            # run deletes in parallel (bounded by MAX_CONCURRENT_DELETES).
+            self.async_client = is_on(
+                self.config.get('RADARR', 'ASYNC_CLIENT', fallback='OFF')
+            )
+            self.max_concurrent_deletes = int(
+                self.config.get(
+                    'RADARR', 'MAX_CONCURRENT_DELETES', fallback='4'
+                )
+            )
+            # Retries for transient failures (connection errors, 429/5xx
+            # gateway errors) and the circuit breaker in front of them.
+            self.radarr_max_retries = int(
+                self.config.get('RADARR', 'MAX_RETRIES', fallback='3')
+            )
+            self.radarr_retry_backoff = float(
+                self.config.get(
+                    'RADARR', 'RETRY_BACKOFF_SECONDS', fallback='0.5'
+                )
+            )
+            self.radarr_retry_backoff_max = float(
+                self.config.get(
+                    'RADARR', 'RETRY_BACKOFF_MAX_SECONDS', fallback='30'
+                )
+            )
+            self.radarr_breaker_threshold = int(
+                self.config.get(
+                    'RADARR', 'CIRCUIT_BREAKER_THRESHOLD', fallback='5'
+                )
+            )
+            self.radarr_breaker_reset = float(
+                self.config.get(
+                    'RADARR', 'CIRCUIT_BREAKER_RESET_SECONDS', fallback='30'
+                )
+            )
+            # Connection pool; the defaults are those of httpx.
+            self.radarr_max_connections = int(
+                self.config.get('RADARR', 'MAX_CONNECTIONS', fallback='100')
+            )
+            self.radarr_max_keepalive = int(
+                self.config.get(
+                    'RADARR', 'MAX_KEEPALIVE_CONNECTIONS', fallback='20'
+                )
+            )
+            self.radarr_keepalive_expiry = float(
+                self.config.get(
+                    'RADARR', 'KEEPALIVE_EXPIRY_SECONDS', fallback='5'
+                )
+            )
+            self.radarr_http2 = is_on(
+                self.config.get('RADARR', 'HTTP2', fallback='OFF')
+            )
+            # Tags and root folders are cached on disk this long (0 = off).
+            self.api_cache_ttl = float(
+                self.config.get(
+                    'RADARR', 'API_CACHE_TTL_SECONDS', fallback='0'
+                )
+            )
 
             # PRUNE
             self.radarr_tags_no_exclusion = list(
@@ -182,9 +378,86 @@ class RLP():
             self.verbose_logging = is_on(
                 self.config.get('PRUNE', 'VERBOSE_LOGGING', fallback='OFF')
             )
+            # Per-movie JSON records next to the text log.
+            self.log_jsonl = is_on(
+                self.config.get('PRUNE', 'LOG_JSONL', fallback='OFF')
+            )
+            # Chrome trace of the run phases (also --trace); per-movie and
+            # per-folder spans with TRACE_MOVIES.
+            self.trace_enabled = is_on(
+                self.config.get('PRUNE', 'TRACE', fallback='OFF')
+            )
+            self.trace_movies = is_on(
+                self.config.get('PRUNE', 'TRACE_MOVIES', fallback='ON')
+            )
+            self.trace_top = int(
+                self.config.get('PRUNE', 'TRACE_TOP', fallback='10')
+            )
             self.video_extensions = list(
                 self.config['PRUNE']
                 ['VIDEO_EXTENSIONS_MONITORED'].split(","))
+            # Threads probing movie folders, per Radarr root folder.
+            self.scan_workers_per_root = int(
+                self.config.get(
+                    'PRUNE', 'SCAN_WORKERS_PER_ROOT', fallback='4'
+                )
+            )
+            self.scan_cache_enabled = is_on(
+                self.config.get('PRUNE', 'SCAN_CACHE', fallback='ON')
+            )
+            # Where download date and file presence come from:
+            # FILESYSTEM (folder scan + first-seen), API (movie payload
+            # only) or HYBRID (payload for presence, first-seen for date).
+            self.date_source = self.config.get(
+                'PRUNE', 'DATE_SOURCE', fallback='FILESYSTEM'
+            ).strip().upper()
+            if self.date_source not in ('FILESYSTEM', 'API', 'HYBRID'):
+                raise ValueError(
+                    f"DATE_SOURCE must be FILESYSTEM, API or HYBRID, "
+                    f"not {self.date_source!r}"
+                )
+            self.state_db_enabled = is_on(
+                self.config.get('PRUNE', 'STATE_DB', fallback='ON')
+            )
+            self.write_firstseen_markers = is_on(
+                self.config.get(
+                    'PRUNE', 'WRITE_FIRSTSEEN_MARKERS', fallback='ON'
+                )
+            )
+            # Only evaluate movies that are new, changed or due (needs the
+            # state database for the decision index).
+            self.incremental = is_on(
+                self.config.get('PRUNE', 'INCREMENTAL', fallback='OFF')
+            )
+            # Spread the library over cron runs: each run takes the next of
+            # SHARDS shards, at most MAX_MOVIES_PER_RUN of it (0 = all),
+            # and resumes where the previous run stopped.
+            self.shards = int(
+                self.config.get('PRUNE', 'SHARDS', fallback='1')
+            )
+            if self.shards < 1:
+                raise ValueError(
+                    f"SHARDS must be 1 or more, not {self.shards}"
+                )
+            self.shard_by = self.config.get(
+                'PRUNE', 'SHARD_BY', fallback='ID'
+            ).strip().upper()
+            if self.shard_by not in SHARD_BY:
+                raise ValueError(
+                    f"SHARD_BY must be ID or ROOT_FOLDER, "
+                    f"not {self.shard_by!r}"
+                )
+            self.max_movies_per_run = int(
+                self.config.get(
+                    'PRUNE', 'MAX_MOVIES_PER_RUN', fallback='0'
+                )
+            )
+            # --daemon: minutes between full passes over the library.
+            self.daemon_resync_minutes = int(
+                self.config.get(
+                    'PRUNE', 'DAEMON_RESYNC_MINUTES', fallback='60'
+                )
+            )
             self.mail_enabled = is_on(
                 self.config.get('PRUNE', 'MAIL_ENABLED', fallback='OFF')
             )
@@ -201,6 +474,12 @@ class RLP():
             self.mail_sender = self.config['PRUNE']['MAIL_SENDER']
             self.mail_receiver = list(
                 self.config['PRUNE']['MAIL_RECEIVER'].split(","))
+            # Cap on the gzipped log attachment; 0 sends no attachment.
+            self.mail_max_attachment_kb = int(
+                self.config.get(
+                    'PRUNE', 'MAIL_MAX_ATTACHMENT_KB', fallback='1024'
+                )
+            )
             self.unwanted_genres = list(
                 self.config['PRUNE']['UNWANTED_GENRES'].split(","))
 
@@ -211,6 +490,42 @@ class RLP():
             self.pushover_user_key = self.config['PUSHOVER']['USER_KEY']
             self.pushover_token_api = self.config['PUSHOVER']['TOKEN_API']
             self.pushover_sound = self.config['PUSHOVER']['SOUND']
+            # Coalesce per-movie messages: one digest per N messages or
+            # after T seconds, whichever comes first.
+            self.pushover_digest_size = int(
+                self.config.get('PUSHOVER', 'DIGEST_SIZE', fallback='10')
+            )
+            self.pushover_digest_seconds = float(
+                self.config.get('PUSHOVER', 'DIGEST_SECONDS', fallback='60')
+            )
+
+            # WEBHOOK (Radarr Connect events, --daemon only)
+            self.webhook_enabled = is_on(
+                self.config.get('WEBHOOK', 'ENABLED', fallback='OFF')
+            )
+            self.webhook_host = self.config.get(
+                'WEBHOOK', 'HOST', fallback='127.0.0.1'
+            ).strip()
+            self.webhook_port = int(
+                self.config.get('WEBHOOK', 'PORT', fallback='8787')
+            )
+            self.webhook_token = self.config.get(
+                'WEBHOOK', 'TOKEN', fallback=''
+            ).strip()
+
+            # METRICS (Prometheus textfile; HTTP endpoint with --daemon)
+            self.metrics_enabled = is_on(
+                self.config.get('METRICS', 'ENABLED', fallback='OFF')
+            )
+            self.metrics_textfile = self.config.get(
+                'METRICS', 'TEXTFILE', fallback=''
+            ).strip() or os.path.join(log_dir, self.metrics_file)
+            self.metrics_host = self.config.get(
+                'METRICS', 'HOST', fallback='127.0.0.1'
+            ).strip()
+            self.metrics_port = int(
+                self.config.get('METRICS', 'PORT', fallback='9787')
+            )
 
         except KeyError as e:
             logging.error(
@@ -228,17 +543,335 @@ class RLP():
 
             sys.exit()
 
+        # First-seen timestamps live in the state database; without it the
+        # marker files are the only record and must be written.
+        self.state_store = None
+        self._first_seen = {}
+        self._num_imported = 0
+        if self.state_db_enabled:
+            self.state_store = StateStore(self.state_db_filePath)
+        elif not self.write_firstseen_markers:
+            logging.warning(
+                "WRITE_FIRSTSEEN_MARKERS = OFF requires STATE_DB = ON; "
+                "marker files will still be written."
+            )
+            self.write_firstseen_markers = True
+        if self.incremental and self.state_store is None:
+            logging.warning(
+                "INCREMENTAL = ON requires STATE_DB = ON; evaluating all "
+                "movies."
+            )
+            self.incremental = False
+        self.sharding = self.shards > 1 or self.max_movies_per_run > 0
+        if self.sharding and self.state_store is None:
+            logging.warning(
+                "SHARDS / MAX_MOVIES_PER_RUN require STATE_DB = ON; "
+                "evaluating all movies."
+            )
+            self.sharding = False
+        self._shard_plan = None
+        self._shard_window = set()
+        self._shard_since = 0
+        self._fingerprints = {}
+        # Movies dueMovies() skipped, with their stored next_due.
+        self._not_due = {}
+        # Daemon mode: min-heap of (next_change, movie id).
+        self.daemon = False
+        self._deadlines = []
+        self._deadline_for = {}
+        # (removed, planned) of daemon passes not reported yet.
+        self._unreported = (0, 0)
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        # Radarr webhook events, queued by the listener thread.
+        self._events = queue.SimpleQueue()
+        self._webhook = None
+
+        # Removals waiting for a bulk delete: (movie, label, exclusion, date)
+        self._pending_deletes = []
+        # Movies removed / planned since the last report (mail summary).
+        self._removed = []
+        self._planned = []
+        # Results of the concurrent bootstrap (async client only).
+        self._bootstrap = None
+        self._root_folders = None
+
+        if shared is not None:
+            self.run_log = shared.run_log
+            self.pushover_enabled = shared.pushover_enabled
+            self.notifier = getattr(shared, 'notifier', None)
+            self.tracer = shared.tracer
+            self.metrics = shared.metrics
+        else:
+            self.run_log = RunLog(
+                self.log_filePath,
+                self.jsonl_log_filePath if self.log_jsonl else None,
+            )
+            atexit.register(self.run_log.close)
+            self.tracer = Tracer()
+            if self.trace_enabled:
+                self.enableTracing()
+            self.metrics = Metrics(self.metrics_enabled)
+            if self.metrics_enabled:
+                self.declareMetrics()
+                self.tracer.observer = self.observePhase
+        self.metrics.add_collector(self.collectRequestStats)
+        self._metrics_server = None
+        self._pass_started = time.monotonic()
+
+        self.scan_cache = None
+        self._scan_cache_loaded = False
+        if self.scan_cache_enabled:
+            self.scan_cache = ScanCache(self.scan_cache_filePath)
+        self.scanner = MovieScanner(
+            self.video_extensions,
+            self.firstseen,
+            self.scan_cache,
+            self.write_firstseen_markers,
+        )
+
+    def applyInstanceOverrides(self, instance):
+        section = f'RADARR:{instance}'
+        for key in self.config.options(section):
+            if key in self.config.defaults():
+                continue
+            value = self.config.get(section, key, raw=True)
+            self.config.set('RADARR', key, value)
+            # ENABLED switches the instance, not the whole prune run.
+            if key != 'enabled':
+                self.config.set('PRUNE', key, value)
+
+    def clientOptions(self):
+        # Keyword arguments shared by RadarrClient and BlockingRadarrClient.
+        client = optional_module('radarr_client')
+        return {
+            'max_requests_per_second': self.radarr_max_rps,
+            'burst': self.radarr_request_burst,
+            'retry': client.RetryPolicy(
+                self.radarr_max_retries,
+                self.radarr_retry_backoff,
+                self.radarr_retry_backoff_max,
+            ),
+            'breaker': client.CircuitBreaker(
+                self.radarr_breaker_threshold, self.radarr_breaker_reset
+            ),
+            'max_connections': self.radarr_max_connections,
+            'max_keepalive_connections': self.radarr_max_keepalive,
+            'keepalive_expiry': self.radarr_keepalive_expiry,
+            'http2': self.radarr_http2,
+            'cache': (
+                ResponseCache(self.api_cache_filePath, self.api_cache_ttl)
+                if self.api_cache_ttl > 0 else None
+            ),
+        }
+
+    def logRequestStats(self):
+        rc = getattr(self, 'radarr_client', None)
+        if rc is None:
+            return
+        for line in rc.stats.summary():
+            logging.info("RADARR: %s", line)
+
+    def enableTracing(self):
+        # The trace is written at exit, after the mail and Pushover
+        # threads have finished.
+        if not self.tracer.enabled:
+            self.tracer.enabled = True
+            self.tracer.details = self.trace_movies
+            atexit.register(self.writeTrace)
+
+    def writeTrace(self):
+        self.tracer.write(self.trace_filePath)
+        logging.info("PRUNE: Trace written to %s.", self.trace_filePath)
+
+    def logTraceSummary(self):
+        for cat, label in (('movie', 'movies'), ('folder', 'folders')):
+            slowest = self.tracer.slowest(cat, self.trace_top)
+            if not slowest:
+                continue
+            logging.info("TRACE: Slowest %s:", label)
+            for span in slowest:
+                logging.info(
+                    "TRACE: %9.2f ms  %s",
+                    span.dur_ns / 1e6,
+                    span.args.get('title') or span.args.get('path'),
+                )
+
+    def declareMetrics(self):
+        m = self.metrics
+        m.counter('radarr_prune_phase_seconds_total',
+                  'Time spent per run phase.')
+        m.counter('radarr_prune_phase_calls_total',
+                  'Number of times a run phase ran.')
+        m.gauge('radarr_prune_run_duration_seconds',
+                'Duration of the last run or daemon pass.')
+        m.gauge('radarr_prune_last_run_timestamp_seconds',
+                'Unix time the last run or daemon pass finished.')
+        m.counter('radarr_prune_movies_evaluated_total',
+                  'Movies evaluated.')
+        m.counter('radarr_prune_decisions_total',
+                  'Prune decisions per PruneResult reason.')
+        m.counter('radarr_prune_movies_removed_total',
+                  'Movies removed (or that would be, in a dry run).')
+        m.counter('radarr_prune_movies_planned_total',
+                  'Movies warned about an upcoming removal.')
+        m.counter('radarr_prune_deletes_attempted_total',
+                  'Radarr movie deletes attempted.')
+        m.counter('radarr_prune_deletes_failed_total',
+                  'Radarr movie deletes that failed.')
+        m.counter('radarr_prune_bytes_reclaimed_total',
+                  'sizeOnDisk of movies deleted with their files.')
+        m.histogram('radarr_prune_request_duration_seconds',
+                    'Radarr API request latency, retries included.',
+                    optional_module('radarr_client').LATENCY_BUCKETS)
+        m.counter('radarr_prune_requests_failed_total',
+                  'Radarr API requests that failed after retries.')
+        m.histogram('radarr_prune_probe_duration_seconds',
+                    'Movie folder probe latency.', PROBE_BUCKETS)
+
+    def _metricLabels(self, **labels):
+        # 'instance' is taken by Prometheus itself.
+        if self.instance is not None:
+            labels['radarr'] = self.instance
+        return labels
+
+    def observePhase(self, span):
+        if span.cat != 'run':
+            return
+        self.metrics.inc(
+            'radarr_prune_phase_seconds_total', span.dur_ns / 1e9,
+            phase=span.name,
+        )
+        self.metrics.inc('radarr_prune_phase_calls_total', phase=span.name)
+
+    def collectRequestStats(self, metrics):
+        rc = getattr(self, 'radarr_client', None)
+        if rc is None:
+            return
+        for endpoint, (counts, total, failed) in \
+                rc.stats.histograms().items():
+            method, _, path = endpoint.partition(' ')
+            labels = self._metricLabels(method=method, endpoint=path)
+            metrics.set_histogram(
+                'radarr_prune_request_duration_seconds', counts, total,
+                **labels,
+            )
+            metrics.set('radarr_prune_requests_failed_total', failed,
+                        **labels)
+
+    def _countDeletes(self, movies, deleted):
+        labels = self._metricLabels()
+        self.metrics.inc(
+            'radarr_prune_deletes_attempted_total', len(movies), **labels
+        )
+        self.metrics.inc(
+            'radarr_prune_deletes_failed_total',
+            len(movies) - len(deleted),
+            **labels,
+        )
+        if self.delete_files:
+            self.metrics.inc(
+                'radarr_prune_bytes_reclaimed_total',
+                sum(movie.sizeOnDisk for movie in deleted),
+                **labels,
+            )
+
+    def writeMetrics(self):
+        """End of a run or daemon pass: timing gauges and the textfile."""
+        if not self.metrics.enabled:
+            return
+        self.metrics.set(
+            'radarr_prune_run_duration_seconds',
+            time.monotonic() - self._pass_started,
+        )
+        self.metrics.set(
+            'radarr_prune_last_run_timestamp_seconds', time.time()
+        )
+        self.metrics.write_textfile(self.metrics_textfile)
+
+    def startMetricsServer(self):
+        if not self.metrics.enabled or not self.metrics_port:
+            return
+        try:
+            self._metrics_server = MetricsServer(
+                self.metrics_host, self.metrics_port, self.metrics
+            ).start()
+        except OSError as e:
+            logging.error(
+                "Could not start metrics endpoint on %s:%d: %s",
+                self.metrics_host,
+                self.metrics_port,
+                e,
+            )
+            return
+        logging.info(
+            "PRUNE: Serving metrics on http://%s:%d/metrics",
+            self.metrics_host,
+            self._metrics_server.port,
+        )
+
     def sortOnTitle(self, e):
         return e.sortTitle
 
+    @traced('radarr.tags')
     def getTagLabeltoID(self):
         # Put all tags in a dictionary with pair label <=> ID
+        if self._bootstrap is not None:
+            tags = self._bootstrap.tags
+        else:
+            tags = self.radarr_client.get_tags()
+        labelToID = self._tagMap(tags)
+        missing = [
+            label for label in self.tags_to_keep
+            + self.radarr_tags_no_exclusion
+            if label and label not in labelToID
+        ]
+        if missing and self.radarr_client.served_from_cache('/api/v3/tag'):
+            # A cached tag list may predate a newly created tag.
+            logging.info(
+                "PRUNE: Tag(s) %s not in cached tag list; refreshing.",
+                ", ".join(missing),
+            )
+            labelToID = self._tagMap(
+                self.radarr_client.get_tags(refresh=True)
+            )
+        return labelToID
+
+    def _tagMap(self, tags):
         return {
             tag['label']: tag['id']
-            for tag in self.radarr_client.get_tags()
+            for tag in tags
             if tag.get('label') is not None and tag.get('id') is not None
         }
 
+    @traced('radarr.movies')
+    def getMovies(self):
+        """Fetch the library as MovieRecords and log size statistics."""
+        if self._bootstrap is not None:
+            media = self._bootstrap.movies
+            self._bootstrap = self._bootstrap._replace(movies=[])
+        elif self.stream_movie_list:
+            media = list(self.radarr_client.iter_movie_records())
+        else:
+            raw = self.radarr_client.get_movies()
+            record = optional_module('radarr_client').MovieRecord
+            media = [record.from_api(m) for m in raw]
+            del raw
+        txtPeak = ''
+        if resource is not None:
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # ru_maxrss is in KiB on Linux and in bytes on macOS.
+            if sys.platform == 'darwin':
+                peak //= 1024
+            txtPeak = f", peak RSS {peak / 1024:.1f} MiB"
+        logging.info(
+            "PRUNE: Fetched %d movies from Radarr (%.1f MiB response%s).",
+            len(media),
+            self.radarr_client.last_response_bytes / 1048576,
+            txtPeak,
+        )
+        return media
+
     def getIDsforTagLabels(self, tagLabels):
         TagLabeltoID = getattr(self, '_tag_label_to_id', None)
         if TagLabeltoID is None:
@@ -250,16 +883,23 @@ class RLP():
             if (tagID := TagLabeltoID.get(taglabel))
         ]
 
+    def buildPolicy(self):
+        # Compiled once per run, after tag labels are resolved to ids.
+        return PrunePolicy(
+            tags_keep_ids=self.tags_to_keep_ids,
+            unwanted_genres=self.unwanted_genres,
+            remove_after_days=self.remove_after_days,
+            warn_days_infront=self.warn_days_infront,
+            tags_no_exclusion_ids=self.tags_no_exclusion_ids,
+            months_no_exclusion=self.radarr_months_no_exclusion,
+        )
+
     def writeLog(self, init, msg):
-        mode = "w" if init else "a"
-        try:
-            with open(self.log_filePath, mode) as logfile:
-                logfile.write(f"{datetime.now()} - {msg}\n")
-        except IOError:
-            logging.error(
-                f"Unable to write log file {self.log_filePath}. "
-                "Check file permissions and available disk space."
-            )
+        if init:
+            self.run_log.start()
+        if self.instance is not None:
+            msg = f"[{self.instance}] {msg}"
+        self.run_log.write(msg)
 
     def _delete_action_suffix(self) -> str:
         """Human-readable fragment for logs/Pushover after a delete attempt."""
@@ -279,11 +919,19 @@ class RLP():
 
     def _pushover(self, message: str) -> None:
         if self.pushover_enabled:
-            self.userPushover.send_message(
-                message=message,
-                sound=self.pushover_sound,
-            )
+            if self.instance is not None:
+                message = f"[{self.instance}] {message}"
+            self.notifier.put(message)
+
+    @traced('pushover.send')
+    def _sendPushover(self, message: str) -> None:
+        # Runs on the notification worker thread.
+        self.userPushover.send_message(
+            message=message,
+            sound=self.pushover_sound,
+        )
 
+    @traced('radarr.delete')
     def _try_delete_movie(
         self,
         movie_id: int,
@@ -298,6 +946,7 @@ class RLP():
                 delete_files=self.delete_files,
                 add_import_exclusion=add_import_exclusion,
             )
+            self._forgetMovie(movie_id)
             return True
         except RadarrApiError as e:
             logging.error(
@@ -308,48 +957,420 @@ class RLP():
             )
             return False
 
-    def evalMovie(self, movie):
-        # Determine download date (firstseen) and whether video files exist
-        movieDownloadDate = None
+    def _forgetMovie(self, movie_id):
+        if self.state_store is not None:
+            self.state_store.forget(movie_id)
 
-        fileList = glob.glob(movie.path + "/*")
-        for file in fileList:
-            if file.lower().endswith(tuple(self.video_extensions)):
-                firstseen_path = os.path.join(movie.path, self.firstseen)
-                if not os.path.isfile(firstseen_path):
-                    # create marker file
-                    open(firstseen_path, 'w').close()
-                    if not self.only_show_remove_messages:
-                        txtFirstSeen = (
-                            f"PRUNE: NEW - {movie.title} ({movie.year}) "
-                            f"detected at {movie.path}; "
-                            "marker file created to record first-seen time."
-                        )
-                        self.writeLog(False, txtFirstSeen)
-                        logging.info(txtFirstSeen)
-
-                modifieddate = os.stat(firstseen_path).st_mtime
-                movieDownloadDate = datetime.fromtimestamp(modifieddate)
-                break
+    def _reportRemoval(self, movie, label, movieDownloadDate):
+        sfx = self._delete_action_suffix()
+        self._removed.append(f"{movie.title} ({movie.year}) - {label}{sfx}")
+        pushLabel = 'UNWANTED' if label == 'UNWANTED GENRE' else label
+        self._pushover(
+            f"{movie.title} ({movie.year}) Prune - {pushLabel} "
+            f"{sfx} - {movieDownloadDate}"
+        )
+        self._log_line(
+            f"PRUNE: {label} - {movie.title} ({movie.year})"
+            f"{sfx}; "
+            f"original download date: {movieDownloadDate}"
+        )
 
-        movie_dict = {
-            'tagsIds': list(movie.tagsIds),
-            'genres': list(movie.genres),
-            'download_date': movieDownloadDate,
-        }
+    def _removeMovie(
+        self, movie, label, add_import_exclusion, movieDownloadDate
+    ):
+        if (self.bulk_delete or self.async_client) \
+                and self.radarr_enabled and not self.dry_run:
+            # Reported (and counted) by flushDeletes().
+            self._pending_deletes.append(
+                (movie, label, add_import_exclusion, movieDownloadDate)
+            )
+            return False, False
+        ok = self._try_delete_movie(
+            movie.id, movie.title, add_import_exclusion
+        )
+        if self.radarr_enabled and not self.dry_run:
+            self._countDeletes([movie], [movie] if ok else [])
+        if not ok:
+            return False, False
+        self._reportRemoval(movie, label, movieDownloadDate)
+        return True, False
+
+    @traced('radarr.bulk_delete')
+    def flushDeletes(self):
+        """Bulk-delete the pending removals; returns the number deleted."""
+        pending, self._pending_deletes = self._pending_deletes, []
+        if not pending:
+            return 0
+        deleted = {}
+        for add_import_exclusion in (True, False):
+            ids = [p[0].id for p in pending if p[2] == add_import_exclusion]
+            if ids:
+                deleted.update(self.radarr_client.delete_movies(
+                    ids,
+                    delete_files=self.delete_files,
+                    add_import_exclusion=add_import_exclusion,
+                    chunk_size=self.bulk_delete_chunk_size,
+                    bulk=self.bulk_delete,
+                ))
+        self._countDeletes(
+            [p[0] for p in pending],
+            [p[0] for p in pending if deleted.get(p[0].id)],
+        )
+        numDeleted = 0
+        for movie, label, _exclusion, movieDownloadDate in pending:
+            self.run_log.record(
+                instance=self.instance,
+                id=movie.id,
+                title=movie.title,
+                year=movie.year,
+                reason=(
+                    'unwanted-genre' if label == 'UNWANTED GENRE'
+                    else 'removed'
+                ),
+                download_date=movieDownloadDate,
+                action='deleted' if deleted.get(movie.id) else 'delete-failed',
+            )
+            if not deleted.get(movie.id):
+                continue
+            self._forgetMovie(movie.id)
+            self._reportRemoval(movie, label, movieDownloadDate)
+            numDeleted += 1
+        return numDeleted
+
+    @traced('radarr.rootfolders')
+    def getRootFolders(self):
+        # Root folder paths group the filesystem scan per mount; fetched
+        # once per library load.
+        if self._root_folders is not None:
+            return self._root_folders
+        boot = self._bootstrap
+        if boot is not None and boot.root_folders is not None:
+            folders = boot.root_folders
+        else:
+            try:
+                folders = self.radarr_client.get_root_folders()
+            except RadarrApiError as e:
+                logging.warning(
+                    "Could not fetch Radarr root folders (%s); scanning all "
+                    "movie folders as one group.",
+                    e,
+                )
+                return []
+        self._root_folders = [
+            str(rf['path']) for rf in folders if rf.get('path')
+        ]
+        return self._root_folders
 
-        config = {
-            'tags_keep_ids': self.tags_to_keep_ids,
-            'unwanted_genres': self.unwanted_genres,
-            'remove_after_days': self.remove_after_days,
-            'warn_days_infront': self.warn_days_infront,
-            'tags_no_exclusion_ids': self.tags_no_exclusion_ids,
-            'months_no_exclusion': self.radarr_months_no_exclusion,
-        }
+    def openStateStore(self):
+        # One sequential read for the whole library.
+        if self.state_store is not None:
+            self.state_store.open()
+            self._first_seen = self.state_store.load_first_seen()
 
-        result = decide_prune_action(movie_dict, config)
+    def closeStateStore(self, media):
+        store = self.state_store
+        if store is None:
+            return
+        if media is not None:
+            store.retain(movie.id for movie in media)
+        store.close()
+        if self._num_imported:
+            self._log_line(
+                f"PRUNE: Imported {self._num_imported} first-seen "
+                "timestamps from marker files into the state database."
+            )
+            self._num_imported = 0
+
+    def _knownFirstSeen(self, movie):
+        entry = self._first_seen.get(movie.id)
+        if entry is not None and entry[0] == movie.path:
+            return entry[1]
+        return None
+
+    def _apiHasVideo(self, movie):
+        if not movie.hasFile:
+            return False
+        rel = movie.fileRelativePath
+        return not rel or rel.lower().endswith(self.scanner.video_extensions)
+
+    def _needsFilesystem(self, movie):
+        if self.date_source == 'API':
+            return False
+        return self.date_source == 'FILESYSTEM' or self._apiHasVideo(movie)
+
+    def probeMovie(self, movie):
+        if not self._needsFilesystem(movie):
+            # API payload only: movieFile.dateAdded is the download date.
+            added = movie.fileDateAdded
+            if self.date_source != 'API' or added is None \
+                    or not self._apiHasVideo(movie):
+                return FolderScan(False)
+            return FolderScan(True, added.timestamp())
+        started = time.perf_counter()
+        with self.tracer.detail('probe', 'folder', path=movie.path):
+            scan = self.scanner.probe(
+                movie.path, self._knownFirstSeen(movie)
+            )
+        self.metrics.observe(
+            'radarr_prune_probe_duration_seconds',
+            time.perf_counter() - started,
+            **self._metricLabels(),
+        )
+        return scan
+
+    def _recordFirstSeen(self, movie, scan):
+        if self.state_store is None or not scan.has_video:
+            return
+        if self.date_source == 'API':
+            return
+        if self._knownFirstSeen(movie) == scan.first_seen:
+            return
+        self.state_store.set_first_seen(movie.id, movie.path, scan.first_seen)
+        self._first_seen[movie.id] = (movie.path, scan.first_seen)
+        if not scan.is_new:
+            self._num_imported += 1
+
+    def _decisionFingerprint(self, movie):
+        # Everything evalMovie() reads from Radarr and the INI; changes
+        # on disk that Radarr does not see wait for next_due or --full.
+        fp = self._fingerprints.get(movie.id)
+        if fp is None:
+            key = repr((
+                self._decision_salt,
+                movie.path,
+                movie.tagsIds,
+                movie.genres,
+                movie.hasFile,
+                movie.fileRelativePath,
+                movie.fileDateAdded,
+            ))
+            fp = int.from_bytes(
+                hashlib.blake2b(key.encode(), digest_size=8).digest(),
+                'big',
+                signed=True,
+            )
+            self._fingerprints[movie.id] = fp
+        return fp
+
+    def dueMovies(self, media, full=False):
+        """
+        Movies to evaluate this run: all of them, or the new, changed and
+        due ones (INCREMENTAL), limited to the next shard window plus the
+        movies due in other shards when sharding.
+        """
+        self._not_due = {}
+        self._shard_plan = None
+        if full or not (self.incremental or self.sharding):
+            return media
+        index = self.state_store.load_decisions()
+        nowUs = wall_clock_us(datetime.now())
+        window = None
+        if self.sharding:
+            self._shard_plan = self.planShard(media)
+            window = self._shard_window = {
+                movie.id for movie in self._shard_plan.window
+            }
+            self._shard_since = 0
+        due = []
+        for movie in media:
+            entry = index.get(movie.id)
+            timeDue = entry is not None and entry[1] is not None \
+                and entry[1] <= nowUs
+            if window is None or movie.id in window:
+                pick = not self.incremental or timeDue or entry is None \
+                    or entry[0] != self._decisionFingerprint(movie)
+            else:
+                # Other shards: new movies and those with a boundary behind
+                # them.
+                pick = entry is None or timeDue
+            if pick:
+                due.append(movie)
+            elif entry is not None:
+                self._not_due[movie.id] = entry[1]
+        if window is not None:
+            elsewhere = sum(movie.id not in window for movie in due)
+            if elsewhere:
+                self._log_line(
+                    f"PRUNE: {elsewhere} movies outside the shard are due "
+                    "and evaluated too."
+                )
+            # The cursor follows this order.
+            due.sort(key=shard_key)
+        return due
+
+    def planShard(self, media):
+        roots = self.getRootFolders() if self.shard_by == 'ROOT_FOLDER' \
+            else ()
+        state = ShardState.load(
+            self.state_store.get_meta('shard'), self.shard_by, self.shards
+        )
+        plan = plan_shard(
+            media,
+            Sharder(self.shards, self.shard_by, roots),
+            state,
+            self.max_movies_per_run,
+        )
+        self._log_line(
+            f"PRUNE: Shard {plan.state.shard + 1}/{self.shards} - "
+            f"evaluating {len(plan.window)} of its {plan.remaining} "
+            f"remaining movies"
+            f"{' (resumed)' if plan.state.cursor is not None else ''}."
+        )
+        return plan
+
+    def checkpointShard(self, movie):
+        # An interrupted run resumes after the last checkpoint; only taken
+        # when no deletes are queued, so none of them is skipped.
+        if movie.id not in self._shard_window:
+            return
+        self._shard_since += 1
+        if self._shard_since < SHARD_CHECKPOINT_EVERY \
+                or self._pending_deletes:
+            return
+        self._shard_since = 0
+        self.saveShard(self._shard_plan.state.at(shard_key(movie)))
+        self.state_store.commit()
+
+    def saveShard(self, state):
+        self.state_store.set_meta('shard', state.dump())
+
+    def _indexDecision(self, movie, result, nextChange):
+        # Only KEEP and ACTIVE are quiet until something changes; missing
+        # files, removals and planned removals are looked at every run.
+        # Sharded runs also index planned removals (due at the removal
+        # date), removals still pending and movies without files (always
+        # due), so movies in other shards are removed and stamped on time.
+        reason = result.reason
+        if reason in ('keep-tag', 'active') or (
+            self.sharding and reason == 'will-be-removed'
+        ):
+            nextDue = None if nextChange is None \
+                else wall_clock_us(nextChange)
+        elif self.sharding and reason in (
+            'removed', 'unwanted-genre', 'missing-files'
+        ):
+            nextDue = 0
+        else:
+            self.state_store.forget_decision(movie.id)
+            return
+        self.state_store.set_decision(
+            movie.id, self._decisionFingerprint(movie), nextDue
+        )
+
+    @traced('scan')
+    def scanMovies(self, media, library=None):
+        """
+        Probe the folders of ``media`` concurrently; results keyed by movie
+        id. When ``library`` is given, the scan cache is trimmed to it.
+        """
+        on_disk = []
+        scans = {}
+        for movie in media:
+            if self._needsFilesystem(movie):
+                on_disk.append(movie)
+            else:
+                scans[movie.id] = self.probeMovie(movie)
+        if not on_disk:
+            return scans
+
+        if self.scan_cache is not None and not self._scan_cache_loaded:
+            self.scan_cache.load()
+            self._scan_cache_loaded = True
+        by_id = {movie.id: movie for movie in on_disk}
+        scans.update(scan_folders(
+            ((movie.id, movie.path) for movie in on_disk),
+            lambda movie_id, _path: self.probeMovie(by_id[movie_id]),
+            self.getRootFolders(),
+            self.scan_workers_per_root,
+        ))
+        if self.scan_cache is not None:
+            if library is not None:
+                self.scan_cache.retain(
+                    movie.path for movie in library
+                    if self._needsFilesystem(movie)
+                )
+            self.scan_cache.save()
+        return scans
+
+    def _recordDecision(self, movie, reason, downloadDate, outcome, started):
+        isRemoved, isPlanned = outcome
+        if reason in ('unwanted-genre', 'removed'):
+            if isRemoved:
+                action = 'dry-run' if self.dry_run else 'deleted'
+            elif self._pending_deletes \
+                    and self._pending_deletes[-1][0] is movie:
+                action = 'queued'
+            else:
+                action = 'delete-failed'
+        elif isPlanned:
+            action = 'warned'
+        elif reason == 'missing-files':
+            action = 'skipped'
+        else:
+            action = 'kept'
+        self.metrics.inc(
+            'radarr_prune_decisions_total', reason=reason,
+            **self._metricLabels(),
+        )
+        self.run_log.record(
+            instance=self.instance,
+            id=movie.id,
+            title=movie.title,
+            year=movie.year,
+            reason=reason,
+            download_date=downloadDate,
+            action=action,
+            latency_ms=round((time.perf_counter() - started) * 1000, 3),
+        )
+
+    def evalMovie(self, movie, scan=None):
+        started = time.perf_counter()
+        with self.tracer.detail('evaluate', 'movie',
+                                id=movie.id, title=movie.title):
+            reason, movieDownloadDate, outcome = \
+                self._evalMovie(movie, scan)
+        self._recordDecision(
+            movie, reason, movieDownloadDate, outcome, started
+        )
+        return outcome
+
+    def _evalMovie(self, movie, scan):
+        # Returns (reason, download date, (isRemoved, isPlanned)).
+        # Determine download date (firstseen) and whether video files exist
+        if scan is None:
+            scan = self.probeMovie(movie)
+        self._recordFirstSeen(movie, scan)
+
+        movieDownloadDate = None
+        if scan.has_video:
+            if scan.is_new and not self.only_show_remove_messages:
+                if self.write_firstseen_markers:
+                    txtRecorded = (
+                        "marker file created to record first-seen time."
+                    )
+                else:
+                    txtRecorded = "first-seen time recorded."
+                txtFirstSeen = (
+                    f"PRUNE: NEW - {movie.title} ({movie.year}) "
+                    f"detected at {movie.path}; {txtRecorded}"
+                )
+                self.writeLog(False, txtFirstSeen)
+                logging.info(txtFirstSeen)
+            movieDownloadDate = datetime.fromtimestamp(scan.first_seen)
+
+        policy = self.policy
+        tagMask = policy.tag_mask(movie.tagsIds)
+        now = datetime.now()
+        result = policy.decide(tagMask, movie.genres, movieDownloadDate, now)
+        if self.incremental or self.sharding or self.daemon:
+            nextChange = policy.next_change(
+                tagMask, movie.genres, movieDownloadDate, now
+            )
+            if self.incremental or self.sharding:
+                self._indexDecision(movie, result, nextChange)
+            if self.daemon:
+                self._scheduleDeadline(movie.id, nextChange)
         reason = result.reason
-        sfx = self._delete_action_suffix()
 
         match reason:
             case 'keep-tag':
@@ -357,28 +1378,19 @@ class RLP():
                     f"PRUNE: KEEP - {movie.title} ({movie.year}) has a "
                     "keep tag; skipping removal."
                 )
-                return False, False
+                outcome = False, False
 
             case 'missing-files':
                 self._log_detail(
                     f"PRUNE: MISSING FILES - {movie.title} ({movie.year}) "
                     "has no monitored video files in its folder; skipping."
                 )
-                return False, False
+                outcome = False, False
 
             case 'unwanted-genre':
-                if not self._try_delete_movie(movie.id, movie.title, True):
-                    return False, False
-                self._pushover(
-                    f"{movie.title} ({movie.year}) Prune - UNWANTED "
-                    f"{sfx} - {movieDownloadDate}"
-                )
-                self._log_line(
-                    f"PRUNE: UNWANTED GENRE - {movie.title} ({movie.year})"
-                    f"{sfx}; "
-                    f"original download date: {movieDownloadDate}"
+                outcome = self._removeMovie(
+                    movie, 'UNWANTED GENRE', True, movieDownloadDate
                 )
-                return True, False
 
             case 'will-be-removed':
                 timeLeft = (
@@ -386,6 +1398,7 @@ class RLP():
                 ) - datetime.now()
                 txtTimeLeft = 'h'.join(str(timeLeft).split(':')[:2])
                 txtTitle = f"{movie.title} ({movie.year})"
+                self._planned.append(f"{txtTitle} - in {txtTimeLeft}")
                 self._pushover(
                     "Prune - "
                     f"{txtTitle} will be removed from server in "
@@ -395,23 +1408,15 @@ class RLP():
                     f"PRUNE: SCHEDULED REMOVAL - {txtTitle} will be removed in "
                     f"{txtTimeLeft} (download date: {movieDownloadDate})"
                 )
-                return False, True
+                outcome = False, True
 
             case 'removed':
-                if not self._try_delete_movie(
-                    movie.id, movie.title, result.add_import_exclusion
-                ):
-                    return False, False
-                self._pushover(
-                    f"{movie.title} ({movie.year}) Prune - REMOVED "
-                    f"{sfx} - {movieDownloadDate}"
+                outcome = self._removeMovie(
+                    movie,
+                    'REMOVED',
+                    result.add_import_exclusion,
+                    movieDownloadDate,
                 )
-                self._log_line(
-                    f"PRUNE: REMOVED - {movie.title} ({movie.year})"
-                    f"{sfx}; "
-                    f"original download date: {movieDownloadDate}"
-                )
-                return True, False
 
             case _:
                 self._log_detail(
@@ -419,9 +1424,16 @@ class RLP():
                     f"active or recent; skipping removal (download date: "
                     f"{movieDownloadDate})."
                 )
-                return False, False
+                outcome = False, False
+        return reason, movieDownloadDate, outcome
+
+    def startRun(self):
+        self.startPipeline()
+        self.connectRadarr()
 
-    def run(self):
+    def startPipeline(self):
+        """Checks and notification setup shared by all instances."""
+        self._pass_started = time.monotonic()
         logging.info("Radarr Prune %s", __version__)
         if not self.enabled_run:
             logging.info(
@@ -429,12 +1441,43 @@ class RLP():
             self.writeLog(False, "Prune - Library purge disabled.\n")
             sys.exit()
 
+        # Setting for PushOver
+        if self.pushover_enabled:
+            from chump import Application
+            self.appPushover = Application(self.pushover_token_api)
+            self.userPushover = \
+                self.appPushover.get_user(self.pushover_user_key)
+            self.notifier = NotificationQueue(
+                self._sendPushover,
+                digest_size=self.pushover_digest_size,
+                digest_seconds=self.pushover_digest_seconds,
+            )
+
+    @traced('radarr.connect')
+    def connectRadarr(self):
         # Connect to Radarr (HTTP API v3, no arrapi)
         if self.radarr_enabled:
             try:
-                self.radarr_client = RadarrClient(
-                    self.radarr_url, self.radarr_token)
-                self.radarr_client.ping()
+                if self.async_client:
+                    client = optional_module('radarr_async_client')
+                    self.radarr_client = client.BlockingRadarrClient(
+                        self.radarr_url,
+                        self.radarr_token,
+                        max_concurrent_mutations=self.max_concurrent_deletes,
+                        **self.clientOptions(),
+                    )
+                    # Includes the status call that doubles as ping.
+                    self._bootstrap = self.radarr_client.bootstrap(
+                        stream=self.stream_movie_list
+                    )
+                else:
+                    client = optional_module('radarr_client')
+                    self.radarr_client = client.RadarrClient(
+                        self.radarr_url,
+                        self.radarr_token,
+                        **self.clientOptions(),
+                    )
+                    self.radarr_client.ping()
             except RadarrApiError as e:
                 logging.error(
                     f"Failed to reach Radarr at {self.radarr_url}: {e}"
@@ -455,52 +1498,85 @@ class RLP():
             logging.info("DRY RUN: no changes will be made.")
             self.writeLog(False, "Dry run mode - no deletions performed.\n")
 
-        # Setting for PushOver
-        if self.pushover_enabled:
-            self.appPushover = Application(self.pushover_token_api)
-            self.userPushover = \
-                self.appPushover.get_user(self.pushover_user_key)
-
-        # Get all movies from the server.
-        media = None
-        if self.radarr_enabled:
-            try:
-                # Cache tag label -> id mapping once per run to avoid
-                # per-movie /tag API calls.
-                self._tag_label_to_id = self.getTagLabeltoID()
-                self.tags_to_keep_ids = self.getIDsforTagLabels(
-                    self.tags_to_keep
-                )
-                self.tags_no_exclusion_ids = self.getIDsforTagLabels(
-                    self.radarr_tags_no_exclusion
-                )
-                raw = self.radarr_client.get_movies()
-                media = [MovieRecord.from_api(m) for m in raw]
-            except RadarrApiError as e:
-                logging.error("Failed to fetch movies from Radarr: %s", e)
-                sys.exit(1)
-
-        if self.verbose_logging:
-            logging.info("PRUNE: Radarr prune run started.")
-        self.writeLog(True, "PRUNE: Radarr prune run started.\n")
-
-        # Make sure the library is not empty.
+    @traced('library')
+    def loadLibrary(self):
+        """Resolve tags, compile the policy and fetch all movies."""
+        # Cache tag label -> id mapping once per run to avoid
+        # per-movie /tag API calls.
+        self._tag_label_to_id = self.getTagLabeltoID()
+        self.tags_to_keep_ids = self.getIDsforTagLabels(
+            self.tags_to_keep
+        )
+        self.tags_no_exclusion_ids = self.getIDsforTagLabels(
+            self.radarr_tags_no_exclusion
+        )
+        self.policy = self.buildPolicy()
+        self._decision_salt = (
+            self.policy.fingerprint(),
+            self.date_source,
+            self.scanner.video_extensions,
+        )
+        self._fingerprints = {}
+        self._root_folders = None
+        media = self.getMovies()
+        if self._bootstrap is not None:
+            self.getRootFolders()
+            # Bootstrap results are only fresh for the first load.
+            self._bootstrap = None
+        return media
+
+    @traced('prune')
+    def pruneMovies(self, movies, library, full=False):
+        """
+        Evaluate ``movies`` and return the numbers of removed and planned
+        movies. ``library`` is the whole library, used to trim the state
+        and scan caches, or None for a partial pass.
+        """
         numDeleted = 0
         numNotifified = 0
-        isRemoved, isPlanned = False, False
-
-        # Movies are always evaluated; prune decisions are age/tag/month based.
-        if media:
-            media.sort(key=self.sortOnTitle)  # Sort the list on Title
-            for movie in media:
-                isRemoved, isPlanned = self.evalMovie(movie)
-                if isRemoved:
-                    numDeleted += 1
-                if isPlanned:
-                    numNotifified += 1
-
-                time.sleep(0.2)
-
+        self.openStateStore()
+        due = self.dueMovies(movies, full)
+        if len(due) < len(movies):
+            kind = 'Sharded' if self._shard_plan is not None \
+                else 'Incremental'
+            self._log_line(
+                f"PRUNE: {kind} run - evaluating {len(due)} of "
+                f"{len(movies)} movies; the others are not due."
+            )
+        scans = self.scanMovies(due, library)
+        for movie in due:
+            isRemoved, isPlanned = self.evalMovie(movie, scans[movie.id])
+            if isRemoved:
+                numDeleted += 1
+            if isPlanned:
+                numNotifified += 1
+            if len(self._pending_deletes) >= self.bulk_delete_chunk_size:
+                numDeleted += self.flushDeletes()
+            if self._shard_plan is not None:
+                self.checkpointShard(movie)
+        numDeleted += self.flushDeletes()
+        if self._shard_plan is not None:
+            self.saveShard(self._shard_plan.done())
+        self.closeStateStore(library)
+        self.run_log.flush()
+        labels = self._metricLabels()
+        self.metrics.inc(
+            'radarr_prune_movies_evaluated_total', len(due), **labels
+        )
+        self.metrics.inc(
+            'radarr_prune_movies_removed_total', numDeleted, **labels
+        )
+        self.metrics.inc(
+            'radarr_prune_movies_planned_total', numNotifified, **labels
+        )
+        return numDeleted, numNotifified
+
+    @traced('report')
+    def report(self, numDeleted, numNotifified, breakdown=()):
+        """
+        Summary line, Pushover summary and mail. ``breakdown`` holds one
+        line per Radarr instance when several were pruned.
+        """
         txtEnd = (
             f"Prune - There were {numDeleted} movies removed "
             f"and {numNotifified} movies planned to be removed "
@@ -508,92 +1584,487 @@ class RLP():
         )
 
         if self.pushover_enabled:
-            self.message = self.userPushover.send_message(
-                message=txtEnd,
-                sound=self.pushover_sound
-            )
+            self.notifier.put_summary("\n".join([txtEnd, *breakdown]))
 
         if self.verbose_logging:
             logging.info(txtEnd)
         self.writeLog(False, f"{txtEnd}\n")
-
+        for line in breakdown:
+            logging.info("Prune - %s", line)
+            self.writeLog(False, f"Prune - {line}")
+        # The mail attaches the log file.
+        self.run_log.flush()
+        self.writeMetrics()
+
+        removed, self._removed = self._removed, []
+        planned, self._planned = self._planned, []
         if self.mail_enabled and \
             (not self.only_mail_when_removed or
                 (self.only_mail_when_removed and (
                     numDeleted > 0 or numNotifified > 0))):
+            self.sendReport(
+                numDeleted, numNotifified, removed, planned, breakdown
+            )
 
-            sender_email = self.mail_sender
-            receiver_email = self.mail_receiver
+    def sendReport(
+        self, numDeleted, numNotifified, removed, planned, breakdown=()
+    ):
+        """Mail the summary with the gzipped log; sent on a thread."""
+        mail_report = optional_module('mail_report')
+        attachment = None
+        if self.mail_max_attachment_kb > 0:
+            name = self.log_file + '.gz'
+            try:
+                data, truncated = mail_report.gzip_file(
+                    self.log_filePath, self.mail_max_attachment_kb * 1024
+                )
+                attachment = (name, data)
+                if truncated:
+                    logging.warning(
+                        "PRUNE: Prune log truncated to %d KiB for the "
+                        "mail attachment.",
+                        self.mail_max_attachment_kb,
+                    )
+            except OSError as e:
+                logging.error(
+                    "Unable to attach log file %s: %s", self.log_filePath, e
+                )
+        message = mail_report.build_message(
+            self.mail_sender,
+            self.mail_receiver,
+            f"Radarr - Pruned {numDeleted} movies "
+            f"and {numNotifified} planned for removal",
+            mail_report.summary_body(
+                numDeleted,
+                numNotifified,
+                self.warn_days_infront,
+                removed,
+                planned,
+                attachment[0] if attachment else None,
+                breakdown,
+            ),
+            attachment,
+        )
 
-            message = MIMEMultipart()
-            message["From"] = sender_email
-            message['To'] = ", ".join(receiver_email)
-            message['Subject'] = (
-                f"Radarr - Pruned {numDeleted} movies "
-                f"and {numNotifified} planned for removal"
-            )
+        def sent():
+            # Mail thread: the run log may already be closed, or truncated
+            # by the next daemon pass, so only the logger is used.
+            logging.info(f"PRUNE: Email sent to {message['To']}.")
+
+        mail_report.send_in_background(lambda: self._sendMail(message), sent)
+
+    @traced('smtp.send')
+    def _sendMail(self, message):
+        # Runs on the mail thread.
+        return optional_module('mail_report').send(
+            self.mail_server,
+            self.mail_port,
+            self.mail_login,
+            self.mail_password,
+            message,
+        )
 
-            with open(self.log_filePath, 'rb') as attachment:
-                obj = MIMEBase('application', 'octet-stream')
-                obj.set_payload(attachment.read())
-            encoders.encode_base64(obj)
-            obj.add_header(
-                'Content-Disposition',
-                "attachment; filename= "+self.log_file
-            )
-            message.attach(obj)
+    def finish(self):
+        notifier = getattr(self, 'notifier', None)
+        if self.shared is None:
+            self.run_log.close()
+            self.logTraceSummary()
+            if notifier is not None:
+                # Queued notifications are still delivered before exit.
+                notifier.close()
+        self.logRequestStats()
+        rc = getattr(self, 'radarr_client', None)
+        if rc is not None:
+            rc.close()
+
+    def pruneInstance(self, full=False):
+        """
+        Prune this [RADARR:<name>] instance (on its own thread); returns
+        (removed, planned, removed titles, planned titles), or None when
+        the instance is disabled or failed.
+        """
+        try:
+            if not self.radarr_enabled:
+                logging.info("Radarr instance disabled; skipping.")
+                return None
+            self.connectRadarr()
+            media = self.loadLibrary()
+            numDeleted, numNotifified = 0, 0
+            if media:
+                media.sort(key=self.sortOnTitle)
+                numDeleted, numNotifified = self.pruneMovies(
+                    media, media, full
+                )
+            return numDeleted, numNotifified, self._removed, self._planned
+        except (RadarrApiError, SystemExit) as e:
+            # connectRadarr() logs the cause before exiting.
+            if not isinstance(e, SystemExit):
+                logging.error("Radarr API error: %s", e)
+            self.writeLog(False, "Prune run failed; see the log.")
+            return None
+        finally:
+            self.finish()
+
+    def runInstances(self, full=False):
+        """
+        Prune every [RADARR:<name>] instance concurrently. Each has its
+        own client, rate limit and state files; the run log, Pushover queue
+        and report mail are shared.
+        """
+        self.startPipeline()
+        for handler in logging.getLogger().handlers:
+            handler.setFormatter(logging.Formatter(INSTANCE_LOG_FORMAT))
+        self.writeLog(True, "PRUNE: Radarr prune run started.\n")
 
-            body = (
-                "Hi,\n\n Attached is the prunelog from Prxlovarr.\n\n"
-                "Have a nice day.\n\n"
+        results = {}
+
+        def prune(rlp):
+            results[rlp.instance] = rlp.pruneInstance(full)
+
+        threads = [
+            threading.Thread(
+                target=prune, args=(RLP(name, shared=self),), name=name
+            )
+            for name in self.instances
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        numDeleted, numNotifified, breakdown = 0, 0, []
+        for name in self.instances:
+            result = results.get(name)
+            if result is None:
+                breakdown.append(f"{name}: no result (disabled or failed).")
+                continue
+            deleted, planned, removedTitles, plannedTitles = result
+            numDeleted += deleted
+            numNotifified += planned
+            self._removed += [f"[{name}] {t}" for t in removedTitles]
+            self._planned += [f"[{name}] {t}" for t in plannedTitles]
+            breakdown.append(
+                f"{name}: {deleted} movies removed and {planned} planned."
+            )
+        self.report(numDeleted, numNotifified, breakdown)
+        self.finish()
+
+    def run(self, full=False):
+        if self.instances:
+            return self.runInstances(full)
+        self.startRun()
+        if self.webhook_enabled:
+            logging.warning(
+                "WEBHOOK ENABLED = ON only has effect with --daemon."
             )
 
-            with open(self.log_filePath, "r", encoding='UTF-8') as logfile:
-                body += logfile.read()
+        # Get all movies from the server.
+        try:
+            media = self.loadLibrary()
+        except RadarrApiError as e:
+            logging.error("Failed to fetch movies from Radarr: %s", e)
+            sys.exit(1)
+
+        if self.verbose_logging:
+            logging.info("PRUNE: Radarr prune run started.")
+        self.writeLog(True, "PRUNE: Radarr prune run started.\n")
+
+        # Movies are always evaluated; prune decisions are age/tag/month based.
+        numDeleted, numNotifified = 0, 0
+        if media:
+            media.sort(key=self.sortOnTitle)  # Sort the list on Title
+            numDeleted, numNotifified = self.pruneMovies(media, media, full)
+
+        self.report(numDeleted, numNotifified)
+        self.finish()
 
-            plain_text = MIMEText(
-                body, _subtype='plain', _charset='UTF-8')
-            message.attach(plain_text)
+    def wakeDaemon(self):
+        self._wake.set()
 
-            my_message = message.as_string()
+    def stopDaemon(self):
+        self._stop.set()
+        self._wake.set()
 
+    def _scheduleDeadline(self, movie_id, due):
+        # Lazy deletion: the heap may hold outdated entries for a movie;
+        # only the one matching _deadline_for is still valid.
+        if due is None:
+            self._deadline_for.pop(movie_id, None)
+            return
+        self._deadline_for[movie_id] = due
+        heapq.heappush(self._deadlines, (due, movie_id))
+
+    def _popDueDeadlines(self, now):
+        ids = []
+        heap = self._deadlines
+        while heap and heap[0][0] <= now:
+            due, movie_id = heapq.heappop(heap)
+            if self._deadline_for.get(movie_id) == due:
+                del self._deadline_for[movie_id]
+                ids.append(movie_id)
+        return ids
+
+    def _nextWakeup(self, nextResync):
+        """Seconds until the next deadline or full resync."""
+        timeout = nextResync - time.monotonic()
+        if self._deadlines:
+            untilDue = (
+                self._deadlines[0][0] - datetime.now()
+            ).total_seconds()
+            timeout = min(timeout, untilDue)
+        return max(0.0, timeout)
+
+    def resync(self, full):
+        """Full pass over the library; rebuilds the deadline heap."""
+        self._pass_started = time.monotonic()
+        media = self.loadLibrary()
+        media.sort(key=self.sortOnTitle)
+        self._library = {movie.id: movie for movie in media}
+        self._deadlines = []
+        self._deadline_for = {}
+        # Keep the lines of unreported deadline passes for the mail.
+        self.writeLog(
+            not any(self._unreported),
+            "PRUNE: Radarr prune daemon resync started.\n",
+        )
+        counts = self.pruneMovies(media, media, full)
+        # Movies skipped by the incremental index keep their stored due
+        # time; evaluated movies were scheduled by evalMovie().
+        for movie_id, due in self._not_due.items():
+            if due is not None:
+                self._scheduleDeadline(movie_id, from_wall_clock_us(due))
+        self._addUnreported(counts)
+        self.reportUnreported()
+
+    def _addUnreported(self, counts):
+        self._unreported = tuple(
+            a + b for a, b in zip(self._unreported, counts)
+        )
+
+    def reportUnreported(self):
+        """
+        Report the daemon passes since the last report, once per resync;
+        hourly passes would otherwise mail an empty summary each time.
+        """
+        counts, self._unreported = self._unreported, (0, 0)
+        if any(counts):
+            self.report(*counts)
+        else:
+            self.writeMetrics()
+
+    def reevaluate(self, ids):
+        """Fetch and re-evaluate just these movies."""
+        if not ids:
+            return
+        self._pass_started = time.monotonic()
+        movies = []
+        for movie_id in ids:
+            movie = self.radarr_client.get_movie(movie_id)
+            if movie is None:
+                self._library.pop(movie_id, None)
+                continue
+            self._library[movie_id] = movie
+            self._fingerprints.pop(movie_id, None)
+            movies.append(movie)
+        movies.sort(key=self.sortOnTitle)
+        # A partial pass: leave the caches of the other movies alone.
+        counts = self.pruneMovies(movies, None, full=True)
+        # Summed into the next resync's report: one mail and Pushover
+        # summary per resync, not per movie.
+        self._addUnreported(counts)
+        if any(counts):
+            self.writeMetrics()
+
+    @traced('daemon.deadlines')
+    def processDeadlines(self):
+        """Re-evaluate movies whose warning or removal time has come."""
+        self.reevaluate(self._popDueDeadlines(datetime.now()))
+
+    def onWebhookEvent(self, event):
+        # Listener thread: only queue; the daemon loop does the work.
+        self._events.put(event)
+        self.wakeDaemon()
+
+    def _resetFirstSeen(self, event):
+        # The files are gone (not an upgrade): a later download starts a
+        # new retention period instead of inheriting the old first-seen.
+        self._forgetMovie(event.movie_id)
+        # Only folders Radarr reported in the last library fetch; the
+        # payload's folderPath is not trusted with a file removal.
+        movie = self._library.get(event.movie_id)
+        if movie is None or not movie.path \
+                or not self.write_firstseen_markers \
+                or self.date_source == 'API':
+            return
+        try:
+            os.remove(os.path.join(movie.path, self.firstseen))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.warning(
+                "Could not remove first-seen marker in %s: %s", movie.path, e
+            )
+
+    @traced('daemon.webhook')
+    def processWebhookEvents(self):
+        """Apply queued Radarr webhook events to the affected movies."""
+        refresh, removed, reset = [], set(), []
+        while True:
             try:
-                email_session = smtplib.SMTP(
-                    self.mail_server, self.mail_port)
-                email_session.starttls()
-                email_session.login(
-                    self.mail_login, self.mail_password)
-                email_session.sendmail(
-                    self.mail_sender, self.mail_receiver, my_message)
-                email_session.quit()
+                event = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if event.movie_id is None:
+                # Test, Health, ApplicationUpdate, ...
                 logging.info(
-                    f"PRUNE: Email sent to {message['To']} "
-                    "with prune log attached."
-                )
-                self.writeLog(
-                    False,
-                    f"PRUNE: Email sent to {message['To']}.\n"
+                    "PRUNE: Webhook %s event received.", event.event_type
                 )
+                continue
+            logging.info(
+                "PRUNE: Webhook %s event for %s (id %d).",
+                event.event_type,
+                event.title,
+                event.movie_id,
+            )
+            if event.event_type == 'MovieDelete':
+                removed.add(event.movie_id)
+                continue
+            if event.event_type == 'MovieFileDelete' \
+                    and event.delete_reason.lower() != 'upgrade':
+                reset.append(event)
+            # Download, MovieFileDelete, MovieAdded, Rename, ...: the API
+            # has the current tags and file, so just refetch the movie.
+            refresh.append(event.movie_id)
+        if removed or reset:
+            self.openStateStore()
+            for movie_id in removed:
+                self._forgetMovie(movie_id)
+                self._library.pop(movie_id, None)
+                self._scheduleDeadline(movie_id, None)
+            for event in reset:
+                self._resetFirstSeen(event)
+            self.closeStateStore(None)
+        self.reevaluate(
+            [i for i in dict.fromkeys(refresh) if i not in removed]
+        )
 
-            except (gaierror, ConnectionRefusedError):
-                logging.error(
-                    "Failed to connect to the server. "
-                    "Bad connection settings?")
-            except smtplib.SMTPServerDisconnected:
+    def startWebhook(self):
+        if not self.webhook_enabled:
+            return
+        webhook = optional_module('webhook')
+        if not self.webhook_token and \
+                not webhook.is_loopback(self.webhook_host):
+            logging.error(
+                "Not starting the webhook listener on %s without a TOKEN; "
+                "set [WEBHOOK] TOKEN or HOST = 127.0.0.1.",
+                self.webhook_host,
+            )
+            return
+        try:
+            self._webhook = webhook.WebhookServer(
+                self.webhook_host,
+                self.webhook_port,
+                self.onWebhookEvent,
+                token=self.webhook_token,
+            ).start()
+        except OSError as e:
+            logging.error(
+                "Could not start webhook listener on %s:%d: %s",
+                self.webhook_host,
+                self.webhook_port,
+                e,
+            )
+            return
+        logging.info(
+            "PRUNE: Listening for Radarr webhooks on http://%s:%d/radarr",
+            self.webhook_host,
+            self._webhook.port,
+        )
+
+    def runDaemon(self, full=False):
+        """
+        Stay resident: full resync every DAEMON_RESYNC_MINUTES and, in
+        between, re-evaluate single movies when their next warning or
+        removal boundary (PrunePolicy.next_change) is reached.
+        """
+        if self.instances:
+            logging.error(
+                "--daemon supports one Radarr instance; remove the "
+                "[RADARR:<name>] sections or run without --daemon."
+            )
+            sys.exit(1)
+        self.startRun()
+        self.daemon = True
+        if self.sharding:
+            logging.warning(
+                "SHARDS / MAX_MOVIES_PER_RUN have no effect with --daemon."
+            )
+            self.sharding = False
+        if threading.current_thread() is threading.main_thread():
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(sig, lambda *_args: self.stopDaemon())
+        logging.info(
+            "PRUNE: Daemon mode, full resync every %d minutes.",
+            self.daemon_resync_minutes,
+        )
+        self._library = {}
+        self.startWebhook()
+        self.startMetricsServer()
+        nextResync = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                if time.monotonic() >= nextResync:
+                    nextResync = time.monotonic() \
+                        + self.daemon_resync_minutes * 60
+                    self.resync(full)
+                    full = False
+                else:
+                    self.processWebhookEvents()
+                    self.processDeadlines()
+            except RadarrApiError as e:
                 logging.error(
-                    "Failed to connect to the server. "
-                    "Wrong user/password?"
+                    "Radarr API error in daemon pass: %s; full resync in "
+                    "%d seconds.",
+                    e,
+                    DAEMON_RETRY_SECONDS,
                 )
-            except smtplib.SMTPException as e:
-                logging.error(
-                    "SMTP error occurred: " + str(e))
-
-        rc = getattr(self, 'radarr_client', None)
-        if rc is not None:
-            rc.close()
+                nextResync = min(
+                    nextResync, time.monotonic() + DAEMON_RETRY_SECONDS
+                )
+            self._wake.wait(self._nextWakeup(nextResync))
+            self._wake.clear()
+        logging.info("PRUNE: Daemon stopping.")
+        self.reportUnreported()
+        if self._webhook is not None:
+            self._webhook.close()
+        if self._metrics_server is not None:
+            self._metrics_server.close()
+        self.finish()
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Radarr Prune')
+    parser.add_argument(
+        '--full',
+        action='store_true',
+        help='evaluate every movie, ignoring INCREMENTAL',
+    )
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='keep running and prune movies when they become due',
+    )
+    parser.add_argument(
+        '--trace',
+        action='store_true',
+        help='write a Chrome trace of the run (as TRACE = ON)',
+    )
+    args = parser.parse_args()
     rlp = RLP()
-    rlp.run()
+    if args.trace:
+        rlp.enableTracing()
+    if args.daemon:
+        rlp.runDaemon(full=args.full)
+    else:
+        rlp.run(full=args.full)
     rlp = None
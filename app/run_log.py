@@ -0,0 +1,103 @@
+"""Run log sink: one open, buffered file per run instead of one per line."""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import IO, Any
+
+BUFFER_SIZE = 1 << 16
+
+
+class RunLog:
+    """
+    Text run log (``<timestamp> - <message>`` lines) plus an optional
+    JSON-lines file with one record per evaluated movie.
+
+    Both files stay open between ``start()`` and ``close()``; lines are
+    buffered and only hit the disk on ``flush()`` (called at phase
+    boundaries), when the buffer fills up, or on ``close()``. Writes are
+    serialised with a lock so several threads can share one sink.
+    """
+
+    def __init__(self, path: str, jsonl_path: str | None = None) -> None:
+        self.path = path
+        self.jsonl_path = jsonl_path
+        self._text: IO[str] | None = None
+        self._jsonl: IO[str] | None = None
+        # Set after a failed open so a broken volume is reported once,
+        # not once per line.
+        self._failed = False
+        self._lock = threading.Lock()
+
+    def _open(self, path: str, mode: str) -> IO[str] | None:
+        try:
+            return open(path, mode, buffering=BUFFER_SIZE, encoding='utf-8')
+        except OSError:
+            logging.error(
+                f"Unable to write log file {path}. "
+                "Check file permissions and available disk space."
+            )
+            self._failed = True
+            return None
+
+    def start(self) -> None:
+        """Truncate the log file(s) for a new run."""
+        with self._lock:
+            self._close()
+            self._failed = False
+            self._text = self._open(self.path, 'w')
+            if self.jsonl_path:
+                self._jsonl = self._open(self.jsonl_path, 'w')
+
+    def _write(self, f: IO[str] | None, line: str) -> None:
+        try:
+            if f is not None:
+                f.write(line)
+        except OSError as e:
+            if not self._failed:
+                logging.error("Unable to write log file %s: %s", f.name, e)
+            self._failed = True
+
+    def write(self, msg: str) -> None:
+        with self._lock:
+            if self._text is None and not self._failed:
+                # Lines before the first start() append to the last log.
+                self._text = self._open(self.path, 'a')
+            self._write(self._text, f"{datetime.now()} - {msg}\n")
+
+    def record(self, **fields: Any) -> None:
+        """Append one JSON object to the JSON-lines log, if enabled."""
+        if not self.jsonl_path:
+            return
+        line = json.dumps(
+            {'ts': datetime.now().isoformat(), **fields}, default=str
+        )
+        with self._lock:
+            if self._jsonl is None and not self._failed:
+                self._jsonl = self._open(self.jsonl_path, 'a')
+            self._write(self._jsonl, line + '\n')
+
+    def flush(self) -> None:
+        with self._lock:
+            for f in (self._text, self._jsonl):
+                try:
+                    if f is not None:
+                        f.flush()
+                except OSError as e:
+                    logging.error("Unable to write log file %s: %s", f.name, e)
+
+    def _close(self) -> None:
+        for f in (self._text, self._jsonl):
+            try:
+                if f is not None:
+                    f.close()
+            except OSError as e:
+                logging.error("Unable to write log file %s: %s", f.name, e)
+        self._text = self._jsonl = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
@@ -0,0 +1,138 @@
+"""Deterministic library shards with a resumable cursor (cron slots)."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, NamedTuple, Sequence
+
+try:
+    from app.movie_scan import root_folder_for
+except ModuleNotFoundError:
+    from movie_scan import root_folder_for
+
+SHARD_BY = ('ID', 'ROOT_FOLDER')
+
+# Cursor position of a movie: the library is walked in sortTitle order.
+ShardKey = tuple[str, int]
+
+
+def shard_key(movie: Any) -> ShardKey:
+    return (movie.sortTitle or '', movie.id)
+
+
+def id_shard(movie_id: int, shards: int) -> int:
+    """Stable across runs and interpreters, unlike hash()."""
+    digest = hashlib.blake2b(str(movie_id).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % shards
+
+
+class Sharder:
+    """
+    Assigns movies to ``shards`` shards, by a hash of the movie id or by
+    Radarr root folder. Root folders are numbered in path order and
+    wrapped onto the shards; movies outside every root go to shard 0.
+    """
+
+    def __init__(
+        self, shards: int, by: str = 'ID', roots: Sequence[str] = ()
+    ) -> None:
+        if by not in SHARD_BY:
+            raise ValueError(
+                f"SHARD_BY must be ID or ROOT_FOLDER, not {by!r}"
+            )
+        self.shards = max(1, shards)
+        self.by = by
+        self.roots = sorted(roots)
+        self._root_index = {root: i for i, root in enumerate(self.roots)}
+
+    def shard_of(self, movie: Any) -> int:
+        if self.shards == 1:
+            return 0
+        if self.by == 'ID':
+            return id_shard(movie.id, self.shards)
+        root = root_folder_for(movie.path, self.roots)
+        index = self._root_index.get(root)
+        return 0 if index is None else index % self.shards
+
+
+class ShardState(NamedTuple):
+    """Shard to work on and the last movie done in it (None: from start)."""
+
+    by: str
+    shards: int
+    shard: int = 0
+    cursor: ShardKey | None = None
+
+    def dump(self) -> str:
+        return json.dumps(self._asdict())
+
+    @classmethod
+    def load(cls, text: str | None, by: str, shards: int) -> ShardState:
+        """The saved state; starts over when the layout has changed."""
+        try:
+            saved = json.loads(text) if text else {}
+            if saved.get('by') == by and saved.get('shards') == shards:
+                cursor = saved.get('cursor')
+                return cls(
+                    by,
+                    shards,
+                    int(saved['shard']) % shards,
+                    None if cursor is None else (str(cursor[0]),
+                                                 int(cursor[1])),
+                )
+        except (ValueError, TypeError, KeyError, IndexError):
+            pass
+        return cls(by, shards)
+
+    def at(self, cursor: ShardKey) -> ShardState:
+        return self._replace(cursor=cursor)
+
+    def next(self) -> ShardState:
+        return self._replace(shard=(self.shard + 1) % self.shards,
+                             cursor=None)
+
+
+class ShardPlan(NamedTuple):
+    state: ShardState
+    # Shard members after the cursor, capped at max_movies.
+    window: list[Any]
+    # Shard members after the cursor, uncapped.
+    remaining: int
+
+    @property
+    def finished(self) -> bool:
+        """Whether the window reaches the end of the shard."""
+        return len(self.window) == self.remaining
+
+    def done(self) -> ShardState:
+        """State to save once the whole window was handled."""
+        if self.finished:
+            return self.state.next()
+        return self.state.at(shard_key(self.window[-1]))
+
+
+def plan_shard(
+    movies: Sequence[Any],
+    sharder: Sharder,
+    state: ShardState,
+    max_movies: int = 0,
+) -> ShardPlan:
+    """
+    The movies to evaluate this run: the rest of the current shard after
+    the cursor, at most ``max_movies`` (0 = no cap). Empty shards are
+    skipped, so a run only comes back empty for an empty library.
+    """
+    by_shard: dict[int, list[Any]] = {}
+    for movie in movies:
+        by_shard.setdefault(sharder.shard_of(movie), []).append(movie)
+    # shards + 1: a finished shard may be the only one with movies.
+    for _ in range(state.shards + 1):
+        members = sorted(by_shard.get(state.shard, ()), key=shard_key)
+        if state.cursor is not None:
+            members = [m for m in members if shard_key(m) > state.cursor]
+        if members:
+            window = members[:max_movies] if max_movies > 0 else members
+            return ShardPlan(state, window, len(members))
+        state = state.next()
+    return ShardPlan(state, [], 0)
@@ -0,0 +1,152 @@
+"""Local SQLite state for radarr_prune (first-seen times, decision index)."""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Iterable
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS first_seen (
+    movie_id   INTEGER PRIMARY KEY,
+    path       TEXT    NOT NULL,
+    first_seen REAL    NOT NULL
+);
+CREATE TABLE IF NOT EXISTS decision_index (
+    movie_id    INTEGER PRIMARY KEY,
+    fingerprint INTEGER NOT NULL,
+    next_due    INTEGER
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class StateStore:
+    """
+    Single-file state database, normally next to the INI.
+
+    First-seen timestamps are keyed by Radarr movie id and only trusted
+    while the movie path matches: Radarr may hand out the id of a deleted
+    movie again, and a new movie must not inherit the old download date.
+
+    The decision index holds, per movie, a fingerprint of the inputs of its
+    last prune decision and the naive wall-clock time in microseconds (see
+    radarr_prune_logic.wall_clock_us) at which that decision can change;
+    NULL means never.
+
+    The meta table keeps small run state such as the shard cursor.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+
+    def open(self) -> StateStore:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path)
+            self._conn.executescript(_SCHEMA)
+        return self
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> StateStore:
+        return self.open()
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            raise RuntimeError('StateStore is not open')
+        return self._conn
+
+    def commit(self) -> None:
+        self.conn.commit()
+
+    def load_first_seen(self) -> dict[int, tuple[str, float]]:
+        """All first-seen entries as {movie_id: (path, epoch seconds)}."""
+        rows = self.conn.execute(
+            'SELECT movie_id, path, first_seen FROM first_seen'
+        )
+        return {movie_id: (path, ts) for movie_id, path, ts in rows}
+
+    def set_first_seen(
+        self, movie_id: int, path: str, first_seen: float
+    ) -> None:
+        self.conn.execute(
+            'INSERT INTO first_seen (movie_id, path, first_seen) '
+            'VALUES (?, ?, ?) ON CONFLICT(movie_id) DO UPDATE SET '
+            'path = excluded.path, first_seen = excluded.first_seen',
+            (movie_id, path, first_seen),
+        )
+
+    def forget(self, movie_id: int) -> None:
+        self.conn.execute(
+            'DELETE FROM first_seen WHERE movie_id = ?', (movie_id,)
+        )
+        self.forget_decision(movie_id)
+
+    def load_decisions(self) -> dict[int, tuple[int, int | None]]:
+        """All index entries as {movie_id: (fingerprint, next_due)}."""
+        rows = self.conn.execute(
+            'SELECT movie_id, fingerprint, next_due FROM decision_index'
+        )
+        return {movie_id: (fp, due) for movie_id, fp, due in rows}
+
+    def set_decision(
+        self, movie_id: int, fingerprint: int, next_due: int | None
+    ) -> None:
+        self.conn.execute(
+            'INSERT INTO decision_index (movie_id, fingerprint, next_due) '
+            'VALUES (?, ?, ?) ON CONFLICT(movie_id) DO UPDATE SET '
+            'fingerprint = excluded.fingerprint, '
+            'next_due = excluded.next_due',
+            (movie_id, fingerprint, next_due),
+        )
+
+    def forget_decision(self, movie_id: int) -> None:
+        self.conn.execute(
+            'DELETE FROM decision_index WHERE movie_id = ?', (movie_id,)
+        )
+
+    def get_meta(self, key: str) -> str | None:
+        row = self.conn.execute(
+            'SELECT value FROM meta WHERE key = ?', (key,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def set_meta(self, key: str, value: str) -> None:
+        self.conn.execute(
+            'INSERT INTO meta (key, value) VALUES (?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET value = excluded.value',
+            (key, value),
+        )
+
+    def retain(self, movie_ids: Iterable[int]) -> int:
+        """Drop entries for movies no longer in Radarr; return the count."""
+        conn = self.conn
+        conn.execute(
+            'CREATE TEMP TABLE IF NOT EXISTS live_ids '
+            '(movie_id INTEGER PRIMARY KEY)'
+        )
+        conn.execute('DELETE FROM live_ids')
+        conn.executemany(
+            'INSERT OR IGNORE INTO live_ids VALUES (?)',
+            ((i,) for i in movie_ids),
+        )
+        cur = conn.execute(
+            'DELETE FROM first_seen '
+            'WHERE movie_id NOT IN (SELECT movie_id FROM live_ids)'
+        )
+        conn.execute(
+            'DELETE FROM decision_index '
+            'WHERE movie_id NOT IN (SELECT movie_id FROM live_ids)'
+        )
+        return cur.rowcount
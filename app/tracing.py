@@ -0,0 +1,153 @@
+"""Lightweight span tracer with Chrome trace (about://tracing) export."""
+
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager, NamedTuple, TypeVar
+
+# Returned by a disabled tracer: entering it costs next to nothing.
+_NO_SPAN = nullcontext()
+# Per-movie spans of a long-running daemon must not grow without bound.
+MAX_SPANS = 500_000
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+
+class Span(NamedTuple):
+    name: str
+    cat: str
+    start_ns: int
+    dur_ns: int
+    tid: int
+    args: dict[str, Any]
+
+
+class _ActiveSpan:
+    __slots__ = ('tracer', 'name', 'cat', 'args', 'start')
+
+    def __init__(
+        self, tracer: Tracer, name: str, cat: str, args: dict[str, Any]
+    ) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self) -> _ActiveSpan:
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        end = time.perf_counter_ns()
+        self.tracer._add(Span(
+            self.name, self.cat, self.start, end - self.start,
+            threading.get_ident(), self.args,
+        ))
+
+
+class Tracer:
+    """
+    Collects timed spans from any thread.
+
+    ``span()`` wraps a run phase, ``detail()`` a per-movie sub-step; the
+    latter only records when ``details`` is set. A disabled tracer hands
+    out one shared no-op context manager, unless an ``observer`` wants the
+    finished phase spans (metrics); those are then timed but not kept.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        details: bool = True,
+        max_spans: int = MAX_SPANS,
+    ) -> None:
+        self.enabled = enabled
+        self.details = enabled and details
+        self.max_spans = max_spans
+        self.spans: list[Span] = []
+        self.dropped = 0
+        self.observer: Callable[[Span], None] | None = None
+        self._threads: dict[int, str] = {}
+        self._origin = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    def span(self, name: str, cat: str = 'run', **args: Any) -> ContextManager:
+        if not self.enabled and self.observer is None:
+            return _NO_SPAN
+        return _ActiveSpan(self, name, cat, args)
+
+    def detail(self, name: str, cat: str, **args: Any) -> ContextManager:
+        if not self.details:
+            return _NO_SPAN
+        return _ActiveSpan(self, name, cat, args)
+
+    def _add(self, span: Span) -> None:
+        if self.observer is not None:
+            self.observer(span)
+        if not self.enabled:
+            return
+        with self._lock:
+            if len(self.spans) >= self.max_spans:
+                if not self.dropped:
+                    logging.warning(
+                        "Trace buffer full (%d spans); dropping the rest.",
+                        self.max_spans,
+                    )
+                self.dropped += 1
+                return
+            self.spans.append(span)
+            if span.tid not in self._threads:
+                self._threads[span.tid] = threading.current_thread().name
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """The spans as a Chrome trace event document."""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+            threads = dict(self._threads)
+        events: list[dict[str, Any]] = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+             'args': {'name': name}}
+            for tid, name in threads.items()
+        ]
+        for s in spans:
+            events.append({
+                'name': s.name,
+                'cat': s.cat,
+                'ph': 'X',
+                'ts': (s.start_ns - self._origin) / 1000,
+                'dur': s.dur_ns / 1000,
+                'pid': pid,
+                'tid': s.tid,
+                'args': s.args,
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write(self, path: str) -> None:
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.chrome_trace(), f, default=str)
+        except OSError as e:
+            logging.error("Unable to write trace file %s: %s", path, e)
+
+    def slowest(self, cat: str, n: int = 10) -> list[Span]:
+        with self._lock:
+            spans = [s for s in self.spans if s.cat == cat]
+        return sorted(spans, key=lambda s: s.dur_ns, reverse=True)[:n]
+
+
+def traced(name: str, cat: str = 'run') -> Callable[[F], F]:
+    """Method decorator: run the method in ``self.tracer.span(name)``."""
+    def decorate(method: F) -> F:
+        @functools.wraps(method)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            with self.tracer.span(name, cat):
+                return method(self, *args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorate
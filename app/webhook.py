@@ -0,0 +1,154 @@
+"""Receiver for Radarr Connect webhook events (Settings > Connect > Webhook)."""
+
+from __future__ import annotations
+
+import base64
+import hmac
+import ipaddress
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, NamedTuple
+from urllib.parse import parse_qs, urlsplit
+
+# Radarr payloads are a few KiB; anything much larger is not Radarr.
+MAX_BODY_BYTES = 1 << 20
+
+
+class WebhookEvent(NamedTuple):
+    """The parts of a Radarr webhook payload the prune run acts on."""
+
+    event_type: str
+    movie_id: int | None
+    title: str
+    path: str
+    delete_reason: str
+
+
+def parse_event(payload: Any) -> WebhookEvent | None:
+    """WebhookEvent for a Radarr payload; None if it is not one."""
+    if not isinstance(payload, dict):
+        return None
+    event_type = payload.get('eventType')
+    if not isinstance(event_type, str):
+        return None
+    movie = payload.get('movie')
+    if not isinstance(movie, dict):
+        movie = {}
+    movie_id = movie.get('id')
+    return WebhookEvent(
+        event_type,
+        movie_id if isinstance(movie_id, int) else None,
+        str(movie.get('title') or ''),
+        str(movie.get('folderPath') or ''),
+        str(payload.get('deleteReason') or ''),
+    )
+
+
+def is_loopback(host: str) -> bool:
+    """Whether a listener on ``host`` only accepts local connections."""
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class WebhookServer:
+    """
+    Small HTTP listener that hands Radarr webhook events to ``on_event``.
+
+    Requests must be POSTs to ``path``. With a token, the request has to
+    carry it as ``?token=...`` or as the basic-auth password (Radarr's
+    webhook username/password fields). ``on_event`` runs on the server
+    thread and should only queue the event.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        on_event: Callable[[WebhookEvent], None],
+        *,
+        token: str = '',
+        path: str = '/radarr',
+    ) -> None:
+        self.on_event = on_event
+        self.token = token
+        self.path = path
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]
+
+    def start(self) -> WebhookServer:
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name='webhook', daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def authorized(self, query: str, authorization: str | None) -> bool:
+        if not self.token:
+            return True
+        supplied = parse_qs(query).get('token', [''])[0]
+        if not supplied and authorization and \
+                authorization.lower().startswith('basic '):
+            try:
+                decoded = base64.b64decode(authorization[6:]).decode()
+            except (ValueError, UnicodeDecodeError):
+                return False
+            supplied = decoded.partition(':')[2]
+        return hmac.compare_digest(supplied.encode(), self.token.encode())
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status: int) -> None:
+                self.send_response(status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def do_POST(self) -> None:
+                url = urlsplit(self.path)
+                if url.path.rstrip('/') != server.path.rstrip('/'):
+                    return self._reply(404)
+                if not server.authorized(
+                    url.query, self.headers.get('Authorization')
+                ):
+                    return self._reply(401)
+                try:
+                    length = int(self.headers.get('Content-Length', '0'))
+                except ValueError:
+                    return self._reply(400)
+                if length < 0:
+                    # rfile.read(-1) would block until the client closes.
+                    return self._reply(400)
+                if length > MAX_BODY_BYTES:
+                    return self._reply(413)
+                try:
+                    event = parse_event(json.loads(self.rfile.read(length)))
+                except ValueError:
+                    event = None
+                if event is None:
+                    return self._reply(400)
+                server.on_event(event)
+                self._reply(202)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logging.debug('Webhook %s - %s', self.address_string(),
+                              format % args)
+
+        return Handler
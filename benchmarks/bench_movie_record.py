@@ -0,0 +1,114 @@
+"""
+Memory benchmark: retained bytes per MovieRecord.
+
+Compares the current slotted MovieRecord with the previous plain
+dataclass (per-instance __dict__, fresh lists for genres and tag ids).
+Each movie is decoded from its own JSON document and the raw dict is
+dropped right away, as in a streamed run, so the numbers show what the
+records keep alive.
+
+    python benchmarks/bench_movie_record.py [--count 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable
+
+_repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _repo_root not in sys.path:
+    sys.path.insert(0, _repo_root)
+
+from app.radarr_client import MovieRecord  # noqa: E402
+
+GENRES = [
+    'Action', 'Adventure', 'Animation', 'Comedy', 'Crime', 'Documentary',
+    'Drama', 'Family', 'Fantasy', 'History', 'Horror', 'Music', 'Mystery',
+    'Romance', 'Science Fiction', 'Thriller', 'War', 'Western',
+]
+
+
+@dataclass
+class LegacyMovieRecord:
+    """MovieRecord as it was before it became slotted and immutable."""
+
+    id: int
+    title: str
+    year: int
+    path: str
+    genres: list[str]
+    tagsIds: list[int]
+    sortTitle: str
+
+    @classmethod
+    def from_api(cls, row: dict[str, Any]) -> LegacyMovieRecord:
+        tags = row.get('tags')
+        tag_ids = [int(t) for t in tags if t is not None] if tags else []
+        title = row.get('title') or ''
+        return cls(
+            id=int(row['id']),
+            title=title,
+            year=int(row.get('year') or 0),
+            path=str(row.get('path') or ''),
+            genres=[str(g) for g in row.get('genres') or []],
+            tagsIds=tag_ids,
+            sortTitle=str(row.get('sortTitle') or title),
+        )
+
+
+def synthetic_rows(count: int, seed: int = 1) -> list[str]:
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(1, count + 1):
+        title = f"Synthetic Movie {i}"
+        rows.append(json.dumps({
+            'id': i,
+            'title': title,
+            'sortTitle': title.lower(),
+            'year': rnd.randint(1950, 2025),
+            'path': f"/movies/{title} ({i})",
+            'genres': rnd.sample(GENRES, rnd.randint(1, 3)),
+            'tags': rnd.sample(range(1, 8), rnd.randint(0, 2)),
+        }))
+    return rows
+
+
+def retained_bytes(factory: Callable[[dict], Any], rows: list[str]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    records = [factory(json.loads(r)) for r in rows]
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del records
+    return used
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--count', type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    rows = synthetic_rows(args.count)
+    before = retained_bytes(LegacyMovieRecord.from_api, rows)
+    after = retained_bytes(MovieRecord.from_api, rows)
+    print(json.dumps({
+        'benchmark': 'movie_record_memory',
+        'records': args.count,
+        'legacy_bytes_per_record': round(before / args.count, 1),
+        'slotted_bytes_per_record': round(after / args.count, 1),
+        'reduction_pct': round(100 * (before - after) / before, 1),
+    }))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,293 @@
+"""
+Phase timings for a prune run on synthetic libraries.
+
+For every size a temporary movie tree (video files, extras, .firstseen
+markers) and a matching /api/v3/movie payload are generated; Radarr is
+served by httpx.MockTransport. Phases:
+
+    api_fetch            RadarrClient.iter_movie_records() over the mock API
+    from_api             MovieRecord.from_api() on decoded rows
+    scan                 folder probes as in evalMovie (cold, fills cache)
+    scan_cached          the same probes answered by the scan cache
+    decide               PrunePolicy.decide() per movie (as evalMovie)
+    decide_prune_action  the dict-based decide_prune_action() per movie
+    log_write            RunLog text line per movie
+    log_write_jsonl      the same plus a JSON-lines record per movie
+    log_write_legacy     open/append/close per line (pre-RunLog)
+    run                  RLP.run() end to end, dry run, cold state
+
+One JSON object per size goes to stdout (and is appended to --output);
+--compare prints the change per phase against an earlier results file.
+
+    python benchmarks/bench_prune_run.py [--sizes 1000,10000,100000]
+        [--output bench.jsonl] [--compare bench.jsonl] [--no-run]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable
+
+_repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _repo_root not in sys.path:
+    sys.path.insert(0, _repo_root)
+
+from app.movie_scan import MovieScanner, ScanCache, scan_folders  # noqa: E402
+from app.radarr_client import MovieRecord, RadarrClient  # noqa: E402
+from app.radarr_prune_logic import (  # noqa: E402
+    PrunePolicy,
+    decide_prune_action,
+)
+from app.run_log import RunLog  # noqa: E402
+
+from benchmarks import synthetic_library as synth  # noqa: E402
+
+VIDEO_EXTENSIONS = ('.mkv', '.mp4', '.avi')
+FROM_API_BATCH = 1000
+POLICY = {
+    'tags_keep_ids': [1],
+    'unwanted_genres': ['Horror'],
+    'remove_after_days': 30,
+    'warn_days_infront': 1,
+    'tags_no_exclusion_ids': [4],
+    'months_no_exclusion': [12],
+}
+INI = """\
+[RADARR]
+ENABLED = ON
+URL = http://radarr:7878
+TOKEN = bench
+TAGS_KEEP_MOVIES_ANYWAY = keep
+MAX_REQUESTS_PER_SECOND = 0
+
+[PRUNE]
+ENABLED = ON
+DRY_RUN = ON
+PERMANENT_DELETE_MEDIA = OFF
+AUTO_NO_EXCLUSION_TAGS = no-exclusion
+AUTO_NO_EXCLUSION_MONTHS = 12
+REMOVE_MOVIES_AFTER_DAYS = 30
+WARN_DAYS_INFRONT = 1
+ONLY_SHOW_REMOVE_MESSAGES = OFF
+VERBOSE_LOGGING = OFF
+VIDEO_EXTENSIONS_MONITORED = .mkv,.mp4,.avi
+MAIL_ENABLED = OFF
+MAIL_PORT = 587
+MAIL_SERVER = localhost
+MAIL_LOGIN = bench
+MAIL_PASSWORD =
+MAIL_SENDER = bench@localhost
+MAIL_RECEIVER = bench@localhost
+UNWANTED_GENRES = Horror
+
+[PUSHOVER]
+ENABLED = OFF
+USER_KEY =
+TOKEN_API =
+SOUND = pushover
+"""
+
+
+def timed(fn: Callable[[], Any]) -> tuple[float, Any]:
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=_repo_root, capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def bench_from_api(movies: list[synth.Movie]) -> float:
+    # Decode in batches so 100k full Radarr dicts never coexist.
+    total = 0.0
+    for start in range(0, len(movies), FROM_API_BATCH):
+        rows = list(synth.movie_rows(movies[start:start + FROM_API_BATCH]))
+        seconds, _records = timed(
+            lambda rows=rows: [MovieRecord.from_api(r) for r in rows]
+        )
+        total += seconds
+    return total
+
+
+def bench_run(
+    movies: list[synth.Movie], root: str, body: bytes, workdir: str
+) -> float:
+    from app.radarrdv_prune import RLP
+
+    config_dir = os.path.join(workdir, 'config')
+    os.makedirs(config_dir, exist_ok=True)
+    with open(os.path.join(config_dir, 'radarrdv_prune.ini'), 'w') as f:
+        f.write(INI)
+    os.environ['RADARR_PRUNE_CONFIG_DIR'] = config_dir
+    os.environ['RADARR_PRUNE_LOG_DIR'] = workdir
+    transport = synth.radarr_transport(movies, root, body)
+
+    class BenchRLP(RLP):
+        def clientOptions(self):
+            return {**super().clientOptions(), 'transport': transport}
+
+    rlp = BenchRLP()
+    logging.getLogger().setLevel(logging.WARNING)
+    seconds, _ = timed(rlp.run)
+    return seconds
+
+
+def bench_size(count: int, run: bool = True) -> dict[str, Any]:
+    phases: dict[str, float] = {}
+    with tempfile.TemporaryDirectory(prefix='radarr-bench-') as workdir:
+        root = os.path.join(workdir, 'movies')
+        movies = synth.library(count, root)
+        phases['setup_tree'], _ = timed(lambda: synth.build_tree(movies))
+        body = synth.movie_list_body(movies)
+
+        client = RadarrClient(
+            'http://radarr:7878', 'bench',
+            transport=synth.radarr_transport(movies, root, body),
+        )
+        with client:
+            phases['api_fetch'], records = timed(
+                lambda: list(client.iter_movie_records())
+            )
+        phases['from_api'] = bench_from_api(movies)
+
+        cache = ScanCache(os.path.join(workdir, 'scancache.json'))
+        scanner = MovieScanner(VIDEO_EXTENSIONS, synth.MARKER, cache)
+        jobs = [(r.id, r.path) for r in records]
+        phases['scan'], scans = timed(lambda: scan_folders(
+            jobs, lambda _id, path: scanner.probe(path), [root]
+        ))
+        phases['scan_cached'], _ = timed(lambda: scan_folders(
+            jobs, lambda _id, path: scanner.probe(path), [root]
+        ))
+
+        dates = {
+            r.id: datetime.fromtimestamp(scans[r.id].first_seen)
+            if scans[r.id].has_video else None
+            for r in records
+        }
+        now = datetime.now()
+        policy = PrunePolicy.from_config(POLICY)
+        phases['decide'], results = timed(lambda: [
+            policy.decide(
+                policy.tag_mask(r.tagsIds), r.genres, dates[r.id], now
+            )
+            for r in records
+        ])
+        phases['decide_prune_action'], _ = timed(lambda: [
+            decide_prune_action(
+                {'tagsIds': r.tagsIds, 'genres': r.genres,
+                 'download_date': dates[r.id]},
+                POLICY,
+                now,
+            )
+            for r in records
+        ])
+
+        log_path = os.path.join(workdir, 'bench.log')
+
+        def write_log(jsonl=False):
+            log = RunLog(log_path, log_path + '.jsonl' if jsonl else None)
+            log.start()
+            for r, result in zip(records, results):
+                log.write(f"PRUNE: {result.reason} - {r.title} ({r.year})")
+                log.record(id=r.id, reason=result.reason,
+                           download_date=dates[r.id], action='kept')
+            log.close()
+
+        def write_log_legacy():
+            for r, result in zip(records, results):
+                with open(log_path, 'a') as f:
+                    f.write(f"{datetime.now()} - PRUNE: {result.reason} - "
+                            f"{r.title} ({r.year})\n")
+
+        phases['log_write'], _ = timed(write_log)
+        phases['log_write_jsonl'], _ = timed(lambda: write_log(True))
+        phases['log_write_legacy'], _ = timed(write_log_legacy)
+
+        if run:
+            phases['run'] = bench_run(movies, root, body, workdir)
+
+    return {
+        'benchmark': 'prune_run',
+        'movies': count,
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'payload_bytes': len(body),
+        'phases': {k: round(v, 6) for k, v in phases.items()},
+    }
+
+
+def load_results(path: str) -> dict[int, dict[str, Any]]:
+    """Last prune_run result per library size in a JSON-lines file."""
+    results: dict[int, dict[str, Any]] = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            result = json.loads(line)
+            if result.get('benchmark') == 'prune_run':
+                results[result['movies']] = result
+    return results
+
+
+def compare(base: dict[str, Any], result: dict[str, Any]) -> list[str]:
+    lines = [
+        f"{result['movies']} movies: {base.get('commit')} -> "
+        f"{result.get('commit')}"
+    ]
+    for phase, seconds in result['phases'].items():
+        before = base['phases'].get(phase)
+        if not before:
+            continue
+        change = 100 * (seconds - before) / before
+        lines.append(
+            f"  {phase:20} {before:10.4f}s -> {seconds:10.4f}s "
+            f"({change:+.1f}%)"
+        )
+    return lines
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', default='1000,10000,100000')
+    parser.add_argument('--output', help='append results to this file')
+    parser.add_argument('--compare', help='earlier results to compare to')
+    parser.add_argument(
+        '--no-run', action='store_true', help='skip the RLP.run() phase'
+    )
+    args = parser.parse_args(argv)
+
+    baseline = load_results(args.compare) if args.compare else {}
+    for count in (int(s) for s in args.sizes.split(',')):
+        result = bench_size(count, run=not args.no_run)
+        line = json.dumps(result)
+        print(line, flush=True)
+        if args.output:
+            with open(args.output, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+        if count in baseline:
+            print('\n'.join(compare(baseline[count], result)),
+                  file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
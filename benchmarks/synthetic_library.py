@@ -0,0 +1,208 @@
+"""
+Synthetic Radarr library for benchmarks.
+
+movie_rows() yields /api/v3/movie objects shaped like Radarr v5 output
+(images, ratings, movieFile with mediaInfo, ...); build_tree() lays the
+matching movie folders out on disk with video files, extras and
+.firstseen markers of varying age. Both are deterministic for a seed.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import time
+from typing import Any, Iterator
+
+import httpx
+
+GENRES = [
+    'Action', 'Adventure', 'Animation', 'Comedy', 'Crime', 'Documentary',
+    'Drama', 'Family', 'Fantasy', 'History', 'Horror', 'Music', 'Mystery',
+    'Romance', 'Science Fiction', 'Thriller', 'War', 'Western',
+]
+TAGS = [
+    {'id': 1, 'label': 'keep'},
+    {'id': 2, 'label': 'kids'},
+    {'id': 3, 'label': '4k'},
+    {'id': 4, 'label': 'no-exclusion'},
+]
+EXTRAS = ('movie.nfo', 'poster.jpg', 'fanart.jpg', 'movie.en.srt')
+MARKER = '.firstseen'
+LOREM = (
+    "A retired operative is pulled back for one last job when an old "
+    "friend disappears, and the trail leads through three continents, a "
+    "crumbling family estate and a conspiracy older than either of them. "
+)
+
+
+class Movie:
+    """What the generator decided for one movie (drives JSON and disk)."""
+
+    __slots__ = ('id', 'title', 'year', 'folder', 'has_video', 'on_disk',
+                 'age_days', 'genres', 'tags')
+
+    def __init__(self, rnd: random.Random, movie_id: int, root: str) -> None:
+        self.id = movie_id
+        self.year = rnd.randint(1950, 2025)
+        self.title = f"Synthetic Movie {movie_id}"
+        self.folder = os.path.join(
+            root, f"{self.title} ({self.year})"
+        )
+        # ~5% never downloaded, ~5% folder without a video file.
+        self.on_disk = rnd.random() >= 0.05
+        self.has_video = self.on_disk and rnd.random() >= 0.05
+        # None: first seen during the benchmark (no marker yet).
+        self.age_days = rnd.uniform(0, 60) if rnd.random() < 0.7 else None
+        self.genres = rnd.sample(GENRES, rnd.randint(1, 3))
+        self.tags = rnd.sample([t['id'] for t in TAGS], rnd.randint(0, 2))
+
+
+def library(count: int, root: str, seed: int = 1) -> list[Movie]:
+    rnd = random.Random(seed)
+    return [Movie(rnd, i, root) for i in range(1, count + 1)]
+
+
+def movie_row(movie: Movie) -> dict[str, Any]:
+    """One /api/v3/movie element for ``movie``."""
+    slug = movie.title.lower().replace(' ', '-')
+    row: dict[str, Any] = {
+        'id': movie.id,
+        'title': movie.title,
+        'originalTitle': movie.title,
+        'originalLanguage': {'id': 1, 'name': 'English'},
+        'sortTitle': movie.title.lower(),
+        'sizeOnDisk': 8_589_934_592 if movie.has_video else 0,
+        'status': 'released',
+        'overview': LOREM,
+        'inCinemas': f"{movie.year}-03-14T00:00:00Z",
+        'physicalRelease': f"{movie.year}-07-01T00:00:00Z",
+        'digitalRelease': f"{movie.year}-06-01T00:00:00Z",
+        'images': [
+            {
+                'coverType': kind,
+                'url': f"/MediaCover/{movie.id}/{kind}.jpg?lastWrite=1",
+                'remoteUrl': f"https://image.tmdb.org/t/p/original/{slug}"
+                             f"-{kind}.jpg",
+            }
+            for kind in ('poster', 'fanart')
+        ],
+        'website': '',
+        'year': movie.year,
+        'youTubeTrailerId': 'dQw4w9WgXcQ',
+        'studio': 'Synthetic Pictures',
+        'path': movie.folder,
+        'qualityProfileId': 4,
+        'hasFile': movie.has_video,
+        'movieFileId': movie.id if movie.has_video else 0,
+        'monitored': True,
+        'minimumAvailability': 'released',
+        'isAvailable': True,
+        'folderName': movie.folder,
+        'runtime': 112,
+        'cleanTitle': slug.replace('-', ''),
+        'imdbId': f"tt{movie.id:07d}",
+        'tmdbId': 100000 + movie.id,
+        'titleSlug': f"{100000 + movie.id}",
+        'rootFolderPath': os.path.dirname(movie.folder),
+        'certification': 'PG-13',
+        'genres': movie.genres,
+        'tags': movie.tags,
+        'added': '2024-01-01T12:00:00Z',
+        'ratings': {
+            'imdb': {'votes': 12345, 'value': 6.8, 'type': 'user'},
+            'tmdb': {'votes': 2345, 'value': 7.1, 'type': 'user'},
+        },
+        'popularity': 12.5,
+        'statistics': {'movieFileCount': int(movie.has_video),
+                       'sizeOnDisk': 8_589_934_592 if movie.has_video else 0},
+    }
+    if movie.has_video:
+        row['movieFile'] = {
+            'id': movie.id,
+            'movieId': movie.id,
+            'relativePath': f"{movie.title} ({movie.year}).mkv",
+            'path': os.path.join(
+                movie.folder, f"{movie.title} ({movie.year}).mkv"
+            ),
+            'size': 8_589_934_592,
+            'dateAdded': '2024-01-02T08:30:00Z',
+            'quality': {
+                'quality': {'id': 7, 'name': 'Bluray-1080p',
+                            'source': 'bluray', 'resolution': 1080},
+                'revision': {'version': 1, 'real': 0, 'isRepack': False},
+            },
+            'mediaInfo': {
+                'audioBitrate': 1509000, 'audioChannels': 5.1,
+                'audioCodec': 'DTS', 'audioLanguages': 'eng',
+                'videoBitDepth': 8, 'videoBitrate': 9800000,
+                'videoCodec': 'x264', 'videoFps': 23.976,
+                'resolution': '1920x800', 'runTime': '1:52:04',
+                'subtitles': 'eng/dut',
+            },
+            'languages': [{'id': 1, 'name': 'English'}],
+        }
+    return row
+
+
+def movie_rows(movies: list[Movie]) -> Iterator[dict[str, Any]]:
+    for movie in movies:
+        yield movie_row(movie)
+
+
+def movie_list_body(movies: list[Movie]) -> bytes:
+    """The /api/v3/movie response, encoded without holding all dicts."""
+    parts = [b'[']
+    for i, row in enumerate(movie_rows(movies)):
+        if i:
+            parts.append(b',')
+        parts.append(json.dumps(row).encode())
+    parts.append(b']')
+    return b''.join(parts)
+
+
+def build_tree(movies: list[Movie], now: float | None = None) -> None:
+    """Create the movie folders, video files, extras and markers."""
+    now = time.time() if now is None else now
+    for movie in movies:
+        if not movie.on_disk:
+            continue
+        os.makedirs(movie.folder, exist_ok=True)
+        names = list(EXTRAS)
+        if movie.has_video:
+            names.append(f"{movie.title} ({movie.year}).mkv")
+        for name in names:
+            open(os.path.join(movie.folder, name), 'w').close()
+        if movie.age_days is not None:
+            marker = os.path.join(movie.folder, MARKER)
+            open(marker, 'w').close()
+            seen = now - movie.age_days * 86400
+            os.utime(marker, (seen, seen))
+
+
+def radarr_transport(
+    movies: list[Movie], root: str, body: bytes | None = None
+) -> httpx.MockTransport:
+    """A read-only Radarr API serving ``movies``; deletes succeed."""
+    body = movie_list_body(movies) if body is None else body
+    by_id = {movie.id: movie for movie in movies}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if request.method == 'DELETE':
+            return httpx.Response(200)
+        if path == '/api/v3/movie':
+            return httpx.Response(200, content=body)
+        if path.startswith('/api/v3/movie/'):
+            movie = by_id.get(int(path.rsplit('/', 1)[1]))
+            if movie is None:
+                return httpx.Response(404)
+            return httpx.Response(200, json=movie_row(movie))
+        if path == '/api/v3/tag':
+            return httpx.Response(200, json=TAGS)
+        if path == '/api/v3/rootfolder':
+            return httpx.Response(200, json=[{'id': 1, 'path': root}])
+        return httpx.Response(200, json={'version': '5.0.0'})
+
+    return httpx.MockTransport(handler)
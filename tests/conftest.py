@@ -0,0 +1,109 @@
+"""RLP against a temporary config directory and a mock Radarr."""
+
+import configparser
+import functools
+
+import httpx
+import pytest
+
+import app.radarr_client as rc
+import app.radarrdv_prune as rp
+
+BASE_CONFIG = {
+    'RADARR': {
+        'ENABLED': 'ON',
+        'URL': 'http://radarr:7878',
+        'TOKEN': 'key',
+        'TAGS_KEEP_MOVIES_ANYWAY': 'keep',
+        'MAX_REQUESTS_PER_SECOND': '0',
+        'MAX_RETRIES': '0',
+        'STREAM_MOVIE_LIST': 'OFF',
+    },
+    'PRUNE': {
+        'ENABLED': 'ON',
+        'DRY_RUN': 'OFF',
+        'AUTO_NO_EXCLUSION_TAGS': 'tag1',
+        'REMOVE_MOVIES_AFTER_DAYS': '30',
+        'WARN_DAYS_INFRONT': '1',
+        'VIDEO_EXTENSIONS_MONITORED': '.mkv',
+        'SCAN_WORKERS_PER_ROOT': '0',
+        'STATE_DB': 'ON',
+        'MAIL_ENABLED': 'OFF',
+        'MAIL_PORT': '587',
+        'MAIL_SERVER': 'mail.example',
+        'MAIL_LOGIN': '',
+        'MAIL_PASSWORD': '',
+        'MAIL_SENDER': '',
+        'MAIL_RECEIVER': '',
+        'UNWANTED_GENRES': 'Horror',
+    },
+    'PUSHOVER': {
+        'ENABLED': 'OFF',
+        'USER_KEY': '',
+        'TOKEN_API': '',
+        'SOUND': 'pushover',
+    },
+}
+
+
+def radarr_handler(movies=(), roots=('/movies',)):
+    """A Radarr serving ``movies``; DELETEs succeed."""
+    def handler(request):
+        path = request.url.path
+        if request.method == 'DELETE' or path == '/api/v3/system/status':
+            return httpx.Response(200, json={})
+        if path == '/api/v3/movie':
+            return httpx.Response(200, json=list(movies))
+        if path.startswith('/api/v3/movie/'):
+            movie_id = int(path.rsplit('/', 1)[1])
+            for movie in movies:
+                if movie['id'] == movie_id:
+                    return httpx.Response(200, json=movie)
+        if path == '/api/v3/tag':
+            return httpx.Response(200, json=[{'id': 1, 'label': 'keep'}])
+        if path == '/api/v3/rootfolder':
+            return httpx.Response(200, json=[{'path': r} for r in roots])
+        return httpx.Response(404)
+
+    return handler
+
+
+@pytest.fixture
+def make_rlp(tmp_path, monkeypatch):
+    """
+    make_rlp(handler, config) -> RLP. ``config`` maps sections to keys
+    overriding BASE_CONFIG; ``handler`` answers every Radarr request (a
+    callable or a {url: handler} dict for several instances).
+    """
+    config_dir = tmp_path / 'config'
+    config_dir.mkdir()
+    monkeypatch.setenv('RADARR_PRUNE_CONFIG_DIR', str(config_dir))
+    monkeypatch.setenv('RADARR_PRUNE_LOG_DIR', str(tmp_path))
+    created = []
+
+    def make(handler, config=None):
+        parser = configparser.ConfigParser()
+        parser.optionxform = str
+        parser.read_dict(BASE_CONFIG)
+        parser.read_dict(config or {})
+        with open(config_dir / 'radarrdv_prune.ini', 'w') as f:
+            parser.write(f)
+        handlers = handler if isinstance(handler, dict) else None
+
+        def route(request):
+            if handlers is None:
+                return handler(request)
+            base = f'{request.url.scheme}://{request.url.host}'
+            return handlers[base](request)
+
+        client = functools.partial(
+            rc.RadarrClient, transport=httpx.MockTransport(route)
+        )
+        monkeypatch.setattr(rc, 'RadarrClient', client)
+        rlp = rp.RLP()
+        created.append(rlp)
+        return rlp
+
+    yield make
+    for rlp in created:
+        rlp.run_log.close()
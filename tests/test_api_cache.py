@@ -0,0 +1,74 @@
+"""ResponseCache used by RadarrClient for tags and root folders."""
+
+import httpx
+
+from app.api_cache import ResponseCache
+from app.radarr_client import RadarrClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_client(handler, cache):
+    return RadarrClient(
+        'http://radarr:7878',
+        'key',
+        cache=cache,
+        transport=httpx.MockTransport(handler),
+    )
+
+
+def test_fresh_entries_skip_the_request(tmp_path):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(200, json=[{'id': 1, 'label': 'keep'}])
+
+    path = str(tmp_path / 'apicache.json')
+    with make_client(handler, ResponseCache(path, ttl=60)) as client:
+        assert client.get_tags() == [{'id': 1, 'label': 'keep'}]
+        assert not client.served_from_cache('/api/v3/tag')
+    # A new process reads the cache from disk.
+    with make_client(handler, ResponseCache(path, ttl=60)) as client:
+        assert client.get_tags() == [{'id': 1, 'label': 'keep'}]
+        assert client.served_from_cache('/api/v3/tag')
+        assert client.get_tags(refresh=True) == [{'id': 1, 'label': 'keep'}]
+        assert not client.served_from_cache('/api/v3/tag')
+    assert calls == ['/api/v3/tag', '/api/v3/tag']
+
+
+def test_stale_entries_are_revalidated(tmp_path):
+    clock = FakeClock()
+    seen = []
+
+    def handler(request):
+        seen.append(dict(request.headers))
+        if request.headers.get('If-None-Match') == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200, json=[{'path': '/movies'}], headers={'ETag': '"v1"'}
+        )
+
+    cache = ResponseCache(str(tmp_path / 'c.json'), ttl=60, clock=clock)
+    with make_client(handler, cache) as client:
+        assert client.get_root_folders() == [{'path': '/movies'}]
+        clock.now += 61
+        assert client.get_root_folders() == [{'path': '/movies'}]
+        # The 304 renewed the entry.
+        assert client.get_root_folders() == [{'path': '/movies'}]
+    assert len(seen) == 2
+    assert 'if-none-match' not in seen[0]
+    assert seen[1]['if-none-match'] == '"v1"'
+
+
+def test_unreadable_cache_is_ignored(tmp_path):
+    path = tmp_path / 'c.json'
+    path.write_text('{not json')
+    cache = ResponseCache(str(path), ttl=60)
+    assert cache.lookup('http://radarr:7878/api/v3/tag') == (None, {})
@@ -0,0 +1,140 @@
+"""Daemon loop and webhook events against a mock Radarr."""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+import app.radarrdv_prune as rp
+from app.webhook import parse_event
+from conftest import radarr_handler
+
+MOVIE = {
+    'id': 1,
+    'title': 'Movie 1',
+    'sortTitle': 'movie 1',
+    'year': 2001,
+    'path': '/movies/Movie 1',
+    'genres': [],
+    'tags': [1],
+    'hasFile': False,
+}
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.01)
+
+
+def test_daemon_survives_connection_errors(make_rlp, monkeypatch, caplog):
+    radarr = radarr_handler([MOVIE])
+    state = {'down': True}
+
+    def handler(request):
+        # The status check at startup passes, the library fetch fails.
+        if state['down'] and request.url.path != '/api/v3/system/status':
+            raise httpx.ConnectError('refused', request=request)
+        return radarr(request)
+
+    monkeypatch.setattr(rp, 'DAEMON_RETRY_SECONDS', 0.05)
+    rlp = make_rlp(handler, {'RADARR': {'CIRCUIT_BREAKER_THRESHOLD': '0'}})
+    reports = []
+    monkeypatch.setattr(rlp, 'report', lambda *a: reports.append(a))
+    daemon = threading.Thread(target=rlp.runDaemon)
+    daemon.start()
+    try:
+        wait_for(lambda: 'Radarr API error in daemon pass' in caplog.text)
+        assert daemon.is_alive()
+        state['down'] = False
+        wait_for(lambda: 1 in rlp._library)
+        assert daemon.is_alive()
+    finally:
+        rlp.stopDaemon()
+        daemon.join(10)
+    assert not daemon.is_alive()
+    # The movie is kept by its tag: nothing to report.
+    assert reports == []
+
+
+@pytest.mark.parametrize('in_library,markers,kept', [
+    (False, 'ON', True),
+    (True, 'OFF', True),
+    (True, 'ON', False),
+])
+def test_file_delete_event_only_removes_known_markers(
+    make_rlp, tmp_path, in_library, markers, kept
+):
+    folder = tmp_path / 'Movie 1'
+    folder.mkdir()
+    marker = folder / '.firstseen'
+    marker.touch()
+    rlp = make_rlp(
+        radarr_handler(), {'PRUNE': {'WRITE_FIRSTSEEN_MARKERS': markers}}
+    )
+    rlp._library = {}
+    if in_library:
+        rlp._library[1] = SimpleNamespace(id=1, path=str(folder))
+    event = parse_event({
+        'eventType': 'MovieFileDelete',
+        'deleteReason': 'manual',
+        'movie': {'id': 1, 'folderPath': str(folder)},
+    })
+    rlp.openStateStore()
+    rlp._resetFirstSeen(event)
+    rlp.closeStateStore(None)
+    assert marker.exists() == kept
+
+
+def test_deadline_passes_are_reported_with_the_resync(make_rlp, monkeypatch):
+    added = datetime.now(timezone.utc) - timedelta(days=29, hours=12)
+    movies = [
+        {
+            **MOVIE,
+            'id': i,
+            'title': f'Movie {i}',
+            'path': f'/movies/Movie {i}',
+            'hasFile': True,
+            'movieFile': {
+                'id': 10 + i,
+                'relativePath': f'm{i}.mkv',
+                'dateAdded': added.isoformat(),
+            },
+        }
+        for i in (1, 2)
+    ]
+    radarr = radarr_handler(movies)
+    fetched = []
+
+    def handler(request):
+        if request.url.path.startswith('/api/v3/movie/'):
+            fetched.append(request.url.path)
+        return radarr(request)
+
+    rlp = make_rlp(handler, {'PRUNE': {'DATE_SOURCE': 'API'}})
+    reports = []
+    monkeypatch.setattr(rlp, 'report', lambda *a: reports.append(a))
+    # Called at the end of a pass without anything to report.
+    resynced = threading.Event()
+    monkeypatch.setattr(rlp, 'writeMetrics', resynced.set)
+    daemon = threading.Thread(target=rlp.runDaemon)
+    daemon.start()
+    try:
+        # The resync keeps both movies by their tag.
+        assert resynced.wait(10)
+        for movie in movies:
+            movie['tags'] = []
+        # Two deadline passes, each warning about one movie.
+        for i in (1, 2):
+            rlp._scheduleDeadline(i, datetime.now())
+            rlp.wakeDaemon()
+            wait_for(lambda: len(fetched) == i)
+        assert reports == []
+    finally:
+        rlp.stopDaemon()
+        daemon.join(10)
+    assert reports == [(0, 2)]
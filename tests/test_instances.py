@@ -0,0 +1,101 @@
+"""Several [RADARR:<name>] instances pruned from one config."""
+
+import os
+
+import httpx
+
+import app.radarrdv_prune as rp
+from conftest import radarr_handler
+
+OLD_MOVIE = {
+    'id': 1,
+    'title': 'Old',
+    'sortTitle': 'old',
+    'year': 2001,
+    'path': '/movies/Old',
+    'genres': [],
+    'tags': [],
+    'hasFile': True,
+    'movieFile': {
+        'id': 11,
+        'relativePath': 'old.mkv',
+        'dateAdded': '2020-01-01T00:00:00Z',
+        'size': 1000,
+    },
+}
+INSTANCES = {
+    'RADARR:hd': {'URL': 'http://hd:7878', 'REMOVE_MOVIES_AFTER_DAYS': '10'},
+    'RADARR:4k': {'URL': 'http://uhd:7878', 'TOKEN': 'uhd-key'},
+    'RADARR:kids': {'URL': 'http://kids:7878', 'ENABLED': 'OFF'},
+}
+API_DATES = {'PRUNE': {'DATE_SOURCE': 'API'}}
+
+
+def test_instance_keys_override_radarr_and_prune(make_rlp):
+    coordinator = make_rlp(radarr_handler(), INSTANCES)
+    assert coordinator.instances == ['hd', '4k', 'kids']
+    hd = rp.RLP('hd', shared=coordinator)
+    assert hd.radarr_url == 'http://hd:7878'
+    assert hd.radarr_token == 'key'
+    assert hd.remove_after_days == 10
+    uhd = rp.RLP('4k', shared=coordinator)
+    assert uhd.radarr_token == 'uhd-key'
+    assert uhd.remove_after_days == 30
+    assert uhd.run_log is coordinator.run_log
+
+
+def test_enabled_switches_off_only_that_instance(make_rlp):
+    coordinator = make_rlp(radarr_handler(), INSTANCES)
+    kids = rp.RLP('kids', shared=coordinator)
+    assert not kids.radarr_enabled
+    assert kids.enabled_run
+    assert kids.pruneInstance() is None
+    assert rp.RLP('hd', shared=coordinator).radarr_enabled
+
+
+def test_instances_get_their_own_state_files(make_rlp):
+    coordinator = make_rlp(radarr_handler(), INSTANCES)
+    uhd = rp.RLP('4k', shared=coordinator)
+    names = {
+        os.path.basename(path) for path in (
+            uhd.state_db_filePath,
+            uhd.scan_cache_filePath,
+            uhd.api_cache_filePath,
+        )
+    }
+    assert names == {
+        'radarrdv_prune.4k.state.db',
+        'radarrdv_prune.4k.scancache.json',
+        'radarrdv_prune.4k.apicache.json',
+    }
+    assert uhd.log_filePath == coordinator.log_filePath
+
+
+def test_failed_and_disabled_instances_in_breakdown(make_rlp, monkeypatch):
+    def unreachable(request):
+        if request.url.path == '/api/v3/system/status':
+            return httpx.Response(200, json={})
+        raise httpx.ConnectError('refused', request=request)
+
+    coordinator = make_rlp(
+        {
+            'http://hd': radarr_handler([OLD_MOVIE]),
+            'http://uhd': unreachable,
+            'http://kids': radarr_handler([OLD_MOVIE]),
+        },
+        {**INSTANCES, **API_DATES},
+    )
+    reports = []
+    monkeypatch.setattr(
+        coordinator, 'report', lambda *args: reports.append(args)
+    )
+    coordinator.run()
+    [(numDeleted, numPlanned, breakdown)] = reports
+    assert (numDeleted, numPlanned) == (1, 0)
+    assert breakdown == [
+        'hd: 1 movies removed and 0 planned.',
+        '4k: no result (disabled or failed).',
+        'kids: no result (disabled or failed).',
+    ]
+    with open(coordinator.log_filePath) as f:
+        assert 'Prune run failed' in f.read()
@@ -0,0 +1,53 @@
+"""Prune report e-mail pieces."""
+
+import gzip
+import os
+
+from app import mail_report
+
+
+def test_gzip_file_round_trips_small_logs(tmp_path):
+    path = tmp_path / 'run.log'
+    path.write_text('line\n' * 1000)
+    data, truncated = mail_report.gzip_file(str(path), 1 << 20)
+    assert not truncated
+    assert gzip.decompress(data) == path.read_bytes()
+
+
+def test_gzip_file_stays_under_cap(tmp_path):
+    path = tmp_path / 'run.log'
+    # Incompressible, several chunks long.
+    path.write_bytes(os.urandom(4 * mail_report.CHUNK_SIZE))
+    cap = 2 * mail_report.CHUNK_SIZE + 1000
+    data, truncated = mail_report.gzip_file(str(path), cap)
+    assert truncated
+    assert len(data) <= cap
+    text = gzip.decompress(data)
+    assert text.endswith(mail_report.TRUNCATED_NOTE)
+    assert path.read_bytes().startswith(
+        text[:-len(mail_report.TRUNCATED_NOTE)]
+    )
+
+
+def test_summary_lists_only_removed_and_planned():
+    body = mail_report.summary_body(
+        1, 1, 2, ['Old (1999) - REMOVED'], ['Soon (2020) - in 1 day, 2h00'],
+        'radarrdv_prune.log.gz',
+        ['4k: 1 movies removed and 0 planned.'],
+    )
+    assert 'Removed: 1' in body
+    assert '- 4k: 1 movies removed and 0 planned.' in body
+    assert '- Old (1999) - REMOVED' in body
+    assert '- Soon (2020) - in 1 day, 2h00' in body
+    assert 'radarrdv_prune.log.gz' in body
+
+
+def test_message_carries_gzip_attachment():
+    message = mail_report.build_message(
+        'a@x', ['b@x', 'c@x'], 'subject', 'body', ('log.gz', b'\x1f\x8b')
+    )
+    assert message['To'] == 'b@x, c@x'
+    parts = message.get_payload()
+    assert parts[1].get_content_type() == 'application/gzip'
+    assert parts[1].get_filename() == 'log.gz'
+    assert parts[1].get_payload(decode=True) == b'\x1f\x8b'
@@ -0,0 +1,88 @@
+"""Prometheus text rendering, textfile output and the /metrics endpoint."""
+
+import urllib.error
+import urllib.request
+
+import pytest
+
+from app.metrics import Metrics, MetricsServer
+
+
+def make_metrics():
+    m = Metrics()
+    m.counter('prune_decisions_total', 'Decisions per reason.')
+    m.gauge('prune_last_run_timestamp_seconds', 'Last run.')
+    m.histogram('prune_probe_seconds', 'Probe latency.', (0.01, 0.1))
+    return m
+
+
+def test_render_counters_gauges_and_labels():
+    m = make_metrics()
+    m.inc('prune_decisions_total', reason='removed')
+    m.inc('prune_decisions_total', 2, reason='removed')
+    m.inc('prune_decisions_total', reason='say "hi"\n')
+    m.set('prune_last_run_timestamp_seconds', 1.5)
+    lines = m.render().splitlines()
+    assert '# TYPE prune_decisions_total counter' in lines
+    assert 'prune_decisions_total{reason="removed"} 3' in lines
+    assert r'prune_decisions_total{reason="say \"hi\"\n"} 1' in lines
+    assert 'prune_last_run_timestamp_seconds 1.5' in lines
+    # Declared but never set: not rendered.
+    assert not any(line.startswith('prune_probe') for line in lines)
+
+
+def test_histogram_buckets_are_cumulative():
+    m = make_metrics()
+    for value in (0.005, 0.05, 0.5):
+        m.observe('prune_probe_seconds', value, radarr='4k')
+    lines = m.render().splitlines()
+    assert 'prune_probe_seconds_bucket{radarr="4k",le="0.01"} 1' in lines
+    assert 'prune_probe_seconds_bucket{radarr="4k",le="0.1"} 2' in lines
+    assert 'prune_probe_seconds_bucket{radarr="4k",le="+Inf"} 3' in lines
+    assert 'prune_probe_seconds_count{radarr="4k"} 3' in lines
+    assert 'prune_probe_seconds_sum{radarr="4k"} 0.555' in lines
+
+
+def test_collectors_run_on_render_and_set_histogram_checks_buckets():
+    m = make_metrics()
+    m.add_collector(
+        lambda metrics: metrics.set_histogram(
+            'prune_probe_seconds', [1, 0, 2], 7.0
+        )
+    )
+    assert 'prune_probe_seconds_count 3' in m.render().splitlines()
+    with pytest.raises(ValueError):
+        m.set_histogram('prune_probe_seconds', [1], 0.0)
+
+
+def test_disabled_metrics_ignore_updates():
+    m = Metrics(enabled=False)
+    m.inc('not_declared_total')
+    m.observe('not_declared_seconds', 1.0)
+    assert m.render() == '\n'
+
+
+def test_textfile_is_replaced(tmp_path):
+    m = make_metrics()
+    m.set('prune_last_run_timestamp_seconds', 2)
+    path = tmp_path / 'prune.prom'
+    path.write_text('stale\n')
+    m.write_textfile(str(path))
+    assert 'prune_last_run_timestamp_seconds 2' in path.read_text()
+    assert [p.name for p in tmp_path.iterdir()] == ['prune.prom']
+
+
+def test_server_serves_metrics():
+    m = make_metrics()
+    m.inc('prune_decisions_total', reason='kept')
+    server = MetricsServer('127.0.0.1', 0, m).start()
+    try:
+        url = f'http://127.0.0.1:{server.port}'
+        with urllib.request.urlopen(url + '/metrics') as r:
+            assert r.headers['Content-Type'].startswith('text/plain')
+            assert b'prune_decisions_total{reason="kept"} 1' in r.read()
+        with pytest.raises(urllib.error.HTTPError) as e:
+            urllib.request.urlopen(url + '/other')
+        assert e.value.code == 404
+    finally:
+        server.close()
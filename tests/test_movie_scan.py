@@ -0,0 +1,107 @@
+"""Movie folder probing and the per-root-folder scan stage."""
+
+import json
+import os
+import threading
+
+from app.movie_scan import (
+    MovieScanner,
+    ScanCache,
+    root_folder_for,
+    scan_folders,
+)
+
+
+def test_probe_creates_marker_only_for_video_folders(tmp_path):
+    with_video = tmp_path / 'A (2020)'
+    with_video.mkdir()
+    (with_video / 'a.MKV').write_bytes(b'')
+    only_subs = tmp_path / 'B (2021)'
+    only_subs.mkdir()
+    (only_subs / 'b.srt').write_bytes(b'')
+
+    scanner = MovieScanner(['.mkv', '.mp4'], '.firstseen')
+    first = scanner.probe(str(with_video))
+    assert first.has_video and first.is_new
+    assert first.first_seen == os.stat(with_video / '.firstseen').st_mtime
+
+    again = scanner.probe(str(with_video))
+    assert again.has_video and not again.is_new
+
+    assert not scanner.probe(str(only_subs)).has_video
+    assert not (only_subs / '.firstseen').exists()
+
+
+def test_root_folder_for_prefers_longest_match():
+    roots = ['/movies/', '/movies/kids', '/4k']
+    assert root_folder_for('/movies/kids/Up (2009)', roots) == '/movies/kids'
+    assert root_folder_for('/movies/Heat (1995)', roots) == '/movies'
+    assert root_folder_for('/moviesx/Heat (1995)', roots) == ''
+
+
+def test_scan_folders_uses_one_pool_per_root():
+    threads = {}
+    lock = threading.Lock()
+
+    def probe(key, path):
+        with lock:
+            threads.setdefault(path.split('/')[1], set()).add(
+                threading.get_ident()
+            )
+        return key * 10
+
+    jobs = [(i, f"/{'a' if i % 2 else 'b'}/m{i}") for i in range(20)]
+    result = scan_folders(jobs, probe, ['/a', '/b'], workers_per_root=2)
+    assert result == {i: i * 10 for i in range(20)}
+    assert not threads['a'] & threads['b']
+
+
+def test_scan_folders_serial_when_no_workers():
+    result = scan_folders([(1, '/x')], lambda k, p: p, workers_per_root=0)
+    assert result == {1: '/x'}
+
+
+def test_scan_cache_skips_unchanged_folders(tmp_path, monkeypatch):
+    folder = tmp_path / 'C (2022)'
+    folder.mkdir()
+    (folder / 'extras.nfo').write_bytes(b'')
+    cache_file = str(tmp_path / 'scancache.json')
+
+    cache = ScanCache(cache_file)
+    scanner = MovieScanner([' .MKV'], '.firstseen', cache)
+    assert not scanner.probe(str(folder)).has_video
+    cache.save()
+
+    listed = []
+    cache = ScanCache(cache_file)
+    cache.load()
+    scanner = MovieScanner(['.mkv'], '.firstseen', cache)
+    real_has_video = scanner.has_video
+    monkeypatch.setattr(
+        scanner, 'has_video', lambda p: listed.append(p) or real_has_video(p)
+    )
+    assert not scanner.probe(str(folder)).has_video
+    assert listed == []
+
+    (folder / 'c.mkv').write_bytes(b'')
+    os.utime(folder, ns=(1, 1))
+    scan = scanner.probe(str(folder))
+    assert scan.has_video and scan.is_new
+    assert listed == [str(folder)]
+    assert cache.lookup(str(folder), os.stat(folder).st_mtime_ns) is True
+
+
+def test_scan_cache_drops_malformed_entries(tmp_path):
+    cache_file = tmp_path / 'scancache.json'
+    cache_file.write_text(json.dumps({
+        '/movies/A': [100, True],
+        '/movies/B': ['not a number', True],
+        '/movies/C': [None, False],
+        '/movies/D': 7,
+        '/movies/E': [1],
+    }))
+    cache = ScanCache(str(cache_file))
+    cache.load()
+    assert cache.lookup('/movies/A', 100) is True
+    for folder in ('/movies/B', '/movies/C', '/movies/D', '/movies/E'):
+        assert cache.lookup(folder, 100) is None
@@ -0,0 +1,62 @@
+"""NotificationQueue digests and delivery."""
+
+import time
+
+from app.notify import NotificationQueue, digests
+
+
+def test_digests_respect_length_limit():
+    assert digests(['a', 'b', 'c']) == ['a\nb\nc']
+    assert digests(['aaaa', 'bbbb', 'cc'], limit=9) == ['aaaa\nbbbb', 'cc']
+    assert digests(['x' * 20], limit=5) == ['xxxxx']
+
+
+def test_messages_are_coalesced_and_summary_comes_last():
+    sent = []
+    queue = NotificationQueue(
+        sent.append, digest_size=3, digest_seconds=60, min_interval=0
+    )
+    for i in range(7):
+        queue.put(f'movie {i}')
+    queue.put_summary('summary')
+    queue.close(timeout=5)
+    assert sent == [
+        'movie 0\nmovie 1\nmovie 2',
+        'movie 3\nmovie 4\nmovie 5',
+        'movie 6',
+        'summary',
+    ]
+
+
+def test_digest_is_sent_after_digest_seconds():
+    sent = []
+    queue = NotificationQueue(
+        sent.append, digest_size=100, digest_seconds=0.05, min_interval=0
+    )
+    queue.put('a')
+    queue.put('b')
+    deadline = time.monotonic() + 5
+    while not sent and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert sent == ['a\nb']
+    queue.close(timeout=5)
+
+
+def test_failures_are_logged_and_sends_are_spaced():
+    times = []
+
+    def send(message):
+        times.append(time.monotonic())
+        if message == 'boom':
+            raise RuntimeError('pushover down')
+
+    queue = NotificationQueue(
+        send, digest_size=1, digest_seconds=0, min_interval=0.1
+    )
+    started = time.monotonic()
+    queue.put('boom')
+    queue.put('ok')
+    queue.close(timeout=5)
+    assert len(times) == 2
+    assert times[1] - times[0] >= 0.1
+    assert time.monotonic() - started < 2
@@ -0,0 +1,76 @@
+"""decide_prune_batch() must match decide_prune_action() movie for movie."""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.radarr_prune_logic import (
+    HAVE_NUMPY,
+    batch_columns,
+    decide_prune_action,
+    decide_prune_batch,
+)
+
+ENGINES = [False] + ([True] if HAVE_NUMPY else [])
+
+
+def random_case(rnd):
+    """A random library and config, biased towards decision boundaries."""
+    now = datetime(2025, 1, 1) + timedelta(
+        seconds=rnd.randint(0, 400 * 86400), microseconds=rnd.randint(0, 999)
+    )
+    config = {
+        'tags_keep_ids': rnd.sample(range(1, 6), rnd.randint(0, 2)),
+        'unwanted_genres': rnd.sample(['Horror', 'Musical', 'War'], 1),
+        'remove_after_days': rnd.randint(0, 60),
+        'warn_days_infront': rnd.randint(-1, 10),
+        'tags_no_exclusion_ids': rnd.sample(range(1, 6), rnd.randint(0, 2)),
+        'months_no_exclusion': rnd.sample(range(1, 13), rnd.randint(0, 4)),
+    }
+    removal = timedelta(days=config['remove_after_days'])
+    warn = timedelta(days=config['warn_days_infront'])
+    movies = []
+    for _ in range(rnd.randint(0, 60)):
+        kind = rnd.random()
+        if kind < 0.15:
+            download_date = None
+        elif kind < 0.6:
+            # Within a few microseconds of the warn or removal boundary.
+            anchor = now - removal + rnd.choice([timedelta(0), warn])
+            download_date = anchor + timedelta(
+                microseconds=rnd.randint(-3, 3)
+            )
+        else:
+            download_date = now - timedelta(
+                days=rnd.uniform(-5, 120), microseconds=rnd.randint(0, 10)
+            )
+        movies.append({
+            'tagsIds': rnd.sample(range(1, 6), rnd.randint(0, 3)),
+            'genres': rnd.sample(
+                ['Drama', 'Horror', 'War'], rnd.randint(0, 2)
+            ),
+            'download_date': download_date,
+        })
+    return movies, config, now
+
+
+@pytest.mark.parametrize('use_numpy', ENGINES)
+def test_batch_matches_scalar_decisions(use_numpy):
+    rnd = random.Random(20250110)
+    for _ in range(500):
+        movies, config, now = random_case(rnd)
+        batch = decide_prune_batch(
+            **batch_columns(movies, config),
+            config=config,
+            now=now,
+            use_numpy=use_numpy,
+        )
+        expected = [decide_prune_action(m, config, now) for m in movies]
+        assert batch.results() == expected
+
+
+@pytest.mark.parametrize('use_numpy', ENGINES)
+def test_batch_empty_library(use_numpy):
+    batch = decide_prune_batch([], [], [], [], [], {}, use_numpy=use_numpy)
+    assert batch.results() == []
@@ -1,6 +1,12 @@
 from datetime import datetime, timedelta
 
-from app.radarr_prune_logic import PruneResult, decide_prune_action
+from app.radarr_prune_logic import (
+    PrunePolicy,
+    PruneResult,
+    decide_prune_action,
+    from_wall_clock_us,
+    wall_clock_us,
+)
 
 
 def test_keep_tag():
@@ -126,3 +132,85 @@ def test_remove_when_old_without_disk_flag():
 
     r = decide_prune_action(movie, config, now)
     assert r == PruneResult(True, False, 'removed', True)
+
+
+def test_policy_compiles_tags_and_months_to_bitmasks():
+    policy = PrunePolicy(
+        tags_keep_ids=[7, 9],
+        unwanted_genres=['Horror'],
+        remove_after_days=30,
+        warn_days_infront=5,
+        tags_no_exclusion_ids=[9, 11],
+        months_no_exclusion=[1, 12],
+    )
+    assert policy.tag_bits == {7: 1, 9: 2, 11: 4}
+    assert policy.keep_mask == 0b011
+    assert policy.no_exclusion_mask == 0b110
+    assert policy.months_mask == (1 << 1) | (1 << 12)
+    assert policy.tag_mask([11, 3]) == 0b100
+    assert policy.unwanted_genres == frozenset({'Horror'})
+
+
+def test_policy_decide_matches_wrapper():
+    config = {
+        'tags_keep_ids': [1],
+        'unwanted_genres': ['Horror'],
+        'remove_after_days': 30,
+        'warn_days_infront': 7,
+        'tags_no_exclusion_ids': [2],
+        'months_no_exclusion': [3],
+    }
+    policy = PrunePolicy.from_config(config)
+    now = datetime(2025, 6, 1)
+    for tags, date in [
+        ([], datetime(2025, 5, 1)),
+        ([2], datetime(2025, 1, 1)),
+        ([], datetime(2025, 3, 1)),
+        ([], datetime(2025, 5, 5)),
+        ([1], None),
+    ]:
+        movie = {'tagsIds': tags, 'genres': ['Drama'], 'download_date': date}
+        expected = decide_prune_action(movie, config, now)
+        assert policy.decide(policy.tag_mask(tags), ['Drama'], date, now) \
+            == expected
+
+
+def test_next_change_marks_the_decision_boundaries():
+    policy = PrunePolicy(
+        tags_keep_ids=[1],
+        remove_after_days=30,
+        warn_days_infront=7,
+        tags_no_exclusion_ids=[2],
+    )
+    download = datetime(2025, 5, 1)
+    warn_start = datetime(2025, 5, 24)
+    removal = datetime(2025, 5, 31)
+    us = timedelta(microseconds=1)
+    for tags, now, expected in [
+        ([], datetime(2025, 5, 2), warn_start),
+        ([], warn_start, removal),
+        ([], removal, None),
+        ([2], removal + timedelta(days=9), None),
+        ([1], datetime(2025, 5, 2), None),
+    ]:
+        mask = policy.tag_mask(tags)
+        change = policy.next_change(mask, [], download, now)
+        assert change == expected
+        if change is not None:
+            # Stable until the boundary, different from it on.
+            before = policy.decide(mask, [], download, change - us)
+            assert policy.decide(mask, [], download, now) == before
+            assert policy.decide(mask, [], download, change) != before
+    assert policy.next_change(0, [], None) is None
+
+
+def test_policy_fingerprint_ignores_tag_order():
+    a = PrunePolicy(tags_keep_ids=[1, 2], remove_after_days=30)
+    b = PrunePolicy(tags_keep_ids=[2, 1], remove_after_days=30)
+    c = PrunePolicy(tags_keep_ids=[1, 2], remove_after_days=31)
+    assert a.fingerprint() == b.fingerprint() != c.fingerprint()
+
+
+def test_wall_clock_us_round_trip():
+    dt = datetime(2025, 3, 30, 2, 30, 0, 123456)
+    assert from_wall_clock_us(wall_clock_us(dt)) == dt
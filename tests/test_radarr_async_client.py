@@ -0,0 +1,124 @@
+"""AsyncRadarrClient / BlockingRadarrClient against a mock transport."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.radarr_async_client import AsyncRadarrClient, BlockingRadarrClient
+from app.radarr_client import CircuitBreaker, RadarrApiError, RetryPolicy
+
+DELAY = 0.2
+
+
+def slow_radarr(movies, tracker=None):
+    async def handler(request):
+        path = request.url.path
+        if tracker is not None:
+            tracker['active'] += 1
+            tracker['peak'] = max(tracker['peak'], tracker['active'])
+        try:
+            await asyncio.sleep(DELAY)
+        finally:
+            if tracker is not None:
+                tracker['active'] -= 1
+        if request.method == 'DELETE':
+            return httpx.Response(200)
+        if path == '/api/v3/movie':
+            return httpx.Response(200, content=json.dumps(movies).encode())
+        if path == '/api/v3/tag':
+            return httpx.Response(200, json=[{'id': 1, 'label': 'keep'}])
+        if path == '/api/v3/rootfolder':
+            return httpx.Response(200, json=[{'path': '/movies'}])
+        return httpx.Response(200, json={'version': '5'})
+
+    return httpx.MockTransport(handler)
+
+
+def test_bootstrap_runs_requests_concurrently():
+    movies = [{'id': i, 'title': f'M{i}'} for i in range(3)]
+    tracker = {'active': 0, 'peak': 0}
+    client = BlockingRadarrClient(
+        'http://radarr:7878', 'key', transport=slow_radarr(movies, tracker)
+    )
+    with client:
+        boot = client.bootstrap()
+    # Status, tags, root folders and movies all in flight at once.
+    assert tracker['peak'] == 4
+    assert boot.status == {'version': '5'}
+    assert boot.tags == [{'id': 1, 'label': 'keep'}]
+    assert boot.root_folders == [{'path': '/movies'}]
+    assert [m.id for m in boot.movies] == [0, 1, 2]
+
+
+def test_bootstrap_tolerates_root_folder_failure():
+    def handler(request):
+        path = request.url.path
+        if path == '/api/v3/rootfolder':
+            return httpx.Response(500, text='boom')
+        if path == '/api/v3/system/status':
+            return httpx.Response(200, json={})
+        return httpx.Response(200, json=[])
+
+    client = BlockingRadarrClient(
+        'http://radarr:7878', 'key', transport=httpx.MockTransport(handler)
+    )
+    with client:
+        boot = client.bootstrap(stream=False)
+    assert boot.root_folders is None
+    assert boot.movies == []
+
+
+def test_bootstrap_fails_when_status_fails():
+    def handler(request):
+        if request.url.path == '/api/v3/system/status':
+            return httpx.Response(401, text='unauthorized')
+        return httpx.Response(200, json=[])
+
+    client = BlockingRadarrClient(
+        'http://radarr:7878', 'key', transport=httpx.MockTransport(handler)
+    )
+    with client, pytest.raises(RadarrApiError):
+        client.bootstrap()
+
+
+def test_connection_errors_are_wrapped():
+    def handler(request):
+        raise httpx.ConnectError('refused', request=request)
+
+    client = BlockingRadarrClient(
+        'http://radarr:7878',
+        'key',
+        retry=RetryPolicy(1, base_delay=0),
+        breaker=CircuitBreaker(0),
+        transport=httpx.MockTransport(handler),
+    )
+    with client, pytest.raises(RadarrApiError) as excinfo:
+        client.bootstrap()
+    assert isinstance(excinfo.value.__cause__, httpx.ConnectError)
+
+
+@pytest.mark.parametrize('bulk', [False, True])
+def test_deletes_are_bounded_by_semaphore(bulk):
+    tracker = {'active': 0, 'peak': 0}
+
+    async def main():
+        async with AsyncRadarrClient(
+            'http://radarr:7878',
+            'key',
+            max_concurrent_mutations=2,
+            transport=slow_radarr([], tracker),
+        ) as client:
+            return await client.delete_movies(
+                list(range(6)),
+                delete_files=True,
+                add_import_exclusion=False,
+                chunk_size=1,
+                bulk=bulk,
+            )
+
+    result = asyncio.run(main())
+    assert result == dict.fromkeys(range(6), True)
+    # Six requests, never more than two in flight.
+    assert tracker['peak'] == 2
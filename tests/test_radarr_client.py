@@ -0,0 +1,294 @@
+"""RadarrClient behaviour against an in-memory httpx transport."""
+
+import json
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+from app.radarr_client import (
+    LATENCY_BUCKETS,
+    CircuitBreaker,
+    JsonArrayStream,
+    RadarrApiError,
+    RadarrClient,
+    RadarrUnavailableError,
+    RateLimiter,
+    RequestStats,
+    RetryPolicy,
+    parse_retry_after,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_rate_limiter_burst_then_wait():
+    clock = FakeClock()
+    limiter = RateLimiter(2.0, burst=2, clock=clock)
+    assert limiter.reserve() == 0.0
+    assert limiter.reserve() == 0.0
+    assert limiter.reserve() == 0.5
+    clock.now = 10.0
+    assert limiter.reserve() == 0.0
+
+
+def test_rate_limiter_adapts_to_throttling_and_recovers():
+    clock = FakeClock()
+    limiter = RateLimiter(4.0, clock=clock)
+    limiter.observe(0.1, 429)
+    assert limiter.rate == 2.0
+    limiter.observe(5.0, 200)
+    assert limiter.rate == 1.6
+    for _ in range(10):
+        limiter.observe(0.1, 200)
+    assert limiter.rate == 4.0
+
+
+def test_client_only_throttles_http_requests():
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.path)
+        return httpx.Response(200, json=[])
+
+    client = RadarrClient(
+        'http://radarr:7878/',
+        'key',
+        max_requests_per_second=1000,
+        transport=httpx.MockTransport(handler),
+    )
+    with client:
+        client.ping()
+        assert client.get_tags() == []
+        assert client.get_movies() == []
+    assert seen == ['/api/v3/system/status', '/api/v3/tag', '/api/v3/movie']
+
+
+def test_json_array_stream_handles_split_chunks():
+    payload = json.dumps(
+        [{'id': 1, 'title': 'Amélie'}, {'id': 2, 'tags': [1, 2]}, 3],
+        ensure_ascii=False,
+    ).encode('utf-8')
+    stream = JsonArrayStream()
+    items = []
+    for i in range(len(payload)):
+        items.extend(stream.feed(payload[i:i + 1]))
+    items.extend(stream.close())
+    assert items == [
+        {'id': 1, 'title': 'Amélie'},
+        {'id': 2, 'tags': [1, 2]},
+        3,
+    ]
+    assert stream.bytes_read == len(payload)
+
+
+def test_json_array_stream_rejects_truncated_input():
+    stream = JsonArrayStream()
+    stream.feed(b'[{"id": 1}, {"id"')
+    with pytest.raises(ValueError):
+        stream.close()
+
+
+def test_iter_movie_records_streams_projection():
+    movies = [
+        {'id': i, 'title': f'M{i}', 'images': [{'url': 'x' * 100}]}
+        for i in range(50)
+    ]
+
+    body = json.dumps(movies).encode()
+
+    def handler(request):
+        return httpx.Response(200, content=body)
+
+    client = RadarrClient(
+        'http://radarr:7878', 'key', transport=httpx.MockTransport(handler)
+    )
+    with client:
+        records = list(client.iter_movie_records())
+    assert [r.id for r in records] == list(range(50))
+    assert client.last_response_bytes == len(body)
+
+
+def test_iter_movies_raises_api_error_on_bad_body():
+    def handler(request):
+        return httpx.Response(200, content=b'{"not": "a list"}')
+
+    client = RadarrClient(
+        'http://radarr:7878', 'key', transport=httpx.MockTransport(handler)
+    )
+    with client, pytest.raises(RadarrApiError):
+        list(client.iter_movies())
+
+
+def test_delete_movies_uses_editor_in_chunks():
+    bodies = []
+
+    def handler(request):
+        assert request.method == 'DELETE'
+        assert request.url.path == '/api/v3/movie/editor'
+        bodies.append(json.loads(request.content))
+        return httpx.Response(200)
+
+    client = RadarrClient(
+        'http://radarr:7878', 'key', transport=httpx.MockTransport(handler)
+    )
+    with client:
+        result = client.delete_movies(
+            [1, 2, 3], delete_files=True, add_import_exclusion=False,
+            chunk_size=2,
+        )
+    assert result == {1: True, 2: True, 3: True}
+    assert [b['movieIds'] for b in bodies] == [[1, 2], [3]]
+    assert bodies[0]['deleteFiles'] is True
+    assert bodies[0]['addImportExclusion'] is False
+
+
+def test_delete_movies_falls_back_to_single_deletes():
+    def handler(request):
+        if request.url.path == '/api/v3/movie/editor':
+            return httpx.Response(500, text='boom')
+        movie_id = request.url.path.rsplit('/', 1)[1]
+        return httpx.Response({'1': 200, '2': 404, '3': 500}[movie_id])
+
+    client = RadarrClient(
+        'http://radarr:7878', 'key', transport=httpx.MockTransport(handler)
+    )
+    with client:
+        result = client.delete_movies(
+            [1, 2, 3], delete_files=False, add_import_exclusion=True
+        )
+    assert result == {1: True, 2: True, 3: False}
+
+
+def test_retry_policy_backoff_and_retry_after():
+    policy = RetryPolicy(3, base_delay=1.0, max_delay=5.0, rng=lambda: 1.0)
+    assert [policy.delay(n) for n in (1, 2, 3, 4)] == [1.0, 2.0, 4.0, 5.0]
+    assert policy.delay(1, '3') == 3.0
+    assert policy.delay(1, '120') == 5.0
+    now = datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    assert parse_retry_after('Wed, 01 Jan 2025 12:00:07 GMT', now) == 7.0
+    assert parse_retry_after('soon') is None
+
+
+def test_transient_errors_are_retried():
+    responses = iter([503, 502, 200])
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.path)
+        return httpx.Response(next(responses), json=[])
+
+    client = RadarrClient(
+        'http://radarr:7878',
+        'key',
+        retry=RetryPolicy(3, base_delay=0),
+        transport=httpx.MockTransport(handler),
+    )
+    with client:
+        assert client.get_tags() == []
+        [line] = client.stats.summary()
+        assert line.startswith(
+            'GET /api/v3/tag: 1 requests, 3 attempts, 0 failed,'
+        )
+    assert len(seen) == 3
+
+
+def test_request_stats_latency_histogram():
+    stats = RequestStats()
+    stats.record('GET /api/v3/movie', 1, 0.004, True)
+    stats.record('GET /api/v3/movie', 1, 0.3, True)
+    stats.record('GET /api/v3/movie', 2, 60.0, False)
+    counts, total, failed = stats.histograms()['GET /api/v3/movie']
+    assert len(counts) == len(LATENCY_BUCKETS) + 1
+    assert counts[0] == 1
+    assert counts[LATENCY_BUCKETS.index(0.5)] == 1
+    assert counts[-1] == 1
+    assert total == pytest.approx(60.304)
+    assert failed == 1
+
+
+def test_connection_errors_give_up_after_max_retries():
+    attempts = []
+
+    def handler(request):
+        attempts.append(1)
+        raise httpx.ConnectError('refused', request=request)
+
+    client = RadarrClient(
+        'http://radarr:7878',
+        'key',
+        retry=RetryPolicy(2, base_delay=0),
+        breaker=CircuitBreaker(0),
+        transport=httpx.MockTransport(handler),
+    )
+    with client, pytest.raises(RadarrApiError) as excinfo:
+        client.ping()
+    assert len(attempts) == 3
+    assert isinstance(excinfo.value.__cause__, httpx.ConnectError)
+
+
+def test_client_errors_are_not_retried():
+    attempts = []
+
+    def handler(request):
+        attempts.append(1)
+        return httpx.Response(401, text='unauthorized')
+
+    client = RadarrClient(
+        'http://radarr:7878', 'key', transport=httpx.MockTransport(handler)
+    )
+    with client, pytest.raises(RadarrApiError):
+        client.ping()
+    assert len(attempts) == 1
+
+
+def test_circuit_breaker_opens_and_recovers():
+    clock = FakeClock()
+    breaker = CircuitBreaker(2, reset_timeout=10, clock=clock)
+    status = {'code': 503}
+    attempts = []
+
+    def handler(request):
+        attempts.append(1)
+        return httpx.Response(status['code'], json={})
+
+    client = RadarrClient(
+        'http://radarr:7878',
+        'key',
+        retry=RetryPolicy(5, base_delay=0),
+        breaker=breaker,
+        transport=httpx.MockTransport(handler),
+    )
+    with client:
+        with pytest.raises(RadarrUnavailableError):
+            client.ping()
+        assert len(attempts) == 2
+        assert breaker.state == 'open'
+        with pytest.raises(RadarrUnavailableError):
+            client.ping()
+        assert len(attempts) == 2
+        clock.now = 10.0
+        status['code'] = 200
+        client.ping()
+        assert breaker.state == 'closed'
+    assert len(attempts) == 3
+
+
+def test_get_movie_returns_record_or_none():
+    def handler(request):
+        if request.url.path == '/api/v3/movie/7':
+            return httpx.Response(200, json={'id': 7, 'title': 'Seven'})
+        return httpx.Response(404)
+
+    client = RadarrClient(
+        'http://radarr:7878', 'key', transport=httpx.MockTransport(handler)
+    )
+    with client:
+        assert client.get_movie(7).title == 'Seven'
+        assert client.get_movie(8) is None
@@ -1,6 +1,11 @@
 """Sanity checks for Radarr JSON → MovieRecord mapping."""
 
-from app.radarr_client import MovieRecord
+import dataclasses
+from datetime import datetime, timezone
+
+import pytest
+
+from app.radarr_client import MovieRecord, parse_api_datetime
 
 
 def test_movie_record_from_api_camelcase():
@@ -19,8 +24,8 @@ def test_movie_record_from_api_camelcase():
     assert m.sortTitle == 'test film'
     assert m.year == 2020
     assert m.path == '/movies/Test Film (2020)'
-    assert m.genres == ['Action', 'Drama']
-    assert m.tagsIds == [1, 2, 3]
+    assert m.genres == ('Action', 'Drama')
+    assert m.tagsIds == (1, 2, 3)
 
 
 def test_movie_record_sort_title_fallback():
@@ -34,3 +39,44 @@ def test_movie_record_sort_title_fallback():
     }
     m = MovieRecord.from_api(row)
     assert m.sortTitle == 'Only Title'
+
+
+def test_movie_record_file_fields():
+    row = {
+        'id': 7,
+        'title': 'Has File',
+        'year': 2021,
+        'path': '/movies/Has File (2021)',
+        'hasFile': True,
+        'sizeOnDisk': 1234,
+        'movieFile': {
+            'relativePath': 'Has File (2021).mkv',
+            'dateAdded': '2024-03-01T12:00:00.1234567Z',
+        },
+    }
+    m = MovieRecord.from_api(row)
+    assert m.hasFile is True
+    assert m.sizeOnDisk == 1234
+    assert m.fileRelativePath == 'Has File (2021).mkv'
+    expected = datetime(2024, 3, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+    assert m.fileDateAdded == expected.astimezone().replace(tzinfo=None)
+
+
+def test_movie_record_without_file():
+    m = MovieRecord.from_api({'id': 8, 'title': 'No File', 'hasFile': False})
+    assert m.hasFile is False
+    assert m.fileDateAdded is None
+    assert m.fileRelativePath == ''
+    assert m.sizeOnDisk == 0
+    assert parse_api_datetime('not a date') is None
+
+
+def test_movie_record_is_compact_and_immutable():
+    row = {'id': 3, 'title': 'A', 'genres': ['Drama'], 'tags': [4]}
+    a = MovieRecord.from_api(row)
+    b = MovieRecord.from_api(dict(row, id=4))
+    assert not hasattr(a, '__dict__')
+    assert a.genres is b.genres
+    assert a.tagsIds is b.tagsIds
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        a.title = 'B'
@@ -0,0 +1,52 @@
+"""RunLog buffering and JSON-lines records."""
+
+import json
+import logging
+
+from app.run_log import RunLog
+
+
+def test_lines_are_buffered_until_flush(tmp_path):
+    path = tmp_path / 'run.log'
+    log = RunLog(str(path))
+    log.start()
+    log.write('first')
+    log.write('second')
+    assert path.read_text() == ''
+    log.flush()
+    lines = path.read_text().splitlines()
+    assert [line.split(' - ', 1)[1] for line in lines] == ['first', 'second']
+    log.close()
+
+
+def test_start_truncates_and_jsonl_records(tmp_path):
+    path = tmp_path / 'run.log'
+    jsonl = tmp_path / 'run.log.jsonl'
+    path.write_text('old run\n')
+    log = RunLog(str(path), str(jsonl))
+    log.start()
+    log.write('new run')
+    log.record(id=7, reason='removed', download_date=None, action='deleted')
+    log.close()
+    assert 'old run' not in path.read_text()
+    [record] = [json.loads(line) for line in jsonl.read_text().splitlines()]
+    assert record['id'] == 7
+    assert record['action'] == 'deleted'
+    assert 'ts' in record
+
+
+def test_record_without_jsonl_is_a_no_op(tmp_path):
+    log = RunLog(str(tmp_path / 'run.log'))
+    log.record(id=1)
+    log.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_unwritable_log_is_reported_once(tmp_path, caplog):
+    log = RunLog(str(tmp_path / 'missing' / 'run.log'))
+    with caplog.at_level(logging.ERROR):
+        log.start()
+        for _ in range(3):
+            log.write('lost')
+        log.close()
+    assert len(caplog.records) == 1
@@ -0,0 +1,109 @@
+"""Library shards: stable assignment, capped windows, resumable cursor."""
+
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from app.shards import Sharder, ShardState, id_shard, plan_shard, shard_key
+from conftest import radarr_handler
+
+
+def _movie(movie_id, title=None, path=None):
+    return SimpleNamespace(
+        id=movie_id,
+        sortTitle=title if title is not None else f'movie {movie_id:03d}',
+        path=path or f'/movies/Movie {movie_id}',
+    )
+
+
+def test_id_shard_is_stable_and_spread():
+    assert [id_shard(i, 4) for i in range(8)] == \
+        [id_shard(i, 4) for i in range(8)]
+    counts = [0] * 4
+    for i in range(1000):
+        counts[id_shard(i, 4)] += 1
+    assert min(counts) > 150
+
+
+def test_root_folder_shards():
+    sharder = Sharder(2, 'ROOT_FOLDER', ['/b', '/a', '/c'])
+    assert sharder.shard_of(_movie(1, path='/a/X')) == 0
+    assert sharder.shard_of(_movie(2, path='/b/X')) == 1
+    assert sharder.shard_of(_movie(3, path='/c/X')) == 0
+    assert sharder.shard_of(_movie(4, path='/elsewhere/X')) == 0
+    with pytest.raises(ValueError):
+        Sharder(2, 'GENRE')
+
+
+def test_plan_walks_a_shard_in_capped_windows():
+    movies = [_movie(i) for i in range(5)]
+    sharder = Sharder(1)
+    state = ShardState('ID', 1)
+
+    plan = plan_shard(movies, sharder, state, max_movies=2)
+    assert [m.id for m in plan.window] == [0, 1]
+    assert plan.remaining == 5
+    assert not plan.finished
+    state = plan.done()
+    assert state.cursor == shard_key(movies[1])
+
+    plan = plan_shard(movies, sharder, state, max_movies=2)
+    assert [m.id for m in plan.window] == [2, 3]
+    plan = plan_shard(movies, sharder, plan.done(), max_movies=2)
+    assert [m.id for m in plan.window] == [4]
+    assert plan.finished
+    assert plan.done() == ShardState('ID', 1, 0, None)
+
+
+def test_plan_moves_to_the_next_shard_and_skips_empty_ones():
+    movies = [_movie(1, path='/a/X'), _movie(2, path='/c/X')]
+    sharder = Sharder(3, 'ROOT_FOLDER', ['/a', '/b', '/c'])
+    plan = plan_shard(movies, sharder, ShardState('ROOT_FOLDER', 3))
+    assert [m.id for m in plan.window] == [1]
+    state = plan.done()
+    assert state == ShardState('ROOT_FOLDER', 3, 1, None)
+    # Shard 1 (/b) is empty.
+    plan = plan_shard(movies, sharder, state)
+    assert plan.state.shard == 2
+    assert [m.id for m in plan.window] == [2]
+    assert plan_shard([], sharder, state).window == []
+
+
+def test_state_dump_and_load_reset_on_layout_change():
+    state = ShardState('ID', 4, 2, ('movie 007', 7))
+    assert ShardState.load(state.dump(), 'ID', 4) == state
+    assert ShardState.load(state.dump(), 'ID', 3) == ShardState('ID', 3)
+    assert ShardState.load(state.dump(), 'ROOT_FOLDER', 4) == \
+        ShardState('ROOT_FOLDER', 4)
+    assert ShardState.load(None, 'ID', 4) == ShardState('ID', 4)
+    assert ShardState.load('not json', 'ID', 4) == ShardState('ID', 4)
+
+
+def test_sharded_run_stamps_every_new_movie(make_rlp, tmp_path):
+    media = tmp_path / 'movies'
+    movies = []
+    for i in range(1, 9):
+        folder = media / f'Movie {i}'
+        folder.mkdir(parents=True)
+        (folder / f'm{i}.mkv').touch()
+        movies.append({
+            'id': i,
+            'title': f'Movie {i}',
+            'sortTitle': f'movie {i}',
+            'year': 2000 + i,
+            'path': str(folder),
+            'genres': [],
+            'tags': [],
+            'hasFile': True,
+        })
+    rlp = make_rlp(
+        radarr_handler(movies, roots=[str(media)]),
+        {'PRUNE': {'SHARDS': '4'}},
+    )
+    rlp.run()
+    stamped = sorted(
+        m['id'] for m in movies
+        if os.path.exists(os.path.join(m['path'], '.firstseen'))
+    )
+    assert stamped == list(range(1, 9))
@@ -0,0 +1,52 @@
+"""Import cost of radarrdv_prune: optional stacks stay unloaded."""
+
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Loaded only when a prune run goes ahead (httpx) or when Pushover, mail,
+# webhooks/metrics endpoint, the async client or decide_prune_batch() are
+# used.
+LAZY_MODULES = (
+    'httpx', 'ssl', 'chump', 'smtplib', 'email.mime', 'http.server',
+    'asyncio', 'numpy',
+)
+# Generous for small ARM boxes; override when a CI runner is slower still.
+BUDGET_MS = float(os.environ.get('RADARR_PRUNE_IMPORT_BUDGET_MS', '500'))
+
+
+def import_times():
+    """-X importtime of 'import app.radarrdv_prune': {module: cumulative µs}."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c',
+         'import app.radarrdv_prune'],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _self, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_optional_stacks_are_not_imported():
+    loaded = import_times()
+    eager = sorted(
+        name for name in loaded
+        if any(name == m or name.startswith(m + '.') for m in LAZY_MODULES)
+    )
+    assert eager == []
+
+
+def test_import_time_within_budget():
+    # Best of three: the first run may pay for a cold page cache.
+    best_ms = min(
+        import_times()['app.radarrdv_prune'] for _ in range(3)
+    ) / 1000
+    assert best_ms < BUDGET_MS, (
+        f"importing radarrdv_prune took {best_ms:.0f} ms "
+        f"(budget {BUDGET_MS:.0f} ms)"
+    )
@@ -0,0 +1,47 @@
+"""First-seen state database."""
+
+from app.state_store import StateStore
+
+
+def test_first_seen_round_trip_and_retain(tmp_path):
+    db = str(tmp_path / 'state.db')
+    with StateStore(db) as store:
+        store.set_first_seen(1, '/movies/A', 100.0)
+        store.set_first_seen(2, '/movies/B', 200.0)
+        store.set_first_seen(1, '/movies/A2', 150.0)
+
+    with StateStore(db) as store:
+        assert store.load_first_seen() == {
+            1: ('/movies/A2', 150.0),
+            2: ('/movies/B', 200.0),
+        }
+        assert store.retain([2, 3]) == 1
+        store.forget(2)
+        assert store.load_first_seen() == {}
+
+
+def test_decision_index_round_trip(tmp_path):
+    db = str(tmp_path / 'state.db')
+    with StateStore(db) as store:
+        store.set_decision(1, -42, 1_700_000_000_000_000)
+        store.set_decision(2, 7, None)
+        store.set_decision(3, 8, 5)
+        store.set_decision(1, 43, 12)
+
+    with StateStore(db) as store:
+        assert store.load_decisions() == {1: (43, 12), 2: (7, None), 3: (8, 5)}
+        store.retain([1, 2])
+        store.forget(1)
+        store.forget_decision(2)
+        assert store.load_decisions() == {}
+
+
+def test_meta_round_trip(tmp_path):
+    db = str(tmp_path / 'state.db')
+    with StateStore(db) as store:
+        assert store.get_meta('shard') is None
+        store.set_meta('shard', 'a')
+        store.set_meta('shard', 'b')
+
+    with StateStore(db) as store:
+        assert store.get_meta('shard') == 'b'
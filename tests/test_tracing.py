@@ -0,0 +1,79 @@
+"""Span tracer: no-op when disabled, Chrome trace export, slowest spans."""
+
+import json
+import threading
+
+from app.tracing import Span, Tracer, traced
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer()
+    with tracer.span('scan'):
+        with tracer.detail('evaluate', 'movie', id=1):
+            pass
+    assert tracer.spans == []
+    assert tracer.span('a') is tracer.span('b')
+
+
+def test_details_off_keeps_phase_spans():
+    tracer = Tracer(True, details=False)
+    with tracer.span('scan'):
+        with tracer.detail('evaluate', 'movie', id=1):
+            pass
+    assert [s.name for s in tracer.spans] == ['scan']
+
+
+def test_chrome_trace_has_thread_names_and_complete_events(tmp_path):
+    tracer = Tracer(True)
+    with tracer.span('prune', movies=3):
+        pass
+    worker = threading.Thread(
+        target=lambda: tracer.span('pushover.send').__enter__().__exit__(),
+        name='pushover',
+    )
+    worker.start()
+    worker.join()
+    path = tmp_path / 'trace.json'
+    tracer.write(str(path))
+    events = json.loads(path.read_text())['traceEvents']
+    names = {e['args']['name'] for e in events if e['ph'] == 'M'}
+    assert {'MainThread', 'pushover'} <= names
+    [prune] = [e for e in events if e['name'] == 'prune']
+    assert prune['ph'] == 'X'
+    assert prune['dur'] >= 0
+    assert prune['args'] == {'movies': 3}
+
+
+def test_slowest_orders_by_duration_within_category():
+    tracer = Tracer(True)
+    for i, dur in enumerate((5, 30, 10)):
+        tracer._add(_span(f'm{i}', 'movie', dur))
+    tracer._add(_span('f', 'folder', 99))
+    assert [s.name for s in tracer.slowest('movie', 2)] == ['m1', 'm2']
+
+
+def test_max_spans_drops_the_rest():
+    tracer = Tracer(True, max_spans=2)
+    for _ in range(5):
+        with tracer.span('x'):
+            pass
+    assert len(tracer.spans) == 2
+    assert tracer.dropped == 3
+
+
+def test_traced_decorator_uses_the_instance_tracer():
+    class Phase:
+        def __init__(self):
+            self.tracer = Tracer(True)
+
+        @traced('work')
+        def work(self, value):
+            return value * 2
+
+    phase = Phase()
+    assert phase.work(4) == 8
+    assert [s.name for s in phase.tracer.spans] == ['work']
+
+
+def _span(name, cat, dur_ns):
+    return Span(name, cat, 0, dur_ns, threading.get_ident(), {})
@@ -0,0 +1,127 @@
+"""WebhookServer against recorded Radarr Connect payloads."""
+
+import base64
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from app.webhook import WebhookServer, is_loopback, parse_event
+
+DOWNLOAD = {
+    'movie': {
+        'id': 12,
+        'title': 'Arrival',
+        'year': 2016,
+        'releaseDate': '2017-02-14',
+        'folderPath': '/movies/Arrival (2016)',
+        'tmdbId': 329865,
+        'tags': ['keep'],
+    },
+    'remoteMovie': {'tmdbId': 329865, 'title': 'Arrival', 'year': 2016},
+    'movieFile': {
+        'id': 40,
+        'relativePath': 'Arrival (2016).mkv',
+        'path': '/downloads/Arrival.2016.1080p.mkv',
+        'quality': 'Bluray-1080p',
+        'size': 8589934592,
+    },
+    'isUpgrade': False,
+    'downloadClient': 'SABnzbd',
+    'eventType': 'Download',
+    'instanceName': 'Radarr',
+}
+
+MOVIE_FILE_DELETE = {
+    'movie': {'id': 12, 'title': 'Arrival', 'year': 2016,
+              'folderPath': '/movies/Arrival (2016)'},
+    'movieFile': {'id': 40, 'relativePath': 'Arrival (2016).mkv'},
+    'deleteReason': 'manual',
+    'eventType': 'MovieFileDelete',
+    'instanceName': 'Radarr',
+}
+
+MOVIE_DELETE = {
+    'movie': {'id': 12, 'title': 'Arrival', 'year': 2016,
+              'folderPath': '/movies/Arrival (2016)'},
+    'deletedFiles': True,
+    'eventType': 'MovieDelete',
+    'instanceName': 'Radarr',
+}
+
+TEST = {'eventType': 'Test', 'instanceName': 'Radarr'}
+
+
+@pytest.fixture
+def server():
+    events = []
+    srv = WebhookServer('127.0.0.1', 0, events.append, token='s3cret')
+    srv.events = events
+    yield srv.start()
+    srv.close()
+
+
+def post(server, body, query='?token=s3cret', headers=None):
+    request = urllib.request.Request(
+        f'http://127.0.0.1:{server.port}/radarr{query}',
+        data=body if isinstance(body, bytes) else json.dumps(body).encode(),
+        headers={'Content-Type': 'application/json', **(headers or {})},
+        method='POST',
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=5) as r:
+            return r.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def test_recorded_payloads_become_events(server):
+    for payload in (DOWNLOAD, MOVIE_FILE_DELETE, MOVIE_DELETE, TEST):
+        assert post(server, payload) == 202
+    assert [(e.event_type, e.movie_id) for e in server.events] == [
+        ('Download', 12),
+        ('MovieFileDelete', 12),
+        ('MovieDelete', 12),
+        ('Test', None),
+    ]
+    assert server.events[0].path == '/movies/Arrival (2016)'
+    assert server.events[1].delete_reason == 'manual'
+
+
+def test_token_is_required(server):
+    assert post(server, DOWNLOAD, query='') == 401
+    assert post(server, DOWNLOAD, query='?token=wrong') == 401
+    basic = base64.b64encode(b'radarr:s3cret').decode()
+    assert post(
+        server, DOWNLOAD, query='',
+        headers={'Authorization': f'Basic {basic}'},
+    ) == 202
+    assert len(server.events) == 1
+
+
+def test_rejects_bad_requests(server):
+    assert post(server, b'{not json') == 400
+    assert post(server, {'movie': {'id': 1}}) == 400
+    assert server.events == []
+
+
+def test_rejects_negative_content_length(server):
+    assert post(server, TEST, headers={'Content-Length': '-1'}) == 400
+    assert server.events == []
+
+
+def test_parse_event_ignores_non_objects():
+    assert parse_event([]) is None
+    assert parse_event({'eventType': 'Grab', 'movie': {'id': '7'}}) == (
+        'Grab', None, '', '', ''
+    )
+
+
+def test_is_loopback():
+    assert is_loopback('127.0.0.1')
+    assert is_loopback('::1')
+    assert is_loopback('localhost')
+    assert not is_loopback('0.0.0.0')
+    assert not is_loopback('')
+    assert not is_loopback('radarr.lan')